@@ -12,17 +12,21 @@ import sys
 
 sys.path.append('..')
 from config.database_config import DatabaseConfig
+from utils.file_catalog import register_file
+from utils.metrics import stage_timer
+from utils.data_cache import get_data_cache
 
 class CourierAnalyzer:
     def __init__(self):
         self.config = DatabaseConfig()
         self.data = None
 
+    @stage_timer('courier_analyzer', 'csv_load')
     def load_data(self, filepath):
         """Завантажує сирі дані кур'єрів"""
         try:
             print(f"📥 Завантаження даних кур'єрів з {filepath}")
-            self.data = pd.read_csv(filepath)
+            self.data = get_data_cache().read_csv(filepath)
             print(f"✅ Завантажено {len(self.data)} записів кур'єрських доставок")
             return True
         except Exception as e:
@@ -41,6 +45,7 @@ class CourierAnalyzer:
 
         try:
             print("🔄 Аналіз продуктивності кур'єрів...")
+            aggregation_timer = stage_timer('courier_analyzer', 'aggregation').start()
 
             # Конвертуємо числові колонки
             numeric_columns = ['delivery_time_minutes', 'improvement_minutes', 'parcel_weight', 'parcel_size']
@@ -127,6 +132,8 @@ class CourierAnalyzer:
                 'analysis_timestamp': datetime.now().isoformat()
             }
 
+            aggregation_timer.stop()
+
             # Зберігаємо результати в окремий файл
             self._save_results(results, 'courier_performance_analysis')
 
@@ -177,6 +184,7 @@ class CourierAnalyzer:
         else:
             return obj
 
+    @stage_timer('courier_analyzer', 'serialisation')
     def _save_results(self, results, filename_prefix):
         """Зберігає результати аналізу в окремі файли по категоріях"""
         try:
@@ -242,6 +250,9 @@ class CourierAnalyzer:
                 }, f, ensure_ascii=False, indent=2)
             saved_files.append(city_analysis_file)
 
+            for saved_file in saved_files:
+                register_file(os.path.join(self.config.PROCESSED_DATA_PATH, saved_file))
+
             print(f"💾 Збережено {len(saved_files)} файлів: {', '.join(saved_files)}")
             return saved_files
 
@@ -12,17 +12,21 @@ import sys
 
 sys.path.append('..')
 from config.database_config import DatabaseConfig
+from utils.file_catalog import register_file
+from utils.metrics import stage_timer
+from utils.data_cache import get_data_cache
 
 class DepartmentAnalyzer:
     def __init__(self):
         self.config = DatabaseConfig()
         self.data = None
 
+    @stage_timer('department_analyzer', 'csv_load')
     def load_data(self, filepath):
         """Завантажує сирі дані періодичних доставок"""
         try:
             print(f"📥 Завантаження даних відділень з {filepath}")
-            self.data = pd.read_csv(filepath)
+            self.data = get_data_cache().read_csv(filepath)
             print(f"✅ Завантажено {len(self.data)} записів періодичних доставок")
             return True
         except Exception as e:
@@ -41,6 +45,7 @@ class DepartmentAnalyzer:
 
         try:
             print("🔄 Аналіз завантажень відділень по періодах...")
+            aggregation_timer = stage_timer('department_analyzer', 'aggregation').start()
 
             # Створюємо колонку періоду
             self.data['period'] = self.data['start_year'].astype(str) + '-' + \
@@ -228,6 +233,8 @@ class DepartmentAnalyzer:
                 'analysis_timestamp': datetime.now().isoformat()
             }
 
+            aggregation_timer.stop()
+
             # Зберігаємо в окремий файл
             self._save_results(results, 'department_workload_by_periods')
 
@@ -280,6 +287,7 @@ class DepartmentAnalyzer:
         else:
             return obj
 
+    @stage_timer('department_analyzer', 'serialisation')
     def _save_results(self, results, filename_prefix):
         """Зберігає результати аналізу в окремі файли по категоріях"""
         try:
@@ -389,6 +397,9 @@ class DepartmentAnalyzer:
                 }, f, ensure_ascii=False, indent=2)
             saved_files.append(period_comparison_file)
 
+            for saved_file in saved_files:
+                register_file(os.path.join(self.config.PROCESSED_DATA_PATH, saved_file))
+
             print(f"💾 Збережено {len(saved_files)} файлів: {', '.join(saved_files)}")
             return saved_files
 
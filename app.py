@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify, send_file, send_from_directory
+from flask import Flask, Response, request, jsonify, send_file, send_from_directory, stream_with_context
 from flask_restx import Api, Resource, fields, Namespace
 from flask_cors import CORS
 from werkzeug.exceptions import NotFound
@@ -6,22 +6,19 @@ import os
 import sys
 from datetime import datetime
 import traceback
-import glob
-import zipfile
-import tempfile
+import multiprocessing
 
 # Додаємо шляхи для імпорту
 sys.path.append('.')
 
-from data_extraction.data_extractor import DataWarehouseExtractor
-from analysis.courier_analysis import CourierAnalyzer
-from analysis.department_analysis import DepartmentAnalyzer
-from analysis.processing_time_analysis import ProcessingTimeAnalyzer
-from analysis.transport_analysis import TransportAnalyzer
-from reports.report_generator import DWReportGenerator
-from visualizations.charts import DWChartGenerator
 from config.database_config import DatabaseConfig
 from utils.helpers import get_latest_csv_file
+from utils.file_catalog import get_file_catalog
+from utils.lazy import LazyComponent
+from utils.data_cache import get_data_cache
+from utils.warmup import WarmupManager
+from utils import metrics
+from utils.zip_stream import stream_zip, collect_files, COMPRESSION_MODES
 
 # Ініціалізація Flask та Swagger
 app = Flask(__name__)
@@ -36,6 +33,9 @@ CORS(app,
      supports_credentials=True
 )
 
+# 📈 Метрики запитів та етапів обробки (Prometheus: GET /metrics)
+metrics.init_app(app)
+
 # Swagger конфігурація
 api = Api(
     app,
@@ -46,15 +46,50 @@ api = Api(
     prefix='/api/v1'
 )
 
-# Ініціалізуємо компоненти
+# Ініціалізуємо компоненти (важкі залежності - pandas, matplotlib, pyodbc -
+# імпортуються лише при першому використанні компонента)
 config = DatabaseConfig()
-extractor = DataWarehouseExtractor()
-courier_analyzer = CourierAnalyzer()
-department_analyzer = DepartmentAnalyzer()
-processing_analyzer = ProcessingTimeAnalyzer()
-transport_analyzer = TransportAnalyzer()
-report_generator = DWReportGenerator()
-chart_generator = DWChartGenerator()
+extractor = LazyComponent('data_extraction.data_extractor', 'DataWarehouseExtractor')
+courier_analyzer = LazyComponent('analysis.courier_analysis', 'CourierAnalyzer')
+department_analyzer = LazyComponent('analysis.department_analysis', 'DepartmentAnalyzer')
+processing_analyzer = LazyComponent('analysis.processing_time_analysis', 'ProcessingTimeAnalyzer')
+transport_analyzer = LazyComponent('analysis.transport_analysis', 'TransportAnalyzer')
+report_generator = LazyComponent('reports.report_generator', 'DWReportGenerator')
+chart_generator = LazyComponent('visualizations.charts', 'DWChartGenerator')
+delivery_forecast = LazyComponent('data_science.predictors.delivery_forecast', 'DeliveryForecast')
+efficiency_analyzer = LazyComponent('data_science.analyzers.efficiency_analyzer', 'EfficiencyAnalyzer')
+
+
+# 🔥 Прогрів кешів (POSTDW_WARMUP=1): сирі дані, ознаки прогнозу, модель, аналізи
+def _warmup_raw_datasets():
+    for pattern in ['courier_delivery_raw_data_*.csv', 'delivery_periodic_raw_data_*.csv']:
+        filepath = get_latest_csv_file(config.RAW_DATA_PATH, pattern)
+        if filepath:
+            get_data_cache().read_csv(filepath, copy=False)
+    for component in [courier_analyzer, department_analyzer, processing_analyzer, transport_analyzer]:
+        component.get_instance()
+
+
+def _warmup_forecast_model():
+    if delivery_forecast.load_active_model() is None:
+        raise FileNotFoundError(f"Активна модель {delivery_forecast.model_name} не знайдена в реєстрі")
+
+
+def _warmup_analyses():
+    efficiency_analyzer.analyze_department_performance()
+    efficiency_analyzer.analyze_transport_efficiency()
+    efficiency_analyzer.analyze_seasonal_patterns()
+
+
+warmup = WarmupManager([
+    ('raw_datasets', _warmup_raw_datasets),
+    ('forecast_features', lambda: delivery_forecast.load_forecast_features()),
+    ('forecast_model', _warmup_forecast_model),
+    ('analyses', _warmup_analyses)
+])
+# Процеси пулу побудови графіків (spawn) повторно імпортують головний модуль - прогрів лише в основному
+if os.environ.get('POSTDW_WARMUP') == '1' and multiprocessing.parent_process() is None:
+    warmup.start()
 
 # Namespaces для групування endpoints
 health_ns = Namespace('health', description='Перевірка здоров\'я системи')
@@ -62,12 +97,16 @@ data_ns = Namespace('data', description='Операції з даними')
 analysis_ns = Namespace('analysis', description='Аналітичні операції')
 reports_ns = Namespace('reports', description='Генерація звітів')
 files_ns = Namespace('files', description='Робота з файлами')
+forecast_ns = Namespace('forecast', description='Прогнозування доставок')
+charts_ns = Namespace('charts', description='Окремі графіки на вимогу')
 
 api.add_namespace(health_ns, path='/health')
 api.add_namespace(data_ns, path='/data')
 api.add_namespace(analysis_ns, path='/analysis')
 api.add_namespace(reports_ns, path='/reports')
 api.add_namespace(files_ns, path='/files')
+api.add_namespace(forecast_ns, path='/forecast')
+api.add_namespace(charts_ns, path='/charts')
 
 # Моделі для Swagger документації
 health_model = api.model('Health', {
@@ -165,12 +204,17 @@ class SystemStatus(Resource):
                     'files_count': len(os.listdir(dir_path)) if os.path.exists(dir_path) else 0
                 }
 
-            return {
-                'status': 'operational',
+            # Поки триває прогрів - 503, щоб балансувальник не спрямовував трафік
+            warmup_status = warmup.status()
+            status = {
+                'status': 'operational' if warmup_status['ready'] else 'warming_up',
                 'files': file_status,
                 'directories': dir_status,
+                'warmup': warmup_status,
+                'cache': get_data_cache().stats(),
                 'timestamp': datetime.now().isoformat()
             }
+            return status, (200 if warmup_status['ready'] else 503)
 
         except Exception as e:
             return {
@@ -211,7 +255,7 @@ class DataExtraction(Resource):
                 if isinstance(result, dict) and 'records' in result:
                     total_records += result.get('records', 0)
 
-            return {
+            response = {
                 'success': successful > 0,
                 'message': f'Вивантажено {successful}/{total} файлів успішно',
                 'records_processed': total_records,
@@ -220,6 +264,16 @@ class DataExtraction(Resource):
                 'timestamp': datetime.now().isoformat()
             }
 
+            if successful > 0 and config.ML_ANOMALY_STREAMING:
+                # Оцінки аномалій для нових періодів - без повного перенавчання детектора
+                try:
+                    refresh = efficiency_analyzer.update_anomaly_scores()
+                    response['anomaly_refresh'] = {k: v for k, v in refresh.items() if k != 'scores'}
+                except Exception as e:
+                    response['anomaly_refresh'] = {'error': str(e)}
+
+            return response
+
         except Exception as e:
             return {
                 'success': False,
@@ -590,18 +644,32 @@ class ReportGeneration(Resource):
 @reports_ns.route('/charts')
 class ChartGeneration(Resource):
     @reports_ns.doc('generate_charts')
+    @reports_ns.param('force', 'Перебудувати графіки, навіть якщо дані не змінились (true/false)', default='false')
+    @reports_ns.param('profile', 'Профіль побудови', enum=['preview', 'web', 'print', 'svg'])
     def get(self):
-        """Створення всіх графіків"""
+        """Створення всіх графіків (незмінені графіки повертаються з кешу)"""
         try:
             start_time = datetime.now()
-            charts = chart_generator.create_all_charts()
+            force = request.args.get('force', 'false').lower() == 'true'
+            try:
+                charts = chart_generator.create_all_charts(use_cache=not force,
+                                                           profile=request.args.get('profile'))
+            except ValueError as e:
+                return {
+                    'success': False,
+                    'message': str(e),
+                    'timestamp': datetime.now().isoformat()
+                }, 400
             end_time = datetime.now()
             execution_time = str(end_time - start_time)
+            created = sum(chart['success'] for chart in charts)
 
             return {
                 'success': True,
-                'message': f'Створено {len(charts)} графіків',
+                'message': f'Створено {created} графіків',
                 'charts': charts,
+                'total_size_kb': round(sum(chart['size_kb'] or 0 for chart in charts), 1),
+                'cache': chart_generator.chart_cache.stats(),
                 'execution_time': execution_time,
                 'timestamp': datetime.now().isoformat()
             }
@@ -614,6 +682,268 @@ class ChartGeneration(Resource):
             }, 500
 
 
+# =============================================================================
+# CHART ENDPOINTS
+# =============================================================================
+
+@charts_ns.route('/')
+class ChartList(Resource):
+    @charts_ns.doc('list_charts')
+    def get(self):
+        """Список окремих графіків (панелей дашбордів)"""
+        return {
+            'success': True,
+            'charts': chart_generator.list_panels(),
+            'profiles': list(chart_generator.RENDER_PROFILES),
+            'cache': chart_generator.panel_cache.stats(),
+            'timestamp': datetime.now().isoformat()
+        }
+
+
+@charts_ns.route('/<string:name>')
+class ChartPanel(Resource):
+    @charts_ns.doc('render_chart')
+    @charts_ns.param('profile', 'Профіль побудови', enum=['preview', 'web', 'print', 'svg'], default='web')
+    def get(self, name):
+        """Один графік, побудований у пам'яті (кешується до зміни даних)"""
+        if name not in chart_generator.PANELS:
+            return {
+                'success': False,
+                'message': f"Невідомий графік: {name}. Доступні: {', '.join(chart_generator.PANELS)}",
+                'timestamp': datetime.now().isoformat()
+            }, 404
+
+        try:
+            chart = chart_generator.render_panel(name, request.args.get('profile', 'web'))
+        except ValueError as e:
+            return {
+                'success': False,
+                'message': str(e),
+                'timestamp': datetime.now().isoformat()
+            }, 400
+        except FileNotFoundError as e:
+            return {
+                'success': False,
+                'message': str(e),
+                'timestamp': datetime.now().isoformat()
+            }, 404
+        except Exception as e:
+            return {
+                'success': False,
+                'message': f'Помилка побудови графіка: {str(e)}',
+                'timestamp': datetime.now().isoformat()
+            }, 500
+
+        response = Response(chart['content'], mimetype=chart['mimetype'])
+        response.set_etag(chart['fingerprint'])
+        response.headers['X-Render-Seconds'] = str(chart['render_seconds'])
+        response.headers['X-Chart-Cache'] = 'hit' if chart['cached'] else 'miss'
+        return response.make_conditional(request)
+
+
+# =============================================================================
+# FORECAST ENDPOINTS
+# =============================================================================
+
+MAX_FORECAST_BATCH_ROWS = 100000
+FORECAST_REQUIRED_FIELDS = ['department_id', 'parcel_type_id', 'transport_body_type_id', 'month']
+
+forecast_row_model = api.model('ForecastRow', {
+    'department_id': fields.Integer(required=True, description='ID відділення'),
+    'parcel_type_id': fields.Integer(required=True, description='ID типу посилки'),
+    'transport_body_type_id': fields.Integer(required=True, description='ID типу транспорту'),
+    'month': fields.Integer(required=True, description='Місяць прогнозу (1-12)'),
+    'year': fields.Integer(description='Рік прогнозу (за замовчуванням - найближчий)')
+})
+
+forecast_batch_model = api.model('ForecastBatchRequest', {
+    'rows': fields.List(fields.Nested(forecast_row_model), required=True,
+                        description=f'Рядки для прогнозу (до {MAX_FORECAST_BATCH_ROWS})')
+})
+
+
+def _parse_forecast_rows(rows):
+    """Перевіряє рядки запиту прогнозу; повертає (DataFrame, помилка)"""
+    import pandas as pd
+
+    if not isinstance(rows, list) or not rows:
+        return None, "Поле 'rows' має бути непорожнім списком"
+    if len(rows) > MAX_FORECAST_BATCH_ROWS:
+        return None, f"Забагато рядків: {len(rows)} (максимум {MAX_FORECAST_BATCH_ROWS})"
+    if not all(isinstance(row, dict) for row in rows):
+        return None, "Кожен рядок має бути об'єктом"
+
+    frame = pd.DataFrame.from_records(rows)
+    missing = [field for field in FORECAST_REQUIRED_FIELDS if field not in frame.columns]
+    if missing:
+        return None, f"Відсутні поля: {', '.join(missing)}"
+
+    required = frame[FORECAST_REQUIRED_FIELDS].apply(pd.to_numeric, errors='coerce')
+    invalid = required.isna().any(axis=1) | (required % 1 != 0).any(axis=1)
+    invalid |= ~required['month'].between(1, 12)
+
+    # Рік необов'язковий: відсутній -> найближчий (визначає DeliveryForecast)
+    year = pd.to_numeric(frame['year'], errors='coerce') if 'year' in frame.columns else None
+    if year is not None:
+        invalid |= (year.isna() & frame['year'].notna()) | (year.notna() & (year % 1 != 0))
+
+    if invalid.any():
+        first = int(invalid.to_numpy().argmax())
+        return None, f"Некоректні значення у рядку {first}: {rows[first]}"
+
+    parsed = required.astype('int64')
+    if year is not None:
+        parsed['year'] = year
+    return parsed, None
+
+
+@forecast_ns.route('/batch')
+class ForecastBatch(Resource):
+    @forecast_ns.doc('forecast_batch')
+    @forecast_ns.expect(forecast_batch_model)
+    def post(self):
+        """Пакетний прогноз доставок для комбінацій відділення x тип посилки x транспорт x місяць"""
+        start_time = datetime.now()
+
+        payload = request.get_json(silent=True) or {}
+        rows, error = _parse_forecast_rows(payload.get('rows'))
+        if error:
+            return {
+                'success': False,
+                'message': error,
+                'timestamp': datetime.now().isoformat()
+            }, 400
+
+        try:
+            # Відсутня модель - 404; ValueError з самого прогнозу - некоректні значення рядків (400)
+            delivery_forecast.ensure_model()
+        except (FileNotFoundError, ValueError) as e:
+            return {
+                'success': False,
+                'message': str(e),
+                'timestamp': datetime.now().isoformat()
+            }, 404
+
+        try:
+            forecast = delivery_forecast.forecast_batch(rows)
+        except FileNotFoundError as e:
+            return {
+                'success': False,
+                'message': str(e),
+                'timestamp': datetime.now().isoformat()
+            }, 404
+        except ValueError as e:
+            return {
+                'success': False,
+                'message': f'Некоректні дані запиту: {str(e)}',
+                'timestamp': datetime.now().isoformat()
+            }, 400
+        except Exception as e:
+            return {
+                'success': False,
+                'message': f'Помилка прогнозування: {str(e)}',
+                'timestamp': datetime.now().isoformat()
+            }, 500
+
+        unknown_rows = int((forecast['confidence'] == 'unknown').sum())
+        if unknown_rows:
+            # Пропуски для невідомих комбінацій -> null у JSON
+            forecast = forecast.astype(object).where(forecast.notna(), None)
+        forecasts = forecast.to_dict('records')
+
+        return {
+            'success': True,
+            'model_file': delivery_forecast.model_file,
+            'rows': len(forecasts),
+            'unknown_rows': unknown_rows,
+            'forecasts': forecasts,
+            'execution_ms': round((datetime.now() - start_time).total_seconds() * 1000, 1),
+            'timestamp': datetime.now().isoformat()
+        }
+
+
+@forecast_ns.route('/horizon')
+class ForecastHorizon(Resource):
+    @forecast_ns.doc('forecast_horizon')
+    @forecast_ns.param('months', 'Горизонт прогнозу, місяців', type=int, default=3)
+    @forecast_ns.param('details', 'Повернути прогноз по кожній комбінації (true/false)', default='false')
+    def get(self):
+        """Прогноз доставок на кілька місяців вперед: підсумки по місяцях та регіонах"""
+        start_time = datetime.now()
+
+        try:
+            months = int(request.args.get('months', 3))
+        except ValueError:
+            months = 0
+        details = request.args.get('details', 'false').lower() == 'true'
+
+        try:
+            # Відсутня модель - 404; ValueError з самого прогнозу - некоректний горизонт (400)
+            delivery_forecast.ensure_model()
+        except (FileNotFoundError, ValueError) as e:
+            return {
+                'success': False,
+                'message': str(e),
+                'timestamp': datetime.now().isoformat()
+            }, 404
+
+        try:
+            result = delivery_forecast.forecast_horizon(months, save=False)
+        except ValueError as e:
+            return {
+                'success': False,
+                'message': str(e),
+                'timestamp': datetime.now().isoformat()
+            }, 400
+        except FileNotFoundError as e:
+            return {
+                'success': False,
+                'message': str(e),
+                'timestamp': datetime.now().isoformat()
+            }, 404
+        except Exception as e:
+            return {
+                'success': False,
+                'message': f'Помилка прогнозування: {str(e)}',
+                'timestamp': datetime.now().isoformat()
+            }, 500
+
+        response = {
+            'success': True,
+            'model_file': delivery_forecast.model_file,
+            'summary': result['summary'],
+            'execution_ms': round((datetime.now() - start_time).total_seconds() * 1000, 1),
+            'timestamp': datetime.now().isoformat()
+        }
+        if details:
+            response['forecasts'] = result['forecasts'].to_dict('records')
+        return response
+
+
+@forecast_ns.route('/model')
+class ForecastModel(Resource):
+    @forecast_ns.doc('forecast_model')
+    def get(self):
+        """Метадані активної моделі прогнозування"""
+        from data_science.model_registry import get_model_registry
+
+        entry = get_model_registry().get_active(delivery_forecast.model_name)
+        if entry is None:
+            return {
+                'success': False,
+                'message': f'Активна модель {delivery_forecast.model_name} не знайдена. Спочатку навчіть модель',
+                'timestamp': datetime.now().isoformat()
+            }, 404
+
+        return {
+            'success': True,
+            'model': entry,
+            'loaded': delivery_forecast.loaded and delivery_forecast.model_file == entry['file'],
+            'load_seconds': delivery_forecast.model_load_seconds if delivery_forecast.loaded else None,
+            'timestamp': datetime.now().isoformat()
+        }
+
+
 # =============================================================================
 # FILES ENDPOINTS
 # =============================================================================
@@ -623,50 +953,53 @@ class FilesList(Resource):
     @files_ns.doc('list_files')
     @files_ns.param('type', 'Тип файлів (raw, processed, reports, charts)',
                     enum=['raw', 'processed', 'reports', 'charts', 'all'])
+    @files_ns.param('prefix', 'Префікс імені файлу')
+    @files_ns.param('date_from', 'Змінені не раніше (ISO дата, напр. 2025-06-01)')
+    @files_ns.param('date_to', 'Змінені не пізніше (ISO дата, включно)')
+    @files_ns.param('page', 'Номер сторінки', type=int, default=1)
+    @files_ns.param('page_size', 'Кількість файлів на сторінці (без пагінації, якщо не вказано)', type=int)
     def get(self):
         """Список доступних файлів"""
         try:
             file_type = request.args.get('type', 'all')
+            prefix = request.args.get('prefix')
 
-            files_info = {}
-
-            directories = {
-                'raw': config.RAW_DATA_PATH,
-                'processed': config.PROCESSED_DATA_PATH,
-                'reports': config.REPORTS_PATH,
-                'charts': config.CHARTS_PATH
-            }
-
-            if file_type == 'all':
-                search_dirs = directories
-            else:
-                search_dirs = {file_type: directories.get(file_type)}
+            try:
+                date_from = request.args.get('date_from')
+                date_from = datetime.fromisoformat(date_from) if date_from else None
 
-            for dir_type, dir_path in search_dirs.items():
-                if not dir_path or not os.path.exists(dir_path):
-                    files_info[dir_type] = []
-                    continue
-
-                files = []
-                for file_path in glob.glob(os.path.join(dir_path, '*')):
-                    if os.path.isfile(file_path):
-                        file_size = os.path.getsize(file_path) / 1024
-                        mod_time = datetime.fromtimestamp(os.path.getmtime(file_path))
+                date_to = request.args.get('date_to')
+                if date_to:
+                    # Дата без часу включає весь день
+                    date_to = datetime.fromisoformat(date_to) if 'T' in date_to \
+                        else datetime.fromisoformat(date_to).replace(hour=23, minute=59, second=59, microsecond=999999)
+                else:
+                    date_to = None
 
-                        files.append({
-                            'filename': os.path.basename(file_path),
-                            'size_kb': round(file_size, 1),
-                            'modified': mod_time.isoformat(),
-                            'path': file_path
-                        })
+                page = max(1, int(request.args.get('page', 1)))
+                page_size = request.args.get('page_size')
+                page_size = max(1, int(page_size)) if page_size else None
+            except ValueError as e:
+                return {
+                    'success': False,
+                    'error': f'Невірний параметр запиту: {str(e)}',
+                    'timestamp': datetime.now().isoformat()
+                }, 400
 
-                files_info[dir_type] = sorted(files, key=lambda x: x['modified'], reverse=True)
+            files_info, pagination = get_file_catalog().list_files(
+                file_type, prefix=prefix, date_from=date_from, date_to=date_to,
+                page=page, page_size=page_size
+            )
 
-            return {
+            response = {
                 'success': True,
                 'files': files_info,
                 'timestamp': datetime.now().isoformat()
             }
+            if pagination:
+                response['pagination'] = pagination
+
+            return response
 
         except Exception as e:
             return {
@@ -722,8 +1055,12 @@ class FileDownload(Resource):
 class BulkDownload(Resource):
     @files_ns.doc('download_all_files')
     @files_ns.param('file_type', 'Тип файлів для завантаження', enum=['raw', 'processed', 'reports', 'charts'])
+    @files_ns.param('compression', 'Режим стиснення (auto - без стиснення для PNG/Parquet)',
+                    enum=COMPRESSION_MODES, default='auto')
+    @files_ns.param('workers', 'Кількість потоків для паралельного стиснення (0 - послідовно)',
+                    type=int, default=0)
     def get(self, file_type):
-        """Завантаження всіх файлів певного типу в ZIP архіві"""
+        """Потокове завантаження всіх файлів певного типу в ZIP архіві"""
         try:
             directories = {
                 'raw': config.RAW_DATA_PATH,
@@ -739,6 +1076,23 @@ class BulkDownload(Resource):
                     'timestamp': datetime.now().isoformat()
                 }, 400
 
+            compression = request.args.get('compression', 'auto')
+            if compression not in COMPRESSION_MODES:
+                return {
+                    'success': False,
+                    'error': f'Невідомий режим стиснення: {compression}',
+                    'timestamp': datetime.now().isoformat()
+                }, 400
+
+            try:
+                workers = max(0, min(int(request.args.get('workers', 0)), os.cpu_count() or 1))
+            except ValueError:
+                return {
+                    'success': False,
+                    'error': 'Параметр workers має бути цілим числом',
+                    'timestamp': datetime.now().isoformat()
+                }, 400
+
             source_dir = directories[file_type]
             if not os.path.exists(source_dir):
                 return {
@@ -747,23 +1101,14 @@ class BulkDownload(Resource):
                     'timestamp': datetime.now().isoformat()
                 }, 404
 
-            # Створюємо тимчасовий ZIP файл
-            temp_zip = tempfile.NamedTemporaryFile(delete=False, suffix='.zip')
-
-            with zipfile.ZipFile(temp_zip.name, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for root, dirs, files in os.walk(source_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        arcname = os.path.relpath(file_path, source_dir)
-                        zipf.write(file_path, arcname)
-
+            # Архів формується під час відправки - без тимчасових файлів
+            files = collect_files(source_dir)
             zip_filename = f'postal_analytics_{file_type}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.zip'
 
-            return send_file(
-                temp_zip.name,
-                as_attachment=True,
-                download_name=zip_filename,
-                mimetype='application/zip'
+            return Response(
+                stream_with_context(stream_zip(files, compression=compression, workers=workers)),
+                mimetype='application/zip',
+                headers={'Content-Disposition': f'attachment; filename={zip_filename}'}
             )
 
         except Exception as e:
@@ -820,6 +1165,9 @@ if __name__ == '__main__':
     print("🚀 Запуск PostDW Analytics API...")
     print("📖 Swagger документація: http://localhost:5000/swagger/")
     print("🏥 Health check: http://localhost:5000/api/v1/health/")
+    print("📈 Метрики Prometheus: http://localhost:5000/metrics")
+    if warmup.state == 'running':
+        print("🔥 Прогрів кешів виконується у фоні (стан: /api/v1/health/status)")
     print("\n📋 Доступні endpoints:")
     print("   GET /api/v1/data/extract - Вивантаження даних")
     print("   GET /api/v1/analysis/courier - Аналіз кур'єрів")
@@ -829,4 +1177,7 @@ if __name__ == '__main__':
     print("   GET /api/v1/analysis/all - Всі аналізи")
     print("   GET /api/v1/reports/generate - Генерація звітів")
     print("   GET /api/v1/reports/charts - Створення графіків")
+    print("   GET /api/v1/charts/<name> - Окремий графік на вимогу")
+    print("   POST /api/v1/forecast/batch - Пакетний прогноз доставок")
+    print("   GET /api/v1/forecast/horizon - Прогноз на кілька місяців")
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
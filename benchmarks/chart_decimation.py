@@ -0,0 +1,125 @@
+"""
+Бенчмарк проріджування даних графіків: панелі трендів на синтетичних рядах різної довжини
+
+Порівнює час побудови панелей з бюджетами конфігурації (POSTDW_CHART_MAX_*)
+та без обмежень. Файли даних не потрібні.
+
+Запуск:
+    python benchmarks/chart_decimation.py --periods 24 120 600
+    python benchmarks/chart_decimation.py --profile web --output decimation.json
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_PATH)
+
+PANELS = [
+    'processing_trends', 'processing_period_comparison', 'department_periods', 'department_types',
+    'transport_trends', 'transport_parcel_types', 'transport_changes'
+]
+
+
+def build_inputs(periods_count, types_count=5, categories_count=40, seed=42):
+    """Синтетичні вхідні дані панелей у форматі JSON файлів аналізу"""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    periods = [f'{2000 + i // 12}-{i % 12 + 1:02d}' for i in range(periods_count)]
+
+    def walk(base):
+        return np.maximum(base + rng.normal(0, base * 0.05, periods_count).cumsum(), 1).round(1)
+
+    trends = {}
+    transport_trends = {}
+    for t in range(types_count):
+        for period, value in zip(periods, walk(24)):
+            trends[f'Type{t}_{period}'] = {'parcel_type_name': f'Type{t}', 'period': period,
+                                           'avg_processing_time': float(value)}
+        for period, value in zip(periods, walk(500)):
+            transport_trends[f'Transport{t}_{period}'] = {'total_deliveries': int(value)}
+
+    deliveries = walk(1000)
+    return {
+        'trends': {'data': trends},
+        'comparison': {'data': {p: {'avg_processing_time': float(v)} for p, v in zip(periods, walk(24))}},
+        'periods': {'data': {p: {'total_deliveries': int(v)} for p, v in zip(periods, deliveries)}},
+        'types': {'data': {f'{c}': {'department_type': f'Type_{c}', 'total_deliveries': int(rng.integers(10, 1000))}
+                           for c in range(categories_count)}},
+        'parcels': {'data': {f'2024_01_Parcel{c}_Truck': {'total_deliveries': int(rng.integers(10, 1000))}
+                             for c in range(categories_count)}},
+        'changes': {'data': {f'{a}_to_{b}': {'current_period': b, 'deliveries_change': int(d)}
+                             for a, b, d in zip(periods, periods[1:], np.diff(deliveries))}}
+    }
+
+
+def render_seconds(generator, name, inputs, settings):
+    """Час побудови та збереження однієї панелі"""
+    from matplotlib.figure import Figure
+
+    start = time.perf_counter()
+    figure = Figure(figsize=generator.PANEL_FIGSIZE)
+    getattr(generator, f'_draw_{name}')(figure.add_subplot(), inputs)
+    figure.savefig(io.BytesIO(), format=settings['format'], dpi=settings['dpi'], bbox_inches='tight')
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк проріджування даних графіків')
+    parser.add_argument('--periods', type=int, nargs='+', default=[24, 120, 600], help='Довжини рядів')
+    parser.add_argument('--profile', default='preview', help='Профіль побудови')
+    parser.add_argument('--output', default=None, help='Шлях для збереження результатів у JSON')
+    args = parser.parse_args()
+
+    from contextlib import redirect_stdout
+    from visualizations.charts import DWChartGenerator
+
+    with redirect_stdout(io.StringIO()):
+        generator = DWChartGenerator()
+    settings = generator.RENDER_PROFILES[generator.resolve_profile(args.profile)]
+    budgets = {
+        'CHART_MAX_POINTS': generator.config.CHART_MAX_POINTS,
+        'CHART_MAX_SLICES': generator.config.CHART_MAX_SLICES,
+        'CHART_MAX_TICKS': generator.config.CHART_MAX_TICKS
+    }
+
+    print(f"✂️ Бюджети: {budgets}, профіль {args.profile}")
+    results = {'profile': args.profile, 'budgets': budgets, 'runs': []}
+
+    for periods_count in args.periods:
+        inputs = build_inputs(periods_count)
+        timings = {}
+        for mode in ('full', 'decimated'):
+            for key in budgets:
+                setattr(generator.config, key, budgets[key] if mode == 'decimated' else 0)
+            with redirect_stdout(io.StringIO()):
+                timings[mode] = {name: render_seconds(generator, name, inputs, settings) for name in PANELS}
+
+        run = {
+            'periods': periods_count,
+            'full_seconds': round(sum(timings['full'].values()), 3),
+            'decimated_seconds': round(sum(timings['decimated'].values()), 3),
+            'panels': {
+                name: {'full': round(timings['full'][name], 3), 'decimated': round(timings['decimated'][name], 3)}
+                for name in PANELS
+            }
+        }
+        results['runs'].append(run)
+        print(f"📈 {periods_count} періодів: без обмежень {run['full_seconds']:.2f} с, "
+              f"з проріджуванням {run['decimated_seconds']:.2f} с")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"💾 Результати збережено: {args.output}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
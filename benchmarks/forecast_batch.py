@@ -0,0 +1,106 @@
+"""
+Бенчмарк пакетного прогнозу: POST /api/v1/forecast/batch
+
+Потрібні файл delivery_periodic_raw_data_*.csv та навчена модель delivery_forecast.
+
+Запуск:
+    python benchmarks/forecast_batch.py --rows 10000 --requests 20
+    python benchmarks/forecast_batch.py --max-ms 500   # код виходу 1 при перевищенні p95
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_PATH)
+
+
+def build_rows(template, rows_count, seed=42):
+    """Випадкові рядки запиту з відомих комбінацій (з повтореннями) та випадкових місяців"""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    keys = template[['department_id', 'parcel_type_id', 'transport_body_type_id']].to_numpy()
+    picked = keys[rng.integers(0, len(keys), rows_count)]
+    months = rng.integers(1, 13, rows_count)
+
+    return [
+        {
+            'department_id': int(dept), 'parcel_type_id': int(parcel),
+            'transport_body_type_id': int(transport), 'month': int(month)
+        }
+        for (dept, parcel, transport), month in zip(picked, months)
+    ]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк POST /api/v1/forecast/batch')
+    parser.add_argument('--rows', type=int, default=10000, help='Кількість рядків у запиті')
+    parser.add_argument('--requests', type=int, default=20, help='Кількість вимірюваних запитів')
+    parser.add_argument('--max-ms', type=float, default=None, help='Допустимий p95 (мс) для CI')
+    parser.add_argument('--output', default=None, help='Шлях для збереження результатів у JSON')
+    args = parser.parse_args()
+
+    import app as api_app
+
+    client = api_app.app.test_client()
+    template = api_app.delivery_forecast.load_forecast_template()
+    payload = json.dumps({'rows': build_rows(template, args.rows)})
+
+    # Перший запит: завантаження моделі та побудова шаблону
+    start = time.perf_counter()
+    response = client.post('/api/v1/forecast/batch', data=payload, content_type='application/json')
+    cold_ms = (time.perf_counter() - start) * 1000
+    if response.status_code != 200:
+        print(f"❌ Запит завершився з кодом {response.status_code}: {response.get_json()}")
+        return 1
+
+    timings = []
+    inference_timings = []
+    for _ in range(args.requests):
+        start = time.perf_counter()
+        response = client.post('/api/v1/forecast/batch', data=payload, content_type='application/json')
+        timings.append((time.perf_counter() - start) * 1000)
+        inference_timings.append(response.get_json()['execution_ms'])
+
+    median = statistics.median(timings)
+    p95 = percentile(timings, 95)
+    results = {
+        'rows_per_request': args.rows,
+        'requests': args.requests,
+        'cold_request_ms': round(cold_ms, 1),
+        'median_ms': round(median, 1),
+        'p95_ms': round(p95, 1),
+        'median_handler_ms': round(statistics.median(inference_timings), 1),
+        'rows_per_second': round(args.rows / (median / 1000))
+    }
+
+    print(f"🔮 Пакет {args.rows} рядків, запитів {args.requests}")
+    print(f"   Перший запит: {cold_ms:.1f} мс")
+    print(f"   Медіана: {median:.1f} мс (обробник {results['median_handler_ms']} мс), p95: {p95:.1f} мс")
+    print(f"   Пропускна здатність: {results['rows_per_second']} рядків/с")
+
+    failed = args.max_ms is not None and p95 > args.max_ms
+    if failed:
+        print(f"   ❌ Перевищено ліміт p95 {args.max_ms:.1f} мс")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"💾 Результати збережено: {args.output}")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
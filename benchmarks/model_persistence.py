@@ -0,0 +1,105 @@
+"""
+Бенчмарк збереження моделей: розмір файлу, час збереження та завантаження
+для різних рівнів стиснення joblib (та mmap для нестисненого файлу).
+
+Потрібна навчена модель у реєстрі (за замовчуванням delivery_forecast).
+
+Запуск:
+    python benchmarks/model_persistence.py
+    python benchmarks/model_persistence.py --model delivery_forecast_by_region --levels 0 1 3 9 lz4:3
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_PATH)
+
+
+def parse_level(value):
+    if ':' in value:
+        method, level = value.split(':', 1)
+        return (method, int(level))
+    return int(value)
+
+
+def measure(model_data, compress, directory, repeats):
+    import joblib
+
+    filepath = os.path.join(directory, 'model.joblib')
+    start = time.perf_counter()
+    joblib.dump(model_data, filepath, compress=compress)
+    save_seconds = time.perf_counter() - start
+
+    load_timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        joblib.load(filepath)
+        load_timings.append(time.perf_counter() - start)
+
+    result = {
+        'compress': list(compress) if isinstance(compress, tuple) else compress,
+        'size_mb': round(os.path.getsize(filepath) / (1024 * 1024), 2),
+        'save_seconds': round(save_seconds, 3),
+        'load_seconds': round(min(load_timings), 3),
+        'mmap_load_seconds': None
+    }
+
+    if not compress:
+        start = time.perf_counter()
+        joblib.load(filepath, mmap_mode='r')
+        result['mmap_load_seconds'] = round(time.perf_counter() - start, 3)
+
+    os.remove(filepath)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк розміру та швидкості завантаження моделей')
+    parser.add_argument('--model', default='delivery_forecast', help='Назва моделі в реєстрі')
+    parser.add_argument('--levels', nargs='+', default=['0', '1', '3', '6'],
+                        help="Рівні стиснення: 0-9 (zlib) або 'метод:рівень'")
+    parser.add_argument('--repeats', type=int, default=3, help='Повторів завантаження (береться найкращий)')
+    parser.add_argument('--output', default=None, help='Шлях для збереження результатів у JSON')
+    args = parser.parse_args()
+
+    from data_science.model_registry import get_model_registry
+
+    entry, model_data = get_model_registry().load(args.model)
+    if entry is None:
+        print(f"❌ Модель {args.model} не знайдена в реєстрі")
+        return 1
+
+    directory = tempfile.mkdtemp(prefix='postdw_model_bench_')
+    results = []
+    try:
+        for level in args.levels:
+            try:
+                results.append(measure(model_data, parse_level(level), directory, args.repeats))
+            except (ValueError, ImportError) as e:
+                print(f"⚠️ Стиснення {level} недоступне: {e}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print(f"\n🗜️ Модель {entry['file']}")
+    print(f"   {'стиснення':<12}{'розмір, МБ':>12}{'збереження, с':>16}{'завантаження, с':>18}{'mmap, с':>10}")
+    for result in results:
+        mmap_seconds = '-' if result['mmap_load_seconds'] is None else f"{result['mmap_load_seconds']:.3f}"
+        print(f"   {str(result['compress']):<12}{result['size_mb']:>12.2f}{result['save_seconds']:>16.3f}"
+              f"{result['load_seconds']:>18.3f}{mmap_seconds:>10}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'model_file': entry['file'], 'results': results}, f, ensure_ascii=False, indent=2)
+        print(f"💾 Результати збережено: {args.output}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Бенчмарк сегментованих моделей прогнозу: одна загальна модель проти
+окремих моделей по регіонах / типах відділень (точність та час навчання).
+
+Потрібен файл delivery_periodic_raw_data_*.csv. Моделі не зберігаються в реєстр.
+
+Запуск:
+    python benchmarks/segment_models.py
+    python benchmarks/segment_models.py --segments department_type --n-jobs 4 --output segments.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_PATH)
+
+
+def train(segment_by, n_jobs, n_estimators):
+    from data_science.predictors.delivery_forecast import DeliveryForecast
+
+    forecast = DeliveryForecast(n_jobs=n_jobs, n_estimators=n_estimators, segment_by=segment_by)
+    start = time.perf_counter()
+    report = forecast.train_forecast_model(save=False)['training_report']
+    wall_seconds = time.perf_counter() - start
+
+    metrics = report['metrics']
+    segments = report.get('segments', {})
+    return {
+        'segment_by': segment_by or 'global',
+        # Моделі сегментів + загальна модель для решти
+        'models': sum(1 for info in segments.values() if info['model'] == 'segment') + 1,
+        'n_estimators_total': report['n_estimators'],
+        'test_r2': round(float(metrics['test_r2']), 4),
+        'mae': round(float(metrics['mae']), 4),
+        'rmse': round(float(metrics['rmse']), 4),
+        'train_seconds': report['train_seconds'],
+        'wall_seconds': round(wall_seconds, 3),
+        'segments': segments
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк сегментованих моделей прогнозу доставок')
+    parser.add_argument('--segments', nargs='+', default=['region', 'department_type'],
+                        choices=['region', 'department_type'], help='Сегментації для порівняння')
+    parser.add_argument('--n-jobs', type=int, default=None, help='Кількість процесів/потоків (-1 - всі ядра)')
+    parser.add_argument('--n-estimators', type=int, default=None, help='Дерев у кожній моделі')
+    parser.add_argument('--output', default=None, help='Шлях для збереження результатів у JSON')
+    args = parser.parse_args()
+
+    # Ознаки будуються один раз (сховище ознак) - далі вимірюється лише навчання
+    from data_science.predictors.delivery_forecast import DeliveryForecast
+    DeliveryForecast(segment_by='').load_forecast_features()
+
+    # '' - явно одна модель, незалежно від POSTDW_ML_SEGMENT_BY
+    results = [train('', args.n_jobs, args.n_estimators)]
+    for segment_by in args.segments:
+        results.append(train(segment_by, args.n_jobs, args.n_estimators))
+
+    print(f"\n🧩 {'Модель':<18}{'моделей':>9}{'дерев':>8}{'R²':>9}{'MAE':>9}{'RMSE':>9}{'навчання, с':>14}")
+    for result in results:
+        print(f"   {result['segment_by']:<18}{result['models']:>9}{result['n_estimators_total']:>8}"
+              f"{result['test_r2']:>9.4f}{result['mae']:>9.4f}{result['rmse']:>9.4f}{result['train_seconds']:>14.2f}")
+
+    baseline = results[0]
+    for result in results[1:]:
+        print(f"   {result['segment_by']}: RMSE {result['rmse'] - baseline['rmse']:+.4f}, "
+              f"час навчання x{result['train_seconds'] / max(baseline['train_seconds'], 1e-9):.2f} "
+              f"відносно загальної моделі")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"💾 Результати збережено: {args.output}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
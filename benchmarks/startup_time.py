@@ -0,0 +1,112 @@
+"""
+Бенчмарк часу запуску: імпорт модулів app та main
+
+Запуск:
+    python benchmarks/startup_time.py --runs 5
+    python benchmarks/startup_time.py --max-seconds 1.5   # код виходу 1 при перевищенні
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ['app', 'main']
+
+# Залежності, які не повинні імпортуватися під час старту
+HEAVY_MODULES = ['pandas', 'numpy', 'matplotlib', 'seaborn', 'sklearn', 'pyodbc', 'scipy']
+
+
+def measure_import(module_name):
+    """Час імпорту модуля у свіжому процесі інтерпретатора"""
+    code = (
+        "import json, sys\n"
+        f"import {module_name}\n"
+        f"print(json.dumps(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)))"
+    )
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=BASE_PATH, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - start
+
+    if result.returncode != 0:
+        raise RuntimeError(f"Імпорт {module_name} завершився з помилкою:\n{result.stderr[-2000:]}")
+
+    heavy_loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    return elapsed, heavy_loaded, parse_importtime(result.stderr)
+
+
+def parse_importtime(stderr, top=10):
+    """Найдовші імпорти верхнього рівня з виводу -X importtime"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        # Вкладені імпорти мають додатковий відступ
+        name = parts[2]
+        if name.startswith('  '):
+            continue
+        entries.append((name.strip(), int(parts[1]) / 1e6))
+    return sorted(entries, key=lambda x: x[1], reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк часу імпорту app та main')
+    parser.add_argument('--runs', type=int, default=5, help='Кількість запусків для кожного модуля')
+    parser.add_argument('--max-seconds', type=float, default=None,
+                        help='Допустимий медіанний час імпорту (для CI)')
+    parser.add_argument('--output', default=None, help='Шлях для збереження результатів у JSON')
+    args = parser.parse_args()
+
+    results = {}
+    failed = False
+
+    for module_name in MODULES:
+        timings = []
+        heavy_loaded = []
+        slowest = []
+        for _ in range(args.runs):
+            elapsed, heavy_loaded, slowest = measure_import(module_name)
+            timings.append(elapsed)
+
+        median = statistics.median(timings)
+        results[module_name] = {
+            'median_seconds': round(median, 4),
+            'min_seconds': round(min(timings), 4),
+            'max_seconds': round(max(timings), 4),
+            'runs': args.runs,
+            'heavy_modules_loaded': heavy_loaded,
+            'slowest_imports': [{'module': m, 'cumulative_seconds': round(t, 4)} for m, t in slowest]
+        }
+
+        print(f"⏱️ import {module_name}: медіана {median:.3f} с "
+              f"(мін {min(timings):.3f}, макс {max(timings):.3f}, запусків {args.runs})")
+        if heavy_loaded:
+            print(f"   ⚠️ Під час старту імпортовано: {', '.join(heavy_loaded)}")
+        for module, seconds in slowest[:5]:
+            print(f"   • {module}: {seconds:.3f} с")
+
+        if args.max_seconds is not None and median > args.max_seconds:
+            print(f"   ❌ Перевищено ліміт {args.max_seconds:.3f} с")
+            failed = True
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"💾 Результати збережено: {args.output}")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
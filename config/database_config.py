@@ -30,6 +30,52 @@ class DatabaseConfig:
         self.CHARTS_PATH = os.path.join(self.BASE_PATH, 'visualizations', 'output', '')
         self.REPORTS_PATH = os.path.join(self.BASE_PATH, 'reports', 'output', '')
 
+        # Навчання моделей (POSTDW_ML_N_JOBS=-1 - всі ядра)
+        self.ML_N_JOBS = int(os.environ.get('POSTDW_ML_N_JOBS', '-1'))
+        self.ML_N_ESTIMATORS = int(os.environ.get('POSTDW_ML_N_ESTIMATORS', '100'))
+        # Інкрементальне донавчання: скільки дерев додати на нових періодах
+        # та максимальний розмір лісу, після якого виконується повне перенавчання
+        self.ML_INCREMENTAL_TREES = int(os.environ.get('POSTDW_ML_INCREMENTAL_TREES', '20'))
+        self.ML_MAX_ESTIMATORS = int(os.environ.get('POSTDW_ML_MAX_ESTIMATORS', '300'))
+        # Окремі моделі прогнозу по сегментах: '' (одна модель), 'region' або 'department_type';
+        # сегменти з меншою кількістю навчальних записів прогнозує загальна модель
+        self.ML_SEGMENT_BY = os.environ.get('POSTDW_ML_SEGMENT_BY', '')
+        self.ML_MIN_SEGMENT_ROWS = int(os.environ.get('POSTDW_ML_MIN_SEGMENT_ROWS', '200'))
+
+        # Файли моделей: стиснення joblib (0 - без стиснення, лише так можливий mmap при завантаженні;
+        # 1-9 - рівень zlib; або 'метод:рівень', напр. 'lz4:3') та скільки версій зберігати:
+        # активна + ML_MODEL_KEEP_LATEST найновіших + ML_MODEL_KEEP_BEST з найменшим RMSE
+        compress = os.environ.get('POSTDW_ML_MODEL_COMPRESS', '3')
+        if ':' in compress:
+            method, level = compress.split(':', 1)
+            self.ML_MODEL_COMPRESS = (method, int(level))
+        else:
+            self.ML_MODEL_COMPRESS = int(compress)
+        self.ML_MODEL_KEEP_LATEST = int(os.environ.get('POSTDW_ML_MODEL_KEEP_LATEST', '3'))
+        self.ML_MODEL_KEEP_BEST = int(os.environ.get('POSTDW_ML_MODEL_KEEP_BEST', '2'))
+
+        # Потокове оцінювання аномалій відділень (POSTDW_ANOMALY_STREAMING=1): детектор навчається
+        # раз на вікно з ML_ANOMALY_WINDOW_MONTHS місяців (0 - уся історія) і перенавчається, коли
+        # дані просунулись на ML_ANOMALY_REFIT_MONTHS місяців; між цим нові періоди лише оцінюються
+        self.ML_ANOMALY_STREAMING = os.environ.get('POSTDW_ANOMALY_STREAMING') == '1'
+        self.ML_ANOMALY_WINDOW_MONTHS = int(os.environ.get('POSTDW_ANOMALY_WINDOW_MONTHS', '12'))
+        self.ML_ANOMALY_REFIT_MONTHS = int(os.environ.get('POSTDW_ANOMALY_REFIT_MONTHS', '3'))
+
+        # Відстеження пам'яті компонентів повного аналізу через tracemalloc (сповільнює аналіз у кілька разів)
+        self.DS_TRACE_MEMORY = os.environ.get('POSTDW_DS_TRACE_MEMORY') == '1'
+
+        # Процеси для паралельної побудови дашбордів (POSTDW_CHART_WORKERS=-1 - всі ядра, 1 - послідовно)
+        self.CHART_WORKERS = int(os.environ.get('POSTDW_CHART_WORKERS', '-1'))
+        # Профіль побудови за замовчуванням: preview, web, print (300 dpi) або svg
+        self.CHART_PROFILE = os.environ.get('POSTDW_CHART_PROFILE', 'print')
+        # Скільки окремих графіків (назва x профіль) тримати в пам'яті для /charts/<name>
+        self.CHART_PANEL_CACHE_ENTRIES = int(os.environ.get('POSTDW_CHART_PANEL_CACHE', '64'))
+        # Бюджети графіків: точок на ряд по періодах (лінії - LTTB, стовпці - об'єднання сусідніх періодів),
+        # секторів кругової діаграми (решта - "Інші"), підписів осі X; 0 - без обмеження
+        self.CHART_MAX_POINTS = int(os.environ.get('POSTDW_CHART_MAX_POINTS', '48'))
+        self.CHART_MAX_SLICES = int(os.environ.get('POSTDW_CHART_MAX_SLICES', '8'))
+        self.CHART_MAX_TICKS = int(os.environ.get('POSTDW_CHART_MAX_TICKS', '12'))
+
         # Створюємо директорії
         self._create_directories()
 
@@ -2,7 +2,6 @@
 Модуль для отримання СИРИХ даних з Data Warehouse
 """
 
-import pyodbc
 import pandas as pd
 import numpy as np
 from datetime import datetime
@@ -15,6 +14,8 @@ sys.path.append('..')
 
 from config.database_config import DatabaseConfig
 from data_extraction.sql_queries import DWQueries
+from utils.file_catalog import register_file
+from utils.metrics import stage_timer
 
 class DataWarehouseExtractor:
     def __init__(self):
@@ -29,6 +30,8 @@ class DataWarehouseExtractor:
             print(f"🔗 Підключення до: {self.config.SERVER}")
             print(f"📊 Data Warehouse: {self.config.DATABASE}")
 
+            import pyodbc
+
             connection = pyodbc.connect(self.config.CONNECTION_STRING)
             cursor = connection.cursor()
 
@@ -75,6 +78,8 @@ class DataWarehouseExtractor:
     def get_connection(self):
         """Створює підключення до Data Warehouse"""
         try:
+            import pyodbc
+
             connection = pyodbc.connect(self.config.CONNECTION_STRING)
             return connection
         except Exception as e:
@@ -100,7 +105,8 @@ class DataWarehouseExtractor:
 
         try:
             print(f"🔄 Отримання сирих даних: {filename_prefix}...")
-            df = pd.read_sql(query, connection)
+            with stage_timer('extractor', 'sql_query'):
+                df = pd.read_sql(query, connection)
 
             if df.empty:
                 print(f"⚠️ Запит {filename_prefix} повернув пусті дані")
@@ -112,7 +118,9 @@ class DataWarehouseExtractor:
             filepath = os.path.join(self.config.RAW_DATA_PATH, filename)
 
             # Зберігаємо СИРІ дані у CSV
-            df.to_csv(filepath, index=False, encoding='utf-8')
+            with stage_timer('extractor', 'csv_write'):
+                df.to_csv(filepath, index=False, encoding='utf-8')
+            register_file(filepath)
 
             print(f"✅ {filename_prefix}: {len(df)} записів збережено в {filename}")
             print(f"📊 Колонки: {', '.join(df.columns[:5])}{'...' if len(df.columns) > 5 else ''}")
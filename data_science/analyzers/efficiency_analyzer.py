@@ -4,39 +4,105 @@ import numpy as np
 from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler
 from datetime import datetime, timedelta
+import copy
+import os
 import sys
+import time
+
+import joblib
 
 sys.path.append('..')
 from data_science.base_model import BaseMLModel
-from utils.helpers import get_latest_csv_file
+from data_science.encoding import CategoricalEncoder
+from utils.helpers import get_latest_csv_file, file_fingerprint
+from utils.data_cache import get_data_cache
+from data_science.feature_store import get_department_stats
+from data_science.model_registry import get_model_registry
 
 
 class EfficiencyAnalyzer(BaseMLModel):
     """Аналіз ефективності на основі реальних даних"""
 
+    # Ознаки відділень для виявлення аномалій
+    ANOMALY_FEATURES = ['avg_deliveries_per_period', 'avg_processing_time', 'avg_market_share']
+    ANOMALY_CONTAMINATION = 0.1
+
+    SEASONS = {
+        'Winter': [12, 1, 2],
+        'Spring': [3, 4, 5],
+        'Summer': [6, 7, 8],
+        'Autumn': [9, 10, 11]
+    }
+    MONTH_TO_SEASON = {month: season for season, months in SEASONS.items() for month in months}
+
+    # Стан потокового оцінювання: накопичувальні суми по відділеннях з початку вікна навчання
+    STREAM_STATE_FILENAME = 'anomaly_stream_state.joblib'
+    STREAM_TOTALS = {
+        'avg_deliveries_per_period': 'deliveries_count',
+        'avg_processing_time': 'processing_time_hours',
+        'avg_market_share': 'deliveries_share_percentage'
+    }
+
     def __init__(self):
         super().__init__("efficiency_analyzer")
-        self.anomaly_detector = IsolationForest(contamination=0.1, random_state=42)
+        # Гіперпараметри з реєстру моделей, якщо виконувався підбір
+        self.anomaly_params = get_model_registry().get_tuned_params(self.model_name)
+        self.anomaly_detector = IsolationForest(contamination=self.ANOMALY_CONTAMINATION, random_state=42,
+                                                **self.anomaly_params)
+        self.streaming = self.config.ML_ANOMALY_STREAMING
 
-    def analyze_department_performance(self):
-        """Аналіз продуктивності відділень"""
-        print("🏢 Аналіз продуктивності відділень...")
-
-        # Завантаження даних
+    def _get_delivery_file(self):
         delivery_file = get_latest_csv_file(self.config.RAW_DATA_PATH, 'delivery_periodic_raw_data_*.csv')
         if not delivery_file:
             raise FileNotFoundError("Файл delivery_periodic_raw_data не знайдено")
+        return delivery_file
+
+    def _source(self):
+        """Файл даних та його відбиток - визначаються один раз на виклик аналізу"""
+        delivery_file = self._get_delivery_file()
+        return delivery_file, file_fingerprint(delivery_file)
+
+    def _shared(self, name, source=None):
+        """
+        Результат (або проміжна таблиця) аналізу з кешу процесу - спільний, лише для читання.
+        Перераховується при зміні відбитка файлу даних, а аналіз відділень у потоковому
+        режимі - також при зміні детектора чи оновленні оцінок (update_anomaly_scores).
+        """
+        delivery_file, fingerprint = source or self._source()
+        params_key = tuple(sorted(self.anomaly_params.items()))
+        version = self._anomaly_version() if name == 'department_performance' else None
+        compute = getattr(self, f"_compute_{name}")
+        return get_data_cache().get_or_compute(
+            ('efficiency', name, delivery_file, params_key, version), fingerprint,
+            lambda: compute(delivery_file)
+        )
 
-        data = pd.read_csv(delivery_file)
+    def _memoized(self, name, source=None):
+        """Копія результату аналізу для зовнішнього коду"""
+        return copy.deepcopy(self._shared(name, source))
 
-        # Аналіз по відділенням
-        dept_analysis = data.groupby(
-            ['department_id', 'department_number', 'department_city', 'department_region']).agg({
-            'deliveries_count': ['sum', 'mean', 'std'],
-            'processing_time_hours': ['mean', 'std'],
-            'deliveries_share_percentage': 'mean',
-            'start_month': 'count'  # кількість періодів роботи
-        }).round(2)
+    def analyze_department_performance(self):
+        """Аналіз продуктивності відділень"""
+        return self._memoized('department_performance')
+
+    def analyze_transport_efficiency(self):
+        """Аналіз ефективності транспорту"""
+        return self._memoized('transport_efficiency')
+
+    def analyze_seasonal_patterns(self):
+        """Аналіз сезонних патернів"""
+        return self._memoized('seasonal_patterns')
+
+    def _compute_department_performance(self, delivery_file):
+        print("🏢 Аналіз продуктивності відділень...")
+
+        # Статистика відділень зі сховища ознак (спільна з ознаками прогнозу)
+        dept_analysis = get_department_stats(delivery_file).set_index(
+            ['department_id', 'department_number', 'department_city', 'department_region'])[[
+            'total_deliveries', 'avg_deliveries', 'std_deliveries',
+            'avg_processing_time', 'std_processing_time',
+            'avg_market_share', 'active_periods'
+        ]].round(2)
 
         # Спрощення назв колонок
         dept_analysis.columns = [
@@ -62,14 +128,22 @@ class EfficiencyAnalyzer(BaseMLModel):
         )
 
         # Виявлення аномалій
-        features_for_anomaly = ['avg_deliveries_per_period', 'avg_processing_time', 'avg_market_share']
-        X_anomaly = dept_analysis[features_for_anomaly].fillna(0)
-
-        scaler = StandardScaler()
-        X_scaled = scaler.fit_transform(X_anomaly)
-
-        anomalies = self.anomaly_detector.fit_predict(X_scaled)
-        dept_analysis['is_anomaly'] = anomalies == -1
+        if self.streaming:
+            # Детектор навчається раз на вікно - тут лише оцінювання без перенавчання, на тих самих
+            # ознаках, що й при навчанні: середніх з накопичувальних сум стану (вікно + нові періоди)
+            state = self._load_stream_state()
+            if self.load_active_model() is None or state is None or state['model_file'] != self.model_file:
+                self.fit_anomaly_detector()
+                state = self._load_stream_state()
+            scores = self._score_features(self._totals_features(state['totals'])).set_index('department_id')
+            dept_analysis['is_anomaly'] = dept_analysis.index.get_level_values('department_id').map(
+                scores['is_anomaly']).fillna(False).astype(bool)
+        else:
+            X_anomaly = dept_analysis[self.ANOMALY_FEATURES].fillna(0)
+            scaler = StandardScaler()
+            X_scaled = scaler.fit_transform(X_anomaly)
+            anomalies = self.anomaly_detector.fit_predict(X_scaled)
+            dept_analysis['is_anomaly'] = anomalies == -1
 
         # Класифікація відділень
         dept_analysis['performance_category'] = pd.cut(
@@ -81,12 +155,10 @@ class EfficiencyAnalyzer(BaseMLModel):
 
         return dept_analysis.reset_index()
 
-    def analyze_transport_efficiency(self):
-        """Аналіз ефективності транспорту"""
+    def _compute_transport_efficiency(self, delivery_file):
         print("🚛 Аналіз ефективності транспорту...")
 
-        delivery_file = get_latest_csv_file(self.config.RAW_DATA_PATH, 'delivery_periodic_raw_data_*.csv')
-        data = pd.read_csv(delivery_file)
+        data = get_data_cache().read_csv(delivery_file, copy=False)
 
         # Аналіз по типах транспорту
         transport_analysis = data.groupby(['transport_body_type_id', 'transport_type_name']).agg({
@@ -119,12 +191,10 @@ class EfficiencyAnalyzer(BaseMLModel):
 
         return transport_analysis.reset_index()
 
-    def analyze_seasonal_patterns(self):
-        """Аналіз сезонних патернів"""
+    def _compute_seasonal_patterns(self, delivery_file):
         print("📅 Аналіз сезонних патернів...")
 
-        delivery_file = get_latest_csv_file(self.config.RAW_DATA_PATH, 'delivery_periodic_raw_data_*.csv')
-        data = pd.read_csv(delivery_file)
+        data = get_data_cache().read_csv(delivery_file, copy=False)
 
         # Аналіз по місяцях
         monthly_analysis = data.groupby('start_month').agg({
@@ -138,22 +208,20 @@ class EfficiencyAnalyzer(BaseMLModel):
             'avg_processing_time', 'active_departments'
         ]
 
-        # Визначення сезонів
-        seasons = {
-            'Winter': [12, 1, 2],
-            'Spring': [3, 4, 5],
-            'Summer': [6, 7, 8],
-            'Autumn': [9, 10, 11]
-        }
+        # Сезони - одним групуванням за відображенням місяць -> сезон
+        season_stats = data.groupby(data['start_month'].map(self.MONTH_TO_SEASON)).agg(
+            total_deliveries=('deliveries_count', 'sum'),
+            avg_processing_time=('processing_time_hours', 'mean'),
+            active_departments=('department_id', 'nunique')
+        )
 
         seasonal_analysis = {}
-        for season, months in seasons.items():
-            season_data = data[data['start_month'].isin(months)]
-            if len(season_data) > 0:
+        for season, months in self.SEASONS.items():
+            if season in season_stats.index:
                 seasonal_analysis[season] = {
-                    'total_deliveries': season_data['deliveries_count'].sum(),
-                    'avg_processing_time': season_data['processing_time_hours'].mean(),
-                    'active_departments': season_data['department_id'].nunique(),
+                    'total_deliveries': season_stats.at[season, 'total_deliveries'],
+                    'avg_processing_time': season_stats.at[season, 'avg_processing_time'],
+                    'active_departments': int(season_stats.at[season, 'active_departments']),
                     'months_included': months
                 }
 
@@ -162,13 +230,185 @@ class EfficiencyAnalyzer(BaseMLModel):
             'seasonal_patterns': seasonal_analysis
         }
 
+    # ------------------------------------------------------------------
+    # Потокове оцінювання аномалій
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _month_index(data):
+        return data['start_year'] * 12 + data['start_month'] - 1
+
+    def _running_totals(self, data, keys='department_id'):
+        """Суми та кількості значень ознак - з них середні оновлюються за O(1) на новий запис"""
+        aggregations = {}
+        for column in self.STREAM_TOTALS.values():
+            aggregations[f"{column}_sum"] = (column, 'sum')
+            aggregations[f"{column}_count"] = (column, 'count')
+        return data.groupby(keys).agg(**aggregations)
+
+    def _totals_features(self, totals):
+        """Ознаки детектора (середні, як у статистиці відділень) з накопичувальних сум"""
+        features = pd.DataFrame({
+            feature: totals[f"{column}_sum"] / totals[f"{column}_count"]
+            for feature, column in self.STREAM_TOTALS.items()
+        }, index=totals.index).round(2)
+        return features[self.ANOMALY_FEATURES]
+
+    def _score_features(self, features):
+        """Оцінка аномальності: anomaly_score < 0 - аномалія (decision_function IsolationForest)"""
+        scores = features.copy()
+        if len(features):
+            scores['anomaly_score'] = self.model.decision_function(self.scaler.transform(features.fillna(0)))
+        else:
+            scores['anomaly_score'] = pd.Series(dtype=float)
+        scores['is_anomaly'] = scores['anomaly_score'] < 0
+        return scores.reset_index()
+
+    def _stream_state_path(self):
+        return os.path.join(self.model_path, self.STREAM_STATE_FILENAME)
+
+    def _load_stream_state(self):
+        state_path = self._stream_state_path()
+        if not os.path.exists(state_path):
+            return None
+        return joblib.load(state_path)
+
+    def _anomaly_version(self):
+        """Версія оцінок аномалій для ключа кешу: активний детектор та час оновлення стану"""
+        if not self.streaming:
+            return None
+        entry = get_model_registry().get_active(self.model_name)
+        state_path = self._stream_state_path()
+        return (
+            entry['file'] if entry else None,
+            os.stat(state_path).st_mtime_ns if os.path.exists(state_path) else None
+        )
+
+    def _save_stream_state(self, state):
+        state_path = self._stream_state_path()
+        tmp_path = state_path + '.tmp'
+        joblib.dump(state, tmp_path)
+        os.replace(tmp_path, state_path)
+
+    def fit_anomaly_detector(self):
+        """
+        Навчання детектора аномалій на вікні останніх ML_ANOMALY_WINDOW_MONTHS місяців.
+        Детектор зберігається в реєстр, накопичувальні суми вікна - у стан потокового оцінювання.
+        Повертає оцінки всіх відділень вікна.
+        """
+        print("🕵️ Навчання детектора аномалій відділень...")
+        delivery_file = self._get_delivery_file()
+        data = get_data_cache().read_csv(delivery_file, copy=False)
+
+        month = self._month_index(data)
+        window_months = self.config.ML_ANOMALY_WINDOW_MONTHS
+        window = data[month > month.max() - window_months] if window_months else data
+
+        totals = self._running_totals(window)
+        features = self._totals_features(totals)
+
+        self.scaler = StandardScaler()
+        X_scaled = self.scaler.fit_transform(features.fillna(0))
+        self.model = IsolationForest(contamination=self.ANOMALY_CONTAMINATION, random_state=42,
+                                     **self.anomaly_params).fit(X_scaled)
+        self.encoder = CategoricalEncoder()
+        self.feature_names = list(self.ANOMALY_FEATURES)
+        self.target_name = 'is_anomaly'
+
+        last_period = int(data['start_period_id'].max())
+        trained_until_month = int(month.max())
+        self.save_model({
+            'training_data_file': os.path.basename(delivery_file),
+            'training_data_fingerprint': file_fingerprint(delivery_file),
+            'trained_until_period': last_period,
+            'trained_until_month': trained_until_month,
+            'window_months': window_months,
+            'departments': len(totals)
+        })
+        self._save_stream_state({
+            'model_file': self.model_file,
+            'last_period': last_period,
+            'trained_until_month': trained_until_month,
+            'totals': totals
+        })
+
+        return self._score_features(features)
+
+    def update_anomaly_scores(self, granularity='department'):
+        """
+        Оцінка аномальності нових записів без перенавчання детектора.
+
+        Записи з періодами, новішими за останній оброблений, додаються до накопичувальних
+        сум; оцінюються лише відділення з новими даними (granularity='department' - середні
+        з початку вікна) або кожен новий період відділення (granularity='period' - середні
+        одного періоду мають більший розкид, ніж віконні, тож позначаються частіше).
+        Детектор перенавчається, лише коли дані просунулись на ML_ANOMALY_REFIT_MONTHS місяців.
+        Непорожні оцінки зберігаються у файл (scores_file); аномальні відділення - у anomalous_departments.
+        """
+        if granularity not in ('department', 'period'):
+            raise ValueError(f"Невідома деталізація: {granularity}. Доступні: department, period")
+
+        start = time.perf_counter()
+        entry = self.load_active_model()
+        state = self._load_stream_state()
+
+        def report(mode, scores, new_rows):
+            scored_granularity = granularity if mode == 'incremental' else 'department'
+            scores_file = None
+            if len(scores):
+                scores_file = self.save_predictions(scores.to_dict('records'), f"anomaly_scores_{scored_granularity}")
+            return {
+                'mode': mode,
+                'granularity': scored_granularity,
+                'model_file': self.model_file,
+                'new_rows': new_rows,
+                'scored': len(scores),
+                'anomalies': int(scores['is_anomaly'].sum()),
+                'anomalous_departments': sorted(
+                    int(dept) for dept in scores.loc[scores['is_anomaly'], 'department_id'].unique()),
+                'scores_file': os.path.basename(scores_file) if scores_file else None,
+                'seconds': round(time.perf_counter() - start, 3),
+                'scores': scores
+            }
+
+        if entry is None or state is None or state['model_file'] != self.model_file:
+            print("ℹ️ Стану потокового оцінювання немає - навчання детектора на вікні")
+            return report('refit', self.fit_anomaly_detector(), None)
+
+        data = get_data_cache().read_csv(self._get_delivery_file(), copy=False)
+        new_rows = data[data['start_period_id'] > state['last_period']]
+        if new_rows.empty:
+            print("✅ Нових періодів немає - оцінки аномалій актуальні")
+            return report('up_to_date', self._score_features(self._totals_features(state['totals'].iloc[:0])), 0)
+
+        if int(self._month_index(new_rows).max()) - state['trained_until_month'] >= self.config.ML_ANOMALY_REFIT_MONTHS:
+            print(f"ℹ️ Дані просунулись на {self.config.ML_ANOMALY_REFIT_MONTHS}+ міс. - перенавчання детектора")
+            return report('refit', self.fit_anomaly_detector(), len(new_rows))
+
+        increments = self._running_totals(new_rows)
+        totals = state['totals'].add(increments, fill_value=0)
+
+        if granularity == 'department':
+            features = self._totals_features(totals.loc[increments.index])
+        else:
+            features = self._totals_features(self._running_totals(new_rows, ['department_id', 'start_period_id']))
+        scores = self._score_features(features)
+
+        state.update(totals=totals, last_period=int(new_rows['start_period_id'].max()))
+        self._save_stream_state(state)
+
+        print(f"✅ Оцінено {len(scores)} записів ({len(new_rows)} нових), аномалій: {int(scores['is_anomaly'].sum())}")
+        return report('incremental', scores, len(new_rows))
+
     def generate_improvement_recommendations(self):
         """Генерація рекомендацій для покращення"""
         print("💡 Генерація рекомендацій для покращення...")
 
-        dept_analysis = self.analyze_department_performance()
-        transport_analysis = self.analyze_transport_efficiency()
-        seasonal_analysis = self.analyze_seasonal_patterns()
+        # Один пошук файлу та відбитка; таблиці аналізів лише читаються - без копіювання
+        source = self._source()
+        dept_analysis = self._shared('department_performance', source)
+        transport_analysis = self._shared('transport_efficiency', source)
+        seasonal_analysis = self._shared('seasonal_patterns', source)
 
         recommendations = []
 
@@ -0,0 +1,227 @@
+# data_science/backtesting.py
+import os
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import sys
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.preprocessing import StandardScaler
+
+sys.path.append('..')
+from config.database_config import DatabaseConfig
+from data_science.feature_store import get_feature_store
+from data_science.predictors.delivery_forecast import DeliveryForecast
+from utils.data_cache import get_data_cache
+from utils.file_catalog import register_file
+
+
+def _period_index(data):
+    """Номер календарного місяця: рік * 12 + (місяць - 1)"""
+    return data['start_year'] * 12 + data['start_month'] - 1
+
+
+def _period_label(period):
+    return f"{period // 12}-{period % 12 + 1:02d}"
+
+
+def _evaluate_cutoff(task):
+    """Навчання та прогноз для однієї точки відсічення (виконується у процесі пулу)"""
+    start = time.perf_counter()
+
+    scaler = StandardScaler()
+    X_train = scaler.fit_transform(task['X_train'])
+    model = RandomForestRegressor(n_estimators=task['n_estimators'], random_state=42, n_jobs=1)
+    model.fit(X_train, task['y_train'])
+    predictions = model.predict(scaler.transform(task['X_test']))
+
+    return {
+        'cutoff': task['cutoff'],
+        'predictions': predictions,
+        'seconds': time.perf_counter() - start
+    }
+
+
+class RollingOriginBacktest:
+    """
+    Бектестинг прогнозу доставок з ковзною точкою відсічення.
+
+    Для кожної точки відсічення модель навчається лише на періодах до неї
+    включно (історичні агрегати ознак - теж), а оцінюється на наступних
+    1..horizons календарних місяцях. Точки відсічення обробляються
+    паралельно в пулі процесів.
+    """
+
+    def __init__(self, horizons=3, min_train_periods=3, max_cutoffs=None, n_workers=None, n_estimators=None):
+        self.config = DatabaseConfig()
+        self.horizons = horizons
+        self.min_train_periods = min_train_periods
+        self.max_cutoffs = max_cutoffs
+        self.n_estimators = n_estimators or self.config.ML_N_ESTIMATORS
+
+        if n_workers is None:
+            n_workers = self.config.ML_N_JOBS
+        if n_workers < 1:
+            n_workers = os.cpu_count() or 1
+        self.n_workers = n_workers
+
+        self.forecast = DeliveryForecast()
+
+    def get_cutoffs(self, periods):
+        """Точки відсічення: достатньо історії до і хоча б один період після"""
+        cutoffs = periods[self.min_train_periods - 1:-1]
+        if self.max_cutoffs:
+            cutoffs = cutoffs[-self.max_cutoffs:]
+        return cutoffs
+
+    def load_periods(self):
+        """Сирі дані та їх календарні періоди: (файл, дані, період кожного запису, відсортовані періоди)"""
+        delivery_file = self.forecast.get_periodic_data_file()
+        raw = get_data_cache().read_csv(delivery_file, copy=False)
+        period = _period_index(raw)
+        return delivery_file, raw, period, sorted(period.unique())
+
+    def prepare_cutoff(self, delivery_file, raw, period, cutoff):
+        """Навчальні/тестові масиви для точки відсічення: (task, test_info, кількість навчальних записів)"""
+        features = self._cutoff_features(delivery_file, raw, period, cutoff)
+        return self._build_task(features, cutoff)
+
+    def _cutoff_features(self, delivery_file, raw, period, cutoff):
+        """Ознаки вікна [.., cutoff + horizons] з історією лише до cutoff (кешуються у сховищі ознак)"""
+        def build(source_file):
+            window = raw[period <= cutoff + self.horizons].copy()
+            history = raw[period <= cutoff].copy()
+            return self.forecast.prepare_forecast_features(window, history_data=history)
+
+        name = f"backtest_features_{_period_label(cutoff).replace('-', '')}_h{self.horizons}"
+        return get_feature_store().get_table(name, delivery_file, build)
+
+    def _build_task(self, features, cutoff):
+        feature_columns = self.forecast.get_feature_columns(features)
+        feature_period = _period_index(features)
+
+        train = features[(feature_period <= cutoff) & features['deliveries_count'].notna()]
+        test = features[(feature_period > cutoff) & features['deliveries_count'].notna()]
+
+        # Пропуски заповнюються середніми навчальної частини - без інформації з майбутнього
+        train_means = train[feature_columns].mean()
+        task = {
+            'cutoff': cutoff,
+            'n_estimators': self.n_estimators,
+            'X_train': train[feature_columns].fillna(train_means).to_numpy(dtype=float),
+            'y_train': train['deliveries_count'].to_numpy(dtype=float),
+            'X_test': test[feature_columns].fillna(train_means).to_numpy(dtype=float)
+        }
+        test_info = pd.DataFrame({
+            'cutoff': _period_label(cutoff),
+            'horizon': (_period_index(test) - cutoff).to_numpy(),
+            'department_region': test['department_region'].to_numpy(),
+            'actual': test['deliveries_count'].to_numpy(dtype=float)
+        })
+        return task, test_info, len(train)
+
+    @staticmethod
+    def _error_metrics(errors):
+        grouped = errors.agg(
+            mae=('abs_error', 'mean'),
+            rmse=('squared_error', lambda x: float(np.sqrt(x.mean()))),
+            rows=('abs_error', 'size')
+        )
+        return {
+            key: {'mae': round(float(row['mae']), 3), 'rmse': round(float(row['rmse']), 3), 'rows': int(row['rows'])}
+            for key, row in grouped.iterrows()
+        }
+
+    def run(self, save=True):
+        """Запуск бектестингу; повертає звіт з MAE/RMSE по горизонтах, регіонах і точках відсічення"""
+        print("🧪 Бектестинг моделі прогнозування доставок...")
+        wall_start = time.perf_counter()
+
+        delivery_file, raw, period, periods = self.load_periods()
+
+        cutoffs = self.get_cutoffs(periods)
+        if not cutoffs:
+            return {'error': f'Недостатньо періодів для бектестингу: {len(periods)} '
+                             f'(потрібно щонайменше {self.min_train_periods + 1})'}
+
+        tasks, test_infos, train_sizes = [], {}, {}
+        for cutoff in cutoffs:
+            task, test_info, train_size = self.prepare_cutoff(delivery_file, raw, period, cutoff)
+            tasks.append(task)
+            test_infos[cutoff] = test_info
+            train_sizes[cutoff] = train_size
+        features_seconds = time.perf_counter() - wall_start
+
+        n_workers = min(self.n_workers, len(tasks))
+        print(f"⚙️ Точок відсічення: {len(tasks)}, горизонт: {self.horizons} міс., процесів: {n_workers}")
+
+        if n_workers > 1:
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                results = list(pool.map(_evaluate_cutoff, tasks))
+        else:
+            results = [_evaluate_cutoff(task) for task in tasks]
+
+        # Збираємо прогнози всіх точок відсічення в одну таблицю
+        frames = []
+        for result in results:
+            frame = test_infos[result['cutoff']]
+            frame['predicted'] = result['predictions']
+            frames.append(frame)
+        errors = pd.concat(frames, ignore_index=True)
+        errors['abs_error'] = (errors['predicted'] - errors['actual']).abs()
+        errors['squared_error'] = (errors['predicted'] - errors['actual']) ** 2
+
+        overall = self._error_metrics(errors.assign(scope='all').groupby('scope'))['all']
+        wall_seconds = time.perf_counter() - wall_start
+        fit_seconds = sum(result['seconds'] for result in results)
+
+        report = {
+            'model_name': self.forecast.model_name,
+            'data_file': os.path.basename(delivery_file),
+            'horizons': self.horizons,
+            'n_estimators': self.n_estimators,
+            'n_workers': n_workers,
+            'cutoffs': [
+                {
+                    'cutoff': _period_label(result['cutoff']),
+                    'train_rows': train_sizes[result['cutoff']],
+                    'test_rows': len(test_infos[result['cutoff']]),
+                    'seconds': round(result['seconds'], 3)
+                }
+                for result in results
+            ],
+            'overall': overall,
+            'by_horizon': self._error_metrics(errors.groupby('horizon')),
+            'by_region': self._error_metrics(errors.groupby('department_region')),
+            'by_cutoff': self._error_metrics(errors.groupby('cutoff')),
+            'timing': {
+                'wall_seconds': round(wall_seconds, 3),
+                'features_seconds': round(features_seconds, 3),
+                'fit_predict_seconds_total': round(fit_seconds, 3),
+                'parallel_speedup': round(fit_seconds / max(wall_seconds - features_seconds, 1e-9), 2)
+            },
+            'timestamp': datetime.now().isoformat()
+        }
+        report['by_horizon'] = {int(h): metrics for h, metrics in report['by_horizon'].items()}
+
+        print(f"✅ Бектестинг завершено за {wall_seconds:.2f} с: MAE = {overall['mae']:.3f}, RMSE = {overall['rmse']:.3f}")
+
+        if save:
+            report['report_path'] = self._save_report(report)
+
+        return report
+
+    def _save_report(self, report):
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        filename = f"{self.forecast.model_name}_backtest_{timestamp}.json"
+        filepath = os.path.join(self.config.PROCESSED_DATA_PATH, filename)
+
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        register_file(filepath)
+
+        print(f"💾 Звіт бектестингу збережено: {filename}")
+        return filepath
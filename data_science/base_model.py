@@ -3,15 +3,19 @@ import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
-from sklearn.preprocessing import StandardScaler, LabelEncoder
+from sklearn.preprocessing import StandardScaler
 import joblib
 import os
 from datetime import datetime, timedelta
 import json
 import sys
+import time
 
 sys.path.append('..')
 from config.database_config import DatabaseConfig
+from utils.file_catalog import register_file
+from data_science.model_registry import get_model_registry
+from data_science.encoding import CategoricalEncoder
 
 
 class BaseMLModel:
@@ -21,9 +25,11 @@ class BaseMLModel:
         self.model_name = model_name
         self.model = None
         self.scaler = StandardScaler()
-        self.label_encoders = {}
+        self.encoder = CategoricalEncoder()
         self.feature_names = []
         self.target_name = ""
+        self.model_file = None
+        self.model_load_seconds = None
         self.config = DatabaseConfig()
         self.model_path = os.path.join(self.config.PROCESSED_DATA_PATH, 'models')
         os.makedirs(self.model_path, exist_ok=True)
@@ -41,14 +47,9 @@ class BaseMLModel:
         X = data_clean[feature_columns].copy()
         y = data_clean[target_column].copy()
 
-        # Обробка категоріальних змінних
-        for column in X.columns:
-            if X[column].dtype == 'object':
-                if column not in self.label_encoders:
-                    self.label_encoders[column] = LabelEncoder()
-                    X[column] = self.label_encoders[column].fit_transform(X[column].astype(str))
-                else:
-                    X[column] = self.label_encoders[column].transform(X[column].astype(str))
+        # Кодування категоріальних змінних одним проходом; словник фіксується при першому навчанні,
+        # значення поза ним отримують код CategoricalEncoder.UNKNOWN
+        X = self.encoder.fit(X).transform(X)
 
         # Заповнення пропущених значень
         X = X.fillna(X.mean())
@@ -75,21 +76,23 @@ class BaseMLModel:
         # Навчання моделі
         self.model.fit(X_train_scaled, y_train)
 
-        # Прогнозування на тестовій вибірці
-        y_pred = self.model.predict(X_test_scaled)
-
         # Розрахунок метрик
-        metrics = {
-            'train_r2': self.model.score(X_train_scaled, y_train),
-            'test_r2': r2_score(y_test, y_pred),
-            'mae': mean_absolute_error(y_test, y_pred),
-            'mse': mean_squared_error(y_test, y_pred),
-            'rmse': np.sqrt(mean_squared_error(y_test, y_pred))
-        }
+        metrics = {'train_r2': self.model.score(X_train_scaled, y_train)}
+        metrics.update(self.evaluate_model(X_test_scaled, y_test))
 
         print(f"✅ Модель навчена! R² = {metrics['test_r2']:.3f}")
         return metrics
 
+    def evaluate_model(self, X_scaled, y, predictions=None):
+        """Метрики якості на (вже масштабованій) тестовій вибірці; predictions - готові прогнози моделі"""
+        y_pred = self.model.predict(X_scaled) if predictions is None else predictions
+        return {
+            'test_r2': r2_score(y, y_pred),
+            'mae': mean_absolute_error(y, y_pred),
+            'mse': mean_squared_error(y, y_pred),
+            'rmse': np.sqrt(mean_squared_error(y, y_pred))
+        }
+
     def predict(self, X):
         """Прогнозування"""
         if self.model is None:
@@ -98,33 +101,95 @@ class BaseMLModel:
         X_scaled = self.scaler.transform(X)
         return self.model.predict(X_scaled)
 
-    def save_model(self):
-        """Збереження моделі"""
+    def save_model(self, metadata=None):
+        """Збереження моделі та реєстрація її як активної версії"""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         model_filename = f"{self.model_name}_{timestamp}.joblib"
         model_filepath = os.path.join(self.model_path, model_filename)
 
+        # Кілька збережень за секунду (донавчання одразу після навчання) не перезаписують версії
+        suffix = 1
+        while os.path.exists(model_filepath):
+            model_filename = f"{self.model_name}_{timestamp}_{suffix}.joblib"
+            model_filepath = os.path.join(self.model_path, model_filename)
+            suffix += 1
+
         model_data = {
             'model': self.model,
             'scaler': self.scaler,
-            'label_encoders': self.label_encoders,
+            'categorical_vocabulary': self.encoder.vocabulary,
             'feature_names': self.feature_names,
             'target_name': self.target_name
         }
 
-        joblib.dump(model_data, model_filepath)
-        print(f"💾 Модель збережена: {model_filename}")
+        compress = self.config.ML_MODEL_COMPRESS
+        save_start = time.perf_counter()
+        joblib.dump(model_data, model_filepath, compress=compress)
+        save_seconds = time.perf_counter() - save_start
+        register_file(model_filepath)
+
+        registry_metadata = {
+            'feature_names': self.feature_names,
+            'target_name': self.target_name,
+            'compress': list(compress) if isinstance(compress, tuple) else compress,
+            'save_seconds': round(save_seconds, 3)
+        }
+        registry_metadata.update(metadata or {})
+        registry = get_model_registry()
+        entry = registry.register(self.model_name, model_filepath, registry_metadata, model_data=model_data)
+        self.model_file = model_filename
+
+        print(f"💾 Модель збережена: {model_filename} ({entry['size_kb'] / 1024:.1f} МБ, {save_seconds:.2f} с)")
+
+        removed = registry.apply_retention(self.model_name, self.config.ML_MODEL_KEEP_LATEST,
+                                           self.config.ML_MODEL_KEEP_BEST)
+        if removed:
+            print(f"🧹 Видалено старі версії моделі: {len(removed)}")
+
         return model_filepath
 
     def load_model(self, model_filepath):
         """Завантаження моделі"""
         model_data = joblib.load(model_filepath)
+        self._apply_model_data(model_data)
+        self.model_file = os.path.basename(model_filepath)
+        print(f"📥 Модель завантажена: {os.path.basename(model_filepath)}")
+
+    def _apply_model_data(self, model_data):
         self.model = model_data['model']
         self.scaler = model_data['scaler']
-        self.label_encoders = model_data['label_encoders']
+        if 'categorical_vocabulary' in model_data:
+            self.encoder = CategoricalEncoder(model_data['categorical_vocabulary'])
+        else:
+            # Моделі, збережені до появи словника категорій
+            self.encoder = CategoricalEncoder.from_label_encoders(model_data.get('label_encoders'))
         self.feature_names = model_data['feature_names']
         self.target_name = model_data['target_name']
-        print(f"📥 Модель завантажена: {os.path.basename(model_filepath)}")
+
+    def load_active_model(self):
+        """
+        Активна версія моделі з реєстру. Файл читається один раз на процес,
+        далі модель береться з кешу реєстру. Повертає метадані або None.
+        """
+        registry = get_model_registry()
+        entry = registry.get_active(self.model_name)
+        if entry is None:
+            return None
+
+        if entry['file'] != self.model_file:
+            entry, model_data = registry.load(self.model_name, entry['file'])
+            self._apply_model_data(model_data)
+            self.model_file = entry['file']
+            self.model_load_seconds = entry.get('load_seconds')
+        return entry
+
+    def ensure_model(self):
+        """Модель для прогнозування: щойно навчена в процесі або активна з реєстру"""
+        if self.feature_names and self.model_file is None:
+            return
+
+        if self.load_active_model() is None and not self.feature_names:
+            raise ValueError("Модель не навчена і не знайдена в реєстрі! Спочатку викличте train_model()")
 
     def save_predictions(self, predictions, filename_suffix=""):
         """Збереження прогнозів у файл"""
@@ -140,6 +205,7 @@ class BaseMLModel:
 
         with open(filepath, 'w', encoding='utf-8') as f:
             json.dump(prediction_data, f, ensure_ascii=False, indent=2)
+        register_file(filepath)
 
         print(f"💾 Прогнози збережено: {filename}")
         return filepath
\ No newline at end of file
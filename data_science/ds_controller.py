@@ -1,14 +1,24 @@
 # data_science/ds_controller.py
 import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
+import os
 import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
 
 sys.path.append('..')
 
 from data_science.predictors.delivery_forecast import DeliveryForecast
 from data_science.analyzers.efficiency_analyzer import EfficiencyAnalyzer
 from utils.helpers import get_latest_csv_file
+from utils.data_cache import get_data_cache
 from config.database_config import DatabaseConfig
 
 
@@ -20,92 +30,193 @@ class DataScienceController:
         self.delivery_forecast = DeliveryForecast()
         self.efficiency_analyzer = EfficiencyAnalyzer()
 
-    def run_full_analysis(self):
-        """Запуск повного Data Science аналізу"""
+    def _full_analysis_components(self):
+        """
+        Компоненти повного аналізу: (назва, залежності, опис, текст помилки, функція).
+        Залежність лише впорядковує запуск - компонент виконується, навіть якщо залежність
+        завершилась помилкою (прогноз тоді використовує активну модель з реєстру).
+        """
+        return [
+            ('forecast_model_training', [], 'Навчання моделі прогнозування доставок', 'навчанні моделі',
+             # Донавчання лише на нових періодах
+             lambda: self.delivery_forecast.train_forecast_model(incremental=True)),
+            ('next_month_forecast', ['forecast_model_training'], 'Прогнозування доставок на наступний місяць',
+             'прогнозуванні', lambda: self.delivery_forecast.forecast_next_month()),
+            ('department_performance', [], 'Аналіз ефективності відділень', 'аналізі відділень',
+             lambda: self.efficiency_analyzer.analyze_department_performance().to_dict('records')),
+            ('transport_efficiency', [], 'Аналіз ефективності транспорту', 'аналізі транспорту',
+             lambda: self.efficiency_analyzer.analyze_transport_efficiency().to_dict('records')),
+            ('seasonal_patterns', [], 'Аналіз сезонних патернів', 'сезонному аналізі',
+             lambda: self.efficiency_analyzer.analyze_seasonal_patterns()),
+            ('recommendations', ['department_performance', 'transport_efficiency', 'seasonal_patterns'],
+             'Генерація рекомендацій', 'генерації рекомендацій',
+             lambda: self.efficiency_analyzer.generate_improvement_recommendations())
+        ]
+
+    @staticmethod
+    def _peak_rss_mb():
+        """Пікова резидентна пам'ять усього процесу (МБ) або None, якщо недоступна"""
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux повертає кілобайти, macOS - байти
+        return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 2)
+
+    @staticmethod
+    def _run_component(description, error_label, func, started_at, trace_memory):
+        """Виконання одного компонента з вимірюванням часу (та пам'яті з trace_memory) у потоці пулу"""
+        print(f"\n▶️ {description}...")
+        memory_before = tracemalloc.get_traced_memory()[0] if trace_memory else 0
+        start = time.perf_counter()
+
+        try:
+            value = func()
+            status = 'completed'
+        except Exception as e:
+            print(f"❌ Помилка в {error_label}: {e}")
+            value = {'error': str(e)}
+            status = 'error'
+
+        finish = time.perf_counter()
+        metrics = {
+            'status': status,
+            'seconds': round(finish - start, 3),
+            'started_at_seconds': round(start - started_at, 3),
+            'finished_at_seconds': round(finish - started_at, 3)
+        }
+        if trace_memory:
+            # Приріст пам'яті всього процесу за час компонента, включно з паралельними компонентами
+            metrics['process_memory_delta_mb'] = round(
+                (tracemalloc.get_traced_memory()[0] - memory_before) / (1024 * 1024), 2
+            )
+        return value, metrics
+
+    def run_full_analysis(self, max_workers=None, trace_memory=None):
+        """
+        Запуск повного Data Science аналізу.
+
+        Компоненти виконуються в пулі потоків у порядку залежностей: навчання і прогноз -
+        одним ланцюжком, аналізи відділень, транспорту та сезонів - паралельно з ним,
+        рекомендації - після трьох аналізів. Дані завантажуються один раз у спільний кеш.
+        У results['summary']['components'] - час виконання кожного компонента, в execution -
+        пікова RSS процесу. trace_memory=True (None - POSTDW_DS_TRACE_MEMORY) вмикає tracemalloc:
+        для компонентів додається приріст пам'яті всього процесу (при паралельному виконанні
+        включає інші компоненти), але аналіз сповільнюється в кілька разів.
+        max_workers=None - за кількістю ядер, але не більше 4 незалежних гілок.
+        """
         print("🧠 Запуск повного Data Science аналізу...")
 
+        if max_workers is None:
+            max_workers = min(4, os.cpu_count() or 1)
+
         results = {
             'analysis_timestamp': datetime.now().isoformat(),
             'components': {}
         }
 
-        try:
-            # 1. Навчання моделі прогнозування
-            print("\n1️⃣ Навчання моделі прогнозування доставок...")
-            forecast_training = self.delivery_forecast.train_forecast_model()
-            results['components']['forecast_model_training'] = forecast_training
-
-        except Exception as e:
-            print(f"❌ Помилка в навчанні моделі: {e}")
-            results['components']['forecast_model_training'] = {'error': str(e)}
-
-        try:
-            # 2. Прогнозування на наступний місяць
-            print("\n2️⃣ Прогнозування доставок на наступний місяць...")
-            next_month_forecast = self.delivery_forecast.forecast_next_month()
-            results['components']['next_month_forecast'] = next_month_forecast
-
-        except Exception as e:
-            print(f"❌ Помилка в прогнозуванні: {e}")
-            results['components']['next_month_forecast'] = {'error': str(e)}
-
-        try:
-            # 3. Аналіз ефективності відділень
-            print("\n3️⃣ Аналіз ефективності відділень...")
-            dept_performance = self.efficiency_analyzer.analyze_department_performance()
-            results['components']['department_performance'] = dept_performance.to_dict('records')
-
-        except Exception as e:
-            print(f"❌ Помилка в аналізі відділень: {e}")
-            results['components']['department_performance'] = {'error': str(e)}
-
-        try:
-            # 4. Аналіз ефективності транспорту
-            print("\n4️⃣ Аналіз ефективності транспорту...")
-            transport_efficiency = self.efficiency_analyzer.analyze_transport_efficiency()
-            results['components']['transport_efficiency'] = transport_efficiency.to_dict('records')
-
-        except Exception as e:
-            print(f"❌ Помилка в аналізі транспорту: {e}")
-            results['components']['transport_efficiency'] = {'error': str(e)}
+        if trace_memory is None:
+            trace_memory = self.config.DS_TRACE_MEMORY
+        started_tracing = trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        started_at = time.perf_counter()
 
+        # Спільний набір даних: один раз у кеш процесу, далі всі компоненти читають його звідти
         try:
-            # 5. Аналіз сезонних патернів
-            print("\n5️⃣ Аналіз сезонних патернів...")
-            seasonal_patterns = self.efficiency_analyzer.analyze_seasonal_patterns()
-            results['components']['seasonal_patterns'] = seasonal_patterns
-
-        except Exception as e:
-            print(f"❌ Помилка в сезонному аналізі: {e}")
-            results['components']['seasonal_patterns'] = {'error': str(e)}
-
-        try:
-            # 6. Генерація рекомендацій
-            print("\n6️⃣ Генерація рекомендацій...")
-            recommendations = self.efficiency_analyzer.generate_improvement_recommendations()
-            results['components']['recommendations'] = recommendations
-
-        except Exception as e:
-            print(f"❌ Помилка в генерації рекомендацій: {e}")
-            results['components']['recommendations'] = {'error': str(e)}
+            get_data_cache().read_csv(self.delivery_forecast.get_periodic_data_file(), copy=False)
+        except FileNotFoundError as e:
+            print(f"⚠️ {e}")
+        dataset_seconds = time.perf_counter() - started_at
+
+        components = self._full_analysis_components()
+        pending = {name: (depends_on, description, error_label, func)
+                   for name, depends_on, description, error_label, func in components}
+        values, component_metrics, running = {}, {}, {}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while pending or running:
+                for name, (depends_on, description, error_label, func) in list(pending.items()):
+                    if all(dependency in values for dependency in depends_on):
+                        future = executor.submit(self._run_component, description, error_label, func, started_at,
+                                                 trace_memory)
+                        running[future] = name
+                        del pending[name]
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    values[name], component_metrics[name] = future.result()
+
+        wall_seconds = time.perf_counter() - started_at
+        peak_memory = tracemalloc.get_traced_memory()[1] if trace_memory else None
+        if started_tracing:
+            tracemalloc.stop()
+
+        for name, depends_on, _, _, _ in components:
+            results['components'][name] = values[name]
+            component_metrics[name]['depends_on'] = depends_on
 
         # Підсумок
         successful_components = sum(1 for comp in results['components'].values()
                                     if not isinstance(comp, dict) or 'error' not in comp)
         total_components = len(results['components'])
+        sequential_seconds = sum(metrics['seconds'] for metrics in component_metrics.values())
 
         results['summary'] = {
             'successful_components': successful_components,
             'total_components': total_components,
             'success_rate': successful_components / total_components if total_components > 0 else 0,
-            'status': 'completed' if successful_components > 0 else 'failed'
+            'status': 'completed' if successful_components > 0 else 'failed',
+            'components': {name: component_metrics[name] for name in results['components']},
+            'execution': {
+                'max_workers': max_workers,
+                'dataset_load_seconds': round(dataset_seconds, 3),
+                'wall_seconds': round(wall_seconds, 3),
+                'components_seconds_total': round(sequential_seconds, 3),
+                'parallel_speedup': round(sequential_seconds / max(wall_seconds - dataset_seconds, 1e-9), 2),
+                'peak_rss_mb': self._peak_rss_mb(),
+                'peak_traced_memory_mb': round(peak_memory / (1024 * 1024), 2) if started_tracing else None
+            }
         }
 
         print(f"\n✅ Data Science аналіз завершено!")
         print(f"📊 Успішно виконано: {successful_components}/{total_components} компонентів")
+        print(f"⏱️ Загальний час: {wall_seconds:.2f} с (сума часу компонентів: {sequential_seconds:.2f} с)")
 
         return results
 
+    def refresh_anomaly_scores(self, granularity='department'):
+        """Оцінки аномалій відділень для нових періодів без повного перенавчання детектора"""
+        try:
+            return self.efficiency_analyzer.update_anomaly_scores(granularity)
+        except Exception as e:
+            return {'error': f'Помилка оцінювання аномалій: {str(e)}'}
+
+    def forecast_horizon(self, horizon=3):
+        """Прогноз доставок на кілька місяців вперед одним пакетним викликом моделі"""
+        try:
+            return self.delivery_forecast.forecast_horizon(horizon)
+        except Exception as e:
+            return {'error': f'Помилка прогнозування: {str(e)}'}
+
+    def run_backtest(self, horizons=3, max_cutoffs=None):
+        """Бектестинг моделі прогнозування з ковзною точкою відсічення"""
+        from data_science.backtesting import RollingOriginBacktest
+
+        try:
+            return RollingOriginBacktest(horizons=horizons, max_cutoffs=max_cutoffs).run()
+        except Exception as e:
+            return {'error': f'Помилка бектестингу: {str(e)}'}
+
+    def run_hyperparameter_search(self, model_name='delivery_forecast', strategy='random', time_budget=None):
+        """Підбір гіперпараметрів моделі; найкраща конфігурація використовується при наступному навчанні"""
+        from data_science.tuning import HyperparameterSearch
+
+        try:
+            return HyperparameterSearch(model_name=model_name, strategy=strategy, time_budget=time_budget).run()
+        except Exception as e:
+            return {'error': f'Помилка підбору гіперпараметрів: {str(e)}'}
+
     def get_quick_forecast(self, department_id=None):
         """Швидкий прогноз для конкретного відділення або загальний"""
         try:
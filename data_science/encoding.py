@@ -0,0 +1,72 @@
+# data_science/encoding.py
+import pandas as pd
+
+
+class CategoricalEncoder:
+    """
+    Кодування категоріальних ознак через pandas Categorical.
+
+    Словник категорій (колонка -> відсортований список значень) зберігається
+    разом з моделлю; коди збігаються з LabelEncoder для відомих значень.
+    Невідомі значення отримують код UNKNOWN (-1) лише у своїх рядках.
+    """
+
+    UNKNOWN = -1
+
+    def __init__(self, vocabulary=None):
+        self.vocabulary = {column: list(categories) for column, categories in (vocabulary or {}).items()}
+
+    @classmethod
+    def from_label_encoders(cls, label_encoders):
+        """Словник зі старих моделей, збережених з LabelEncoder"""
+        return cls({column: [str(value) for value in encoder.classes_]
+                    for column, encoder in (label_encoders or {}).items()})
+
+    @staticmethod
+    def categorical_columns(X):
+        """Колонки з текстовими або категоріальними значеннями"""
+        return [
+            column for column, dtype in X.dtypes.items()
+            if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)
+            or isinstance(dtype, pd.CategoricalDtype)
+        ]
+
+    @staticmethod
+    def _as_text(series):
+        # Як і LabelEncoder(astype(str)): пропуски стають категорією 'nan'
+        return series.astype(str)
+
+    def fit(self, X, columns=None):
+        """Додає до словника колонки, яких у ньому ще немає"""
+        for column in columns or self.categorical_columns(X):
+            if column not in self.vocabulary:
+                self.vocabulary[column] = sorted(pd.unique(self._as_text(X[column])))
+        return self
+
+    def transform(self, X):
+        """Нова таблиця з кодами категорій замість значень (-1 - значення поза словником)"""
+        columns = [column for column in self.vocabulary if column in X.columns]
+        if not columns:
+            return X
+
+        encoded = {
+            column: pd.Categorical(self._as_text(X[column]), categories=self.vocabulary[column]).codes
+            for column in columns
+        }
+        return X.assign(**encoded)
+
+    def fit_transform(self, X, columns=None):
+        return self.fit(X, columns).transform(X)
+
+    def unknown_counts(self, X):
+        """Кількість значень поза словником по колонках"""
+        return {
+            column: int((~self._as_text(X[column]).isin(self.vocabulary[column])).sum())
+            for column in self.vocabulary if column in X.columns
+        }
+
+    def __len__(self):
+        return len(self.vocabulary)
+
+    def __contains__(self, column):
+        return column in self.vocabulary
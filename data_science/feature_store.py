@@ -0,0 +1,130 @@
+# data_science/feature_store.py
+import os
+import glob
+import threading
+import sys
+
+import pandas as pd
+
+sys.path.append('..')
+from config.database_config import DatabaseConfig
+from utils.helpers import file_fingerprint
+from utils.data_cache import get_data_cache
+
+
+class FeatureStore:
+    """
+    Сховище обчислених ознак.
+
+    Кожна таблиця матеріалізується один раз на відбиток сирого файлу:
+    на диску - у parquet (або pickle, якщо pyarrow не встановлено),
+    у пам'яті - у спільному кеші процесу. Таблиці лише для читання.
+    """
+
+    def __init__(self, store_path=None, keep_versions=3):
+        config = DatabaseConfig()
+        self.store_path = store_path or os.path.join(config.PROCESSED_DATA_PATH, 'features')
+        self.keep_versions = keep_versions
+        os.makedirs(self.store_path, exist_ok=True)
+
+    def _table_path(self, name, fingerprint, extension):
+        return os.path.join(self.store_path, f"{name}_{fingerprint}.{extension}")
+
+    def get_table(self, name, source_file, builder):
+        """
+        Таблиця ознак name для source_file.
+        builder(source_file) -> DataFrame викликається лише якщо таблиці немає ні в пам'яті, ні на диску.
+        """
+        source_file = os.path.abspath(source_file)
+        fingerprint = file_fingerprint(source_file)
+        return get_data_cache().get_or_compute(
+            ('feature_store', name, source_file), fingerprint,
+            lambda: self._load_or_build(name, source_file, fingerprint, builder)
+        )
+
+    def _load_or_build(self, name, source_file, fingerprint, builder):
+        for extension, reader in [('parquet', pd.read_parquet), ('pkl', pd.read_pickle)]:
+            table_path = self._table_path(name, fingerprint, extension)
+            if os.path.exists(table_path):
+                try:
+                    table = reader(table_path)
+                    print(f"📦 Ознаки '{name}' завантажено зі сховища: {os.path.basename(table_path)}")
+                    return table
+                except (ImportError, ValueError, OSError) as e:
+                    print(f"⚠️ Не вдалося прочитати {os.path.basename(table_path)}: {e}")
+
+        table = builder(source_file)
+        self._write(name, fingerprint, table)
+        return table
+
+    def _write(self, name, fingerprint, table):
+        try:
+            table_path = self._table_path(name, fingerprint, 'parquet')
+            tmp_path = table_path + '.tmp'
+            table.to_parquet(tmp_path, index=False)
+        except (ImportError, ValueError, TypeError):
+            # Без pyarrow (або для несумісних типів колонок) - pickle
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            table_path = self._table_path(name, fingerprint, 'pkl')
+            tmp_path = table_path + '.tmp'
+            table.to_pickle(tmp_path)
+
+        os.replace(tmp_path, table_path)
+        print(f"💾 Ознаки '{name}' збережено у сховище: {os.path.basename(table_path)}")
+        self._cleanup(name)
+
+    def _cleanup(self, name):
+        """Залишає лише keep_versions найновіших версій таблиці"""
+        versions = [
+            path for path in glob.glob(os.path.join(self.store_path, f"{name}_*"))
+            if not path.endswith('.tmp')
+        ]
+        versions.sort(key=os.path.getmtime, reverse=True)
+        for path in versions[self.keep_versions:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def build_department_stats(data):
+    """
+    Статистика по відділеннях за весь період даних.
+    Спільна для ознак прогнозу (історія відділення) та аналізу ефективності.
+    """
+    stats = data.groupby('department_id').agg(
+        department_number=('department_number', 'first'),
+        department_city=('department_city', 'first'),
+        department_region=('department_region', 'first'),
+        total_deliveries=('deliveries_count', 'sum'),
+        avg_deliveries=('deliveries_count', 'mean'),
+        std_deliveries=('deliveries_count', 'std'),
+        avg_processing_time=('processing_time_hours', 'mean'),
+        std_processing_time=('processing_time_hours', 'std'),
+        avg_market_share=('deliveries_share_percentage', 'mean'),
+        active_periods=('start_month', 'count')
+    )
+    return stats.reset_index()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_feature_store():
+    """Повертає спільне для процесу сховище ознак"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = FeatureStore()
+    return _store
+
+
+def get_department_stats(delivery_file):
+    """Таблиця статистики відділень для файлу періодичних доставок"""
+    return get_feature_store().get_table(
+        'department_stats', delivery_file,
+        lambda source_file: build_department_stats(get_data_cache().read_csv(source_file, copy=False))
+    )
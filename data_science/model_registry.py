@@ -0,0 +1,273 @@
+# data_science/model_registry.py
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+from datetime import datetime
+import sys
+
+import joblib
+import numpy as np
+
+sys.path.append('..')
+from config.database_config import DatabaseConfig
+from utils.file_catalog import register_file
+
+
+class ModelRegistry:
+    """
+    Реєстр збережених моделей.
+
+    Індекс (models/registry.json) зберігає для кожної версії метадані:
+    відбиток навчальних даних, метрики, список ознак, розмір та стиснення
+    файлу. Активна версія завантажується з диска один раз і далі віддається
+    з кешу процесу; mmap застосовується лише до нестиснених файлів.
+    """
+
+    INDEX_FILENAME = 'registry.json'
+
+    def __init__(self, model_path=None, mmap_mode=None, max_loaded=4):
+        config = DatabaseConfig()
+        self.model_path = model_path or os.path.join(config.PROCESSED_DATA_PATH, 'models')
+        self.index_path = os.path.join(self.model_path, self.INDEX_FILENAME)
+        self.mmap_mode = mmap_mode
+        self.max_loaded = max_loaded
+        self._lock = threading.RLock()
+        self._index = None
+        self._index_mtime = None
+        self._loaded = OrderedDict()
+        os.makedirs(self.model_path, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Індекс
+    # ------------------------------------------------------------------
+
+    def _read_index(self):
+        """Індекс з диска; перечитується лише при зміні файлу"""
+        try:
+            mtime = os.stat(self.index_path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+
+        if self._index is None or mtime != self._index_mtime:
+            if mtime is None:
+                self._index = {'models': {}}
+            else:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            self._index_mtime = mtime
+        return self._index
+
+    def _write_index(self, index):
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.index_path)
+        self._index = index
+        self._index_mtime = os.stat(self.index_path).st_mtime_ns
+
+    @staticmethod
+    def _to_builtin(obj):
+        if isinstance(obj, dict):
+            return {str(k): ModelRegistry._to_builtin(v) for k, v in obj.items()}
+        if isinstance(obj, (list, tuple)):
+            return [ModelRegistry._to_builtin(v) for v in obj]
+        if isinstance(obj, np.integer):
+            return int(obj)
+        if isinstance(obj, np.floating):
+            return float(obj)
+        return obj
+
+    def register(self, model_name, model_filepath, metadata=None, activate=True, model_data=None):
+        """
+        Додає збережену модель до індексу (та за замовчуванням робить її активною).
+        model_data - щойно збережений об'єкт, який одразу кладеться в кеш процесу.
+        """
+        filename = os.path.basename(model_filepath)
+        entry = {
+            'file': filename,
+            'registered_at': datetime.now().isoformat(),
+            'size_kb': round(os.path.getsize(model_filepath) / 1024, 1)
+        }
+        entry.update(self._to_builtin(metadata or {}))
+
+        with self._lock:
+            index = self._read_index()
+            model_info = index['models'].setdefault(model_name, {'active': None, 'versions': []})
+            model_info['versions'] = [v for v in model_info['versions'] if v['file'] != filename]
+            model_info['versions'].append(entry)
+            if activate:
+                model_info['active'] = filename
+            self._write_index(index)
+
+            if model_data is not None:
+                self._remember(os.path.join(self.model_path, filename), model_data)
+
+        register_file(self.index_path)
+        return entry
+
+    def apply_retention(self, model_name, keep_latest, keep_best, metric='rmse'):
+        """
+        Видаляє файли старих версій: лишаються активна, keep_latest найновіших
+        та keep_best з найменшим значенням metric. Повертає список видалених файлів.
+        """
+        with self._lock:
+            index = self._read_index()
+            model_info = index['models'].get(model_name)
+            if not model_info:
+                return []
+
+            versions = model_info['versions']
+            keep = {model_info['active']}
+            keep.update(v['file'] for v in versions[-keep_latest:] if keep_latest > 0)
+            scored = [v for v in versions if v.get('metrics', {}).get(metric) is not None]
+            scored.sort(key=lambda v: v['metrics'][metric])
+            keep.update(v['file'] for v in scored[:keep_best])
+
+            removed = [v['file'] for v in versions if v['file'] not in keep]
+            if not removed:
+                return []
+
+            for filename in removed:
+                model_filepath = os.path.join(self.model_path, filename)
+                self._loaded.pop(model_filepath, None)
+                try:
+                    os.remove(model_filepath)
+                except FileNotFoundError:
+                    pass
+                register_file(model_filepath)
+
+            model_info['versions'] = [v for v in versions if v['file'] in keep]
+            self._write_index(index)
+
+        register_file(self.index_path)
+        return removed
+
+    def list_models(self, model_name=None):
+        """Версії моделей з індексу (новіші першими)"""
+        with self._lock:
+            models = self._read_index()['models']
+            names = [model_name] if model_name else list(models)
+            return {
+                name: {
+                    'active': models[name]['active'],
+                    'versions': list(reversed(models[name]['versions']))
+                }
+                for name in names if name in models
+            }
+
+    def activate(self, model_name, filename):
+        """Робить вказану версію активною"""
+        with self._lock:
+            index = self._read_index()
+            model_info = index['models'].get(model_name)
+            if not model_info or not any(v['file'] == filename for v in model_info['versions']):
+                raise ValueError(f"Версія {filename} моделі {model_name} не зареєстрована")
+            model_info['active'] = filename
+            self._write_index(index)
+
+    def get_active(self, model_name):
+        """
+        Метадані активної версії. Моделі, збережені до появи реєстру,
+        реєструються автоматично (найновіший файл стає активним).
+        """
+        with self._lock:
+            model_info = self._read_index()['models'].get(model_name)
+            if model_info and model_info['active']:
+                for entry in model_info['versions']:
+                    if entry['file'] == model_info['active']:
+                        return dict(entry)
+
+            legacy_files = [
+                f for f in os.listdir(self.model_path)
+                if f.startswith(f"{model_name}_") and f.endswith('.joblib')
+            ]
+            if not legacy_files:
+                return None
+
+            latest = max(legacy_files, key=lambda f: os.path.getmtime(os.path.join(self.model_path, f)))
+            return dict(self.register(model_name, os.path.join(self.model_path, latest)))
+
+    def save_tuning(self, model_name, tuning):
+        """Зберігає найкращу конфігурацію підбору гіперпараметрів для моделі"""
+        with self._lock:
+            index = self._read_index()
+            index.setdefault('tuning', {})[model_name] = self._to_builtin(tuning)
+            self._write_index(index)
+        register_file(self.index_path)
+
+    def get_tuning(self, model_name):
+        """Результат останнього підбору гіперпараметрів (або None)"""
+        with self._lock:
+            tuning = self._read_index().get('tuning', {}).get(model_name)
+            return dict(tuning) if tuning else None
+
+    def get_tuned_params(self, model_name):
+        """Найкращі гіперпараметри моделі (порожній словник, якщо підбір не виконувався)"""
+        tuning = self.get_tuning(model_name)
+        return dict(tuning['best_params']) if tuning else {}
+
+    # ------------------------------------------------------------------
+    # Завантаження
+    # ------------------------------------------------------------------
+
+    def load(self, model_name, filename=None):
+        """
+        Повертає (метадані, дані моделі) для активної або вказаної версії.
+        Дані моделі спільні для процесу - їх не можна змінювати.
+        """
+        with self._lock:
+            if filename is None:
+                entry = self.get_active(model_name)
+                if entry is None:
+                    return None, None
+            else:
+                entry = next((dict(v) for v in self._read_index()['models'].get(model_name, {}).get('versions', [])
+                              if v['file'] == filename), {'file': filename})
+
+            model_filepath = os.path.join(self.model_path, entry['file'])
+            model_data = self._loaded.get(model_filepath)
+            if model_data is not None:
+                self._loaded.move_to_end(model_filepath)
+                return entry, model_data
+
+            # Стиснені файли не відображаються в пам'ять - лише читаються повністю
+            mmap_mode = self.mmap_mode if not entry.get('compress') else None
+            load_start = time.perf_counter()
+            model_data = joblib.load(model_filepath, mmap_mode=mmap_mode)
+            entry['load_seconds'] = round(time.perf_counter() - load_start, 3)
+            self._remember(model_filepath, model_data)
+
+            size_mb = os.path.getsize(model_filepath) / (1024 * 1024)
+            print(f"📥 Модель завантажена з реєстру: {entry['file']} ({size_mb:.1f} МБ, "
+                  f"{entry['load_seconds']:.2f} с{', mmap' if mmap_mode else ''})")
+            return entry, model_data
+
+    def _remember(self, model_filepath, model_data):
+        self._loaded[model_filepath] = model_data
+        self._loaded.move_to_end(model_filepath)
+        while len(self._loaded) > self.max_loaded:
+            self._loaded.popitem(last=False)
+
+    def clear_cache(self):
+        with self._lock:
+            self._loaded.clear()
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry():
+    """
+    Спільний для процесу реєстр моделей.
+    POSTDW_MODEL_MMAP=1 - масиви моделей відображаються в пам'ять (joblib mmap_mode='r').
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                mmap_mode = 'r' if os.environ.get('POSTDW_MODEL_MMAP') == '1' else None
+                _registry = ModelRegistry(mmap_mode=mmap_mode)
+    return _registry
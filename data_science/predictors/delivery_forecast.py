@@ -3,37 +3,188 @@ import pandas as pd
 import numpy as np
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.linear_model import LinearRegression
-from sklearn.metrics import mean_absolute_error, mean_squared_error
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+import copy
+import os
 import sys
+import time
 
 sys.path.append('..')
 from data_science.base_model import BaseMLModel
-from utils.helpers import get_latest_csv_file
+from data_science.encoding import CategoricalEncoder
+from utils.helpers import get_latest_csv_file, file_fingerprint
+from utils.data_cache import get_data_cache
+from data_science.feature_store import get_feature_store, get_department_stats, build_department_stats
+from data_science.model_registry import get_model_registry
+from data_science.predictors.segmented_model import SegmentedForecastModel, fit_segment_model
+from data_science.predictors.intervals import forest_distribution
 
 
 class DeliveryForecast(BaseMLModel):
     """Прогнозування кількості доставок на наступний місяць"""
 
-    def __init__(self):
-        super().__init__("delivery_forecast")
-        self.model = RandomForestRegressor(n_estimators=100, random_state=42)
+    FORECAST_KEYS = ['department_id', 'parcel_type_id', 'transport_body_type_id']
 
-    def load_periodic_data(self):
-        """Завантаження періодичних даних доставок"""
-        print("📥 Завантаження періодичних даних...")
+    # Інтервал прогнозу: перцентилі прогнозів окремих дерев лісу
+    PREDICTION_PERCENTILES = [10, 50, 90]
+
+    # Найбільший горизонт прогнозу, місяців
+    MAX_FORECAST_HORIZON = 24
 
+    # Ознаки для моделі
+    FEATURE_COLUMNS = [
+        'department_id', 'parcel_type_id', 'transport_body_type_id',
+        'start_month', 'period_duration', 'parcel_max_weight',
+        'parcel_volume', 'processing_time_hours',
+        'is_main_office', 'is_local_branch',
+        'is_winter', 'is_spring', 'is_summer', 'is_autumn',
+        'dept_avg_deliveries', 'dept_avg_processing_time', 'dept_avg_share',
+        'region_avg_deliveries', 'region_avg_processing'
+    ]
+
+    # Сегментація: окрема модель на кожне значення колонки
+    SEGMENT_COLUMNS = {
+        'region': 'department_region',
+        'department_type': 'department_type'
+    }
+
+    def __init__(self, n_jobs=None, n_estimators=None, segment_by=None):
+        super().__init__("delivery_forecast")
+        self.n_jobs = self.config.ML_N_JOBS if n_jobs is None else n_jobs
+
+        # segment_by='' - одна модель незалежно від конфігурації
+        if segment_by is None:
+            segment_by = self.config.ML_SEGMENT_BY
+        if segment_by and segment_by not in self.SEGMENT_COLUMNS:
+            raise ValueError(f"Невідома сегментація: {segment_by}. Доступні: {', '.join(self.SEGMENT_COLUMNS)}")
+        self.segment_by = segment_by or None
+        self.segment_column = self.SEGMENT_COLUMNS.get(segment_by)
+        if segment_by:
+            # Сегментовані моделі - окрема модель у реєстрі, загальна лишається активною
+            self.model_name = f"delivery_forecast_by_{segment_by}"
+
+        # Пріоритет: явний параметр > результат підбору гіперпараметрів > конфігурація
+        # (моделі сегментів використовують гіперпараметри, підібрані для загальної моделі)
+        self.model_params = {'n_estimators': self.config.ML_N_ESTIMATORS}
+        self.model_params.update(get_model_registry().get_tuned_params('delivery_forecast'))
+        if n_estimators is not None:
+            self.model_params['n_estimators'] = n_estimators
+        self.n_estimators = self.model_params['n_estimators']
+
+        self.model = self._create_model()
+
+    def _create_model(self):
+        return RandomForestRegressor(random_state=42, n_jobs=self.n_jobs, **self.model_params)
+
+    def predict(self, X, segments=None):
+        """Прогнозування; для сегментованої моделі segments - сегмент кожного рядка X"""
+        if isinstance(self.model, SegmentedForecastModel):
+            return self.model.predict(self.scaler.transform(X), segments)
+        return super().predict(X)
+
+    def predict_with_intervals(self, X, segments=None):
+        """
+        Точковий прогноз та P10/P50/P90 з прогнозів окремих дерев - одним проходом по лісу.
+        Повертає (прогноз, масив перцентилів форми 3 x рядки).
+        """
+        if self.model is None:
+            raise ValueError("Модель не навчена! Спочатку викличте train_model()")
+
+        X_scaled = self.scaler.transform(X)
+        if isinstance(self.model, SegmentedForecastModel):
+            return self.model.predict_distribution(X_scaled, segments, self.PREDICTION_PERCENTILES)
+        return forest_distribution(self.model, X_scaled, self.PREDICTION_PERCENTILES)
+
+    @staticmethod
+    def _interval_columns(predictions, quantiles):
+        """Колонки P10/P50/P90 (цілі, невід'ємні) та впевненість за відносною шириною інтервалу"""
+        p10, p50, p90 = (np.maximum(np.round(q), 0).astype(int) for q in quantiles)
+        relative_width = (quantiles[2] - quantiles[0]) / np.maximum(np.abs(predictions), 1)
+        confidence = np.where(predictions <= 0, 'low',
+                              np.where(relative_width <= 0.5, 'high',
+                                       np.where(relative_width <= 1.0, 'medium', 'low')))
+        return {'p10_deliveries': p10, 'p50_deliveries': p50, 'p90_deliveries': p90}, confidence
+
+    def _segments(self, forecast_data):
+        """Сегменти рядків для вибору моделі (None, якщо модель одна)"""
+        if isinstance(self.model, SegmentedForecastModel):
+            return forecast_data[self.model.segment_column].to_numpy()
+        return None
+
+    def get_periodic_data_file(self):
+        """Шлях до найновішого файлу періодичних доставок"""
         delivery_file = get_latest_csv_file(self.config.RAW_DATA_PATH, 'delivery_periodic_raw_data_*.csv')
         if not delivery_file:
             raise FileNotFoundError("Файл delivery_periodic_raw_data не знайдено")
+        return delivery_file
 
-        data = pd.read_csv(delivery_file)
+    def load_periodic_data(self, delivery_file=None):
+        """Завантаження періодичних даних доставок"""
+        print("📥 Завантаження періодичних даних...")
+
+        if delivery_file is None:
+            delivery_file = self.get_periodic_data_file()
+
+        data = get_data_cache().read_csv(delivery_file)
         print(f"✅ Завантажено {len(data)} записів періодичних доставок")
 
         return data
 
-    def prepare_forecast_features(self, data):
-        """Підготовка ознак для прогнозування"""
+    def load_forecast_features(self):
+        """
+        Ознаки для прогнозування зі сховища ознак (диск + пам'ять процесу).
+        Перераховуються лише при зміні файлу даних; результат лише для читання.
+        """
+        delivery_file = self.get_periodic_data_file()
+        return get_feature_store().get_table('forecast_features', delivery_file, self._build_forecast_features)
+
+    def _build_forecast_features(self, delivery_file):
+        data = self.load_periodic_data(delivery_file)
+        return self.prepare_forecast_features(data, get_department_stats(delivery_file))
+
+    def load_forecast_template(self):
+        """
+        Останній стан кожної комбінації відділення x тип посилки x транспорт -
+        основа для побудови ознак прогнозу. Кешується до зміни файлу даних.
+        """
+        delivery_file = self.get_periodic_data_file()
+        return get_data_cache().get_or_compute(
+            ('forecast_template', delivery_file), file_fingerprint(delivery_file),
+            lambda: self.load_forecast_features().groupby(self.FORECAST_KEYS).last().reset_index()
+        )
+
+    @staticmethod
+    def _apply_month_features(forecast_data, months):
+        """Місяць прогнозу та сезонні ознаки (місяць - число або масив)"""
+        forecast_data['start_month'] = months
+        forecast_data['is_winter'] = np.isin(months, [12, 1, 2]).astype(int)
+        forecast_data['is_spring'] = np.isin(months, [3, 4, 5]).astype(int)
+        forecast_data['is_summer'] = np.isin(months, [6, 7, 8]).astype(int)
+        forecast_data['is_autumn'] = np.isin(months, [9, 10, 11]).astype(int)
+
+    def _build_feature_matrix(self, forecast_data):
+        """Матриця ознак у порядку навчання з тим самим кодуванням категорій"""
+        # Нові категорії отримують код невідомого значення лише у своїх рядках
+        return self.encoder.transform(forecast_data[self.feature_names].fillna(0))
+
+    def get_feature_columns(self, data):
+        """Ознаки моделі, наявні в data"""
+        return [col for col in self.FEATURE_COLUMNS if col in data.columns]
+
+    def prepare_forecast_features(self, data, department_stats=None, history_data=None):
+        """
+        Підготовка ознак для прогнозування.
+        department_stats - готова статистика відділень (зі сховища ознак), інакше рахується з history_data.
+        history_data - записи для історичних агрегатів по відділеннях і регіонах
+        (за замовчуванням сама data; у бектестингу - лише записи до точки відсічення).
+        """
+        if history_data is None:
+            history_data = data
+
         print("🔧 Підготовка ознак для прогнозування...")
 
         # Створюємо додаткові ознаки на основі періодів
@@ -55,11 +206,13 @@ class DeliveryForecast(BaseMLModel):
         data['parcel_volume'] = data['parcel_volume'].fillna(data['parcel_max_weight'])
 
         # Історичні тренди по відділенню
-        dept_history = data.groupby('department_id').agg({
-            'deliveries_count': ['mean', 'std', 'sum'],
-            'processing_time_hours': 'mean',
-            'deliveries_share_percentage': 'mean'
-        })
+        if department_stats is None:
+            department_stats = build_department_stats(history_data)
+
+        dept_history = department_stats.set_index('department_id')[[
+            'avg_deliveries', 'std_deliveries', 'total_deliveries',
+            'avg_processing_time', 'avg_market_share'
+        ]]
 
         dept_history.columns = [
             'dept_avg_deliveries', 'dept_std_deliveries', 'dept_total_deliveries',
@@ -75,7 +228,7 @@ class DeliveryForecast(BaseMLModel):
         data['is_autumn'] = data['start_month'].isin([9, 10, 11]).astype(int)
 
         # Тренди по регіонах
-        region_stats = data.groupby('department_region').agg({
+        region_stats = history_data.groupby('department_region').agg({
             'deliveries_count': 'mean',
             'processing_time_hours': 'mean'
         })
@@ -93,50 +246,250 @@ class DeliveryForecast(BaseMLModel):
 
         return data
 
-    def train_forecast_model(self):
-        """Навчання моделі прогнозування"""
+    def train_forecast_model(self, incremental=False, save=True):
+        """
+        Навчання моделі прогнозування.
+
+        incremental=True - донавчання активної моделі: на періодах, новіших за
+        останній навчальний, додаються дерева (warm_start). Якщо сумісної
+        активної моделі немає або ліс досяг ML_MAX_ESTIMATORS - повне навчання.
+        Сегментовані моделі завжди навчаються повністю.
+        save=False - без збереження та реєстрації моделі (для порівнянь і бенчмарків).
+        """
         print("🎯 Навчання моделі прогнозування доставок...")
+        start_time = time.perf_counter()
+
+        delivery_file = self.get_periodic_data_file()
+        data = self.load_forecast_features()
+
+        # Перевіряємо, які з ознак моделі існують
+        existing_features = self.get_feature_columns(data)
+        print(f"📊 Використовуємо {len(existing_features)} ознак з {len(self.FEATURE_COLUMNS)} запланованих")
+
+        report = None
+        if incremental and self.segment_by:
+            print("ℹ️ Сегментовані моделі не донавчаються - повне навчання")
+        elif incremental:
+            report = self._train_incremental(data, existing_features)
+        if report is None and self.segment_by:
+            report = self._train_segmented(data, existing_features)
+        elif report is None:
+            report = self._train_full(data, existing_features)
+
+        report['total_seconds'] = round(time.perf_counter() - start_time, 3)
+        report['training_data_file'] = os.path.basename(delivery_file)
+        print(f"⏱️ Навчання ({report['mode']}): {report['train_seconds']:.2f} с, "
+              f"всього {report['total_seconds']:.2f} с, дерев: {report['n_estimators']}, n_jobs={self.n_jobs}")
+
+        if report['mode'] == 'up_to_date':
+            model_path = os.path.join(self.model_path, self.model_file)
+        elif not save:
+            model_path = None
+        else:
+            # Збереження моделі (з метаданими для реєстру)
+            model_path = self.save_model({
+                'metrics': report['metrics'],
+                'training_data_file': report['training_data_file'],
+                'training_data_fingerprint': file_fingerprint(delivery_file),
+                'training_data_size': report['training_rows'],
+                'trained_until_period': report['trained_until_period'],
+                'training_report': report
+            })
 
-        data = self.load_periodic_data()
-        data = self.prepare_forecast_features(data)
-
-        # Вибираємо ознаки для моделі
-        feature_columns = [
-            'department_id', 'parcel_type_id', 'transport_body_type_id',
-            'start_month', 'period_duration', 'parcel_max_weight',
-            'parcel_volume', 'processing_time_hours',
-            'is_main_office', 'is_local_branch',
-            'is_winter', 'is_spring', 'is_summer', 'is_autumn',
-            'dept_avg_deliveries', 'dept_avg_processing_time', 'dept_avg_share',
-            'region_avg_deliveries', 'region_avg_processing'
-        ]
+        return {
+            'model_metrics': report['metrics'],
+            'model_path': model_path,
+            'feature_importance': self.get_feature_importance(),
+            'training_data_size': report['training_rows'],
+            'training_report': report
+        }
 
-        # Перевіряємо, які колонки існують
-        existing_features = [col for col in feature_columns if col in data.columns]
-        print(f"📊 Використовуємо {len(existing_features)} ознак з {len(feature_columns)} запланованих")
+    def _train_full(self, data, feature_columns):
+        """Навчання з нуля на всіх даних"""
+        # Нові об'єкти: активна модель з реєстру спільна для процесу і не змінюється
+        self.model = self._create_model()
+        self.scaler = StandardScaler()
+        self.encoder = CategoricalEncoder()
 
-        # Підготовка даних
-        X, y = self.prepare_data(data, 'deliveries_count', existing_features)
+        X, y = self.prepare_data(data, 'deliveries_count', feature_columns)
 
-        # Навчання моделі
+        fit_start = time.perf_counter()
         metrics = self.train_model(X, y)
 
-        # Збереження моделі
-        model_path = self.save_model()
+        return {
+            'mode': 'full',
+            'n_jobs': self.n_jobs,
+            'n_estimators': self.model.n_estimators,
+            'trees_added': self.model.n_estimators,
+            'training_rows': len(X),
+            'trained_until_period': int(data['start_period_id'].max()),
+            'train_seconds': round(time.perf_counter() - fit_start, 3),
+            'metrics': metrics
+        }
+
+    def _train_segmented(self, data, feature_columns):
+        """Окремі моделі по сегментах (та загальна для решти), навчені паралельно в пулі процесів"""
+        self.scaler = StandardScaler()
+        self.encoder = CategoricalEncoder()
+
+        X, y = self.prepare_data(data, 'deliveries_count', feature_columns)
+        segments = data.loc[X.index, self.segment_column].astype(str).to_numpy()
+
+        # Той самий поділ, що й для однієї моделі, - метрики порівнянні
+        X_train, X_test, y_train, y_test, seg_train, seg_test = train_test_split(
+            X, y, segments, test_size=0.2, random_state=42
+        )
+        X_train_scaled = self.scaler.fit_transform(X_train)
+        X_test_scaled = self.scaler.transform(X_test)
+        y_train = y_train.to_numpy(dtype=float)
+        y_test = y_test.to_numpy(dtype=float)
+
+        names, counts = np.unique(seg_train, return_counts=True)
+        own_segments = [name for name, count in zip(names, counts) if count >= self.config.ML_MIN_SEGMENT_ROWS]
+
+        # Загальна модель (segment=None) - для малих і нових сегментів
+        n_workers = (os.cpu_count() or 1) if self.n_jobs < 1 else self.n_jobs
+        n_workers = min(n_workers, len(own_segments) + 1)
+        task_n_jobs = 1 if n_workers > 1 else self.n_jobs
+        tasks = [{'segment': None, 'X': X_train_scaled, 'y': y_train}]
+        for segment in own_segments:
+            mask = seg_train == segment
+            tasks.append({'segment': segment, 'X': X_train_scaled[mask], 'y': y_train[mask]})
+        for task in tasks:
+            task.update(model_params=self.model_params, n_jobs=task_n_jobs)
+
+        print(f"⚙️ Сегментів ({self.segment_column}): {len(names)}, власних моделей: {len(own_segments)}, "
+              f"процесів: {n_workers}")
+
+        fit_start = time.perf_counter()
+        if n_workers > 1:
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                results = list(pool.map(fit_segment_model, tasks))
+        else:
+            results = [fit_segment_model(task) for task in tasks]
+        train_seconds = time.perf_counter() - fit_start
+
+        fitted = {result['segment']: result for result in results}
+        fallback = fitted.pop(None)
+        self.model = SegmentedForecastModel(
+            self.segment_column,
+            {segment: result['model'] for segment, result in fitted.items()},
+            fallback['model'],
+            {segment: result['rows'] for segment, result in fitted.items()}
+        )
+
+        test_predictions = self.model.predict(X_test_scaled, seg_test)
+        metrics = {'train_r2': r2_score(y_train, self.model.predict(X_train_scaled, seg_train))}
+        metrics.update(self.evaluate_model(X_test_scaled, y_test, predictions=test_predictions))
+        print(f"✅ Моделі сегментів навчені! R² = {metrics['test_r2']:.3f}")
+
+        segment_report = {}
+        for segment in np.unique(np.concatenate([seg_train, seg_test])):
+            test_mask = seg_test == segment
+            errors = test_predictions[test_mask] - y_test[test_mask]
+            segment_report[segment] = {
+                'model': 'segment' if segment in fitted else 'fallback',
+                'train_rows': int((seg_train == segment).sum()),
+                'test_rows': int(test_mask.sum()),
+                'fit_seconds': round(fitted[segment]['seconds'], 3) if segment in fitted else None,
+                'mae': round(float(np.abs(errors).mean()), 3) if test_mask.any() else None,
+                'rmse': round(float(np.sqrt((errors ** 2).mean())), 3) if test_mask.any() else None
+            }
 
         return {
-            'model_metrics': metrics,
-            'model_path': model_path,
-            'feature_importance': self.get_feature_importance(),
-            'training_data_size': len(X)
+            'mode': 'segmented',
+            'segment_by': self.segment_by,
+            'n_jobs': self.n_jobs,
+            'n_workers': n_workers,
+            'n_estimators': self.model.n_estimators,
+            'trees_added': self.model.n_estimators,
+            'training_rows': len(X),
+            'trained_until_period': int(data['start_period_id'].max()),
+            'train_seconds': round(train_seconds, 3),
+            'fit_seconds_total': round(sum(result['seconds'] for result in results), 3),
+            'fallback_fit_seconds': round(fallback['seconds'], 3),
+            'segments': segment_report,
+            'metrics': metrics
+        }
+
+    def _train_incremental(self, data, feature_columns):
+        """Донавчання активної моделі на нових періодах; None - потрібне повне навчання"""
+        entry = self.load_active_model()
+        if entry is None or entry.get('trained_until_period') is None or list(self.feature_names) != feature_columns:
+            print("ℹ️ Сумісної активної моделі немає - повне навчання")
+            return None
+
+        incremental_trees = self.config.ML_INCREMENTAL_TREES
+        if self.model.n_estimators + incremental_trees > self.config.ML_MAX_ESTIMATORS:
+            print(f"ℹ️ Ліс досяг {self.config.ML_MAX_ESTIMATORS} дерев - повне перенавчання")
+            return None
+
+        last_period = entry['trained_until_period']
+        new_data = data[data['start_period_id'] > last_period]
+        if new_data.empty:
+            print("✅ Нових періодів немає - активна модель актуальна")
+            return {
+                'mode': 'up_to_date',
+                'n_jobs': self.n_jobs,
+                'n_estimators': self.model.n_estimators,
+                'trees_added': 0,
+                'training_rows': entry.get('training_data_size', 0),
+                'new_rows': 0,
+                'trained_until_period': last_period,
+                'train_seconds': 0.0,
+                'metrics': entry.get('metrics', {})
+            }
+
+        print(f"➕ Донавчання на {len(new_data)} записах нових періодів (після {last_period})")
+        X_new, y_new = self.prepare_data(new_data, 'deliveries_count', feature_columns)
+
+        # Оцінка до та після на відкладеній частині нових періодів
+        if len(X_new) >= 10:
+            X_train, X_test, y_train, y_test = train_test_split(X_new, y_new, test_size=0.2, random_state=42)
+            X_test_scaled = self.scaler.transform(X_test)
+            previous_metrics = self.evaluate_model(X_test_scaled, y_test)
+        else:
+            X_train, y_train, X_test_scaled, previous_metrics = X_new, y_new, None, None
+
+        # Скейлер лишається від початкового навчання - нові дерева бачать ті ж масштаби
+        model = copy.deepcopy(self.model)
+        model.set_params(warm_start=True, n_jobs=self.n_jobs,
+                         n_estimators=model.n_estimators + incremental_trees)
+
+        fit_start = time.perf_counter()
+        model.fit(self.scaler.transform(X_train), y_train)
+        train_seconds = time.perf_counter() - fit_start
+
+        model.set_params(warm_start=False)
+        self.model = model
+
+        if X_test_scaled is not None:
+            metrics = {'train_r2': model.score(self.scaler.transform(X_train), y_train)}
+            metrics.update(self.evaluate_model(X_test_scaled, y_test))
+            print(f"✅ R² на нових періодах: {previous_metrics['test_r2']:.3f} -> {metrics['test_r2']:.3f}")
+        else:
+            metrics = entry.get('metrics', {})
+
+        return {
+            'mode': 'incremental',
+            'n_jobs': self.n_jobs,
+            'n_estimators': model.n_estimators,
+            'trees_added': incremental_trees,
+            'training_rows': entry.get('training_data_size', 0) + len(X_new),
+            'new_rows': len(X_new),
+            'base_model': entry['file'],
+            'trained_until_period': int(new_data['start_period_id'].max()),
+            'train_seconds': round(train_seconds, 3),
+            'metrics': metrics,
+            'previous_metrics': previous_metrics
         }
 
     def forecast_next_month(self):
         """Прогнозування доставок на наступний місяць"""
         print("🔮 Прогнозування доставок на наступний місяць...")
 
-        data = self.load_periodic_data()
-        data = self.prepare_forecast_features(data)
+        # Активна модель з реєстру (без перенавчання), якщо не навчена в цьому процесі
+        self.ensure_model()
 
         # Визначаємо наступний місяць
         current_date = datetime.now()
@@ -145,72 +498,32 @@ class DeliveryForecast(BaseMLModel):
 
         print(f"📅 Прогнозування на {next_month}/{next_year}")
 
-        # Створюємо шаблон для прогнозування на основі останніх даних
-        latest_data = data.groupby(['department_id', 'parcel_type_id', 'transport_body_type_id']).last().reset_index()
-
-        # Оновлюємо дані для наступного місяця
-        forecast_data = latest_data.copy()
-        forecast_data['start_month'] = next_month
+        # Шаблон: останній стан кожної комбінації, оновлений на наступний місяць
+        forecast_data = self.load_forecast_template().copy()
         forecast_data['start_year'] = next_year
+        self._apply_month_features(forecast_data, next_month)
+
+        X_forecast = self._build_feature_matrix(forecast_data)
+        predictions, quantiles = self.predict_with_intervals(X_forecast, self._segments(forecast_data))
 
-        # Оновлюємо сезонні ознаки
-        forecast_data['is_winter'] = (next_month in [12, 1, 2]) * 1
-        forecast_data['is_spring'] = (next_month in [3, 4, 5]) * 1
-        forecast_data['is_summer'] = (next_month in [6, 7, 8]) * 1
-        forecast_data['is_autumn'] = (next_month in [9, 10, 11]) * 1
-
-        # Використовуємо ті ж ознаки, що й при навчанні
-        feature_columns = self.feature_names
-
-        X_forecast = forecast_data[feature_columns].fillna(0)
-
-        # Обробка категоріальних змінних
-        for column in X_forecast.columns:
-            if column in self.label_encoders:
-                try:
-                    X_forecast[column] = self.label_encoders[column].transform(X_forecast[column].astype(str))
-                except ValueError:
-                    # Якщо є нові категорії, використовуємо найчастіше значення
-                    X_forecast[column] = 0
-
-        predictions = self.predict(X_forecast)
-
-        # Формуємо результати прогнозу
-        forecast_results = []
-        for i, pred in enumerate(predictions):
-            if i < len(forecast_data):
-                forecast_results.append({
-                    'department_id': int(forecast_data.iloc[i]['department_id']),
-                    'department_number': str(forecast_data.iloc[i].get('department_number',
-                                                                       f'DEPT-{forecast_data.iloc[i]["department_id"]}')),
-                    'department_city': str(forecast_data.iloc[i].get('department_city', 'Unknown')),
-                    'department_region': str(forecast_data.iloc[i].get('department_region', 'Unknown')),
-                    'parcel_type_name': str(forecast_data.iloc[i].get('parcel_type_name', 'Unknown')),
-                    'transport_type_name': str(forecast_data.iloc[i].get('transport_type_name', 'Unknown')),
-                    'predicted_deliveries': max(0, round(pred)),
-                    'forecast_month': next_month,
-                    'forecast_year': next_year,
-                    'confidence': 'medium' if pred > 0 else 'low'
-                })
+        # Формуємо результати прогнозу колонками (без поелементного iloc)
+        forecast_frame = self._build_forecast_frame(forecast_data, predictions, next_month, next_year, quantiles)
+        predicted = forecast_frame['predicted_deliveries']
 
         # Агрегуємо прогнози
-        total_predicted = sum(result['predicted_deliveries'] for result in forecast_results)
-
-        # Прогнози по регіонах
-        region_forecasts = {}
-        for result in forecast_results:
-            region = result['department_region']
-            if region not in region_forecasts:
-                region_forecasts[region] = 0
-            region_forecasts[region] += result['predicted_deliveries']
-
-        # Прогнози по типах посилок
-        parcel_type_forecasts = {}
-        for result in forecast_results:
-            parcel_type = result['parcel_type_name']
-            if parcel_type not in parcel_type_forecasts:
-                parcel_type_forecasts[parcel_type] = 0
-            parcel_type_forecasts[parcel_type] += result['predicted_deliveries']
+        total_predicted = int(predicted.sum())
+
+        # Прогнози по регіонах та типах посилок (порядок - перша поява, як і раніше)
+        region_forecasts = {
+            region: int(value)
+            for region, value in predicted.groupby(forecast_frame['department_region'], sort=False).sum().items()
+        }
+        parcel_type_forecasts = {
+            parcel_type: int(value)
+            for parcel_type, value in predicted.groupby(forecast_frame['parcel_type_name'], sort=False).sum().items()
+        }
+
+        forecast_results = forecast_frame.to_dict('records')
 
         summary = {
             'forecast_period': f"{next_month}/{next_year}",
@@ -218,9 +531,7 @@ class DeliveryForecast(BaseMLModel):
             'total_departments': len(forecast_results),
             'region_forecasts': region_forecasts,
             'parcel_type_forecasts': parcel_type_forecasts,
-            'top_departments': sorted(forecast_results,
-                                      key=lambda x: x['predicted_deliveries'],
-                                      reverse=True)[:10]
+            'top_departments': forecast_frame.nlargest(10, 'predicted_deliveries', keep='first').to_dict('records')
         }
 
         # Збереження прогнозів
@@ -234,6 +545,156 @@ class DeliveryForecast(BaseMLModel):
             'detailed_forecasts': forecast_results
         }
 
+    def forecast_horizon(self, horizon=3, save=True):
+        """
+        Прогноз на наступні horizon місяців для всіх комбінацій
+        відділення x тип посилки x транспорт.
+
+        Шаблон повторюється для кожного місяця в одній таблиці ознак, і модель
+        прогнозує всі рядки одним викликом. Повертає {'summary', 'forecasts'},
+        де forecasts - DataFrame з колонкою horizon (1 - наступний місяць).
+        """
+        if not 1 <= horizon <= self.MAX_FORECAST_HORIZON:
+            raise ValueError(f"Горизонт прогнозу має бути від 1 до {self.MAX_FORECAST_HORIZON} місяців")
+
+        print(f"🔮 Прогнозування доставок на {horizon} міс. вперед...")
+        self.ensure_model()
+
+        # Порядкові номери місяців (рік * 12 + місяць - 1) від наступного місяця
+        current_date = datetime.now()
+        month_index = current_date.year * 12 + current_date.month - 1 + np.arange(1, horizon + 1)
+        periods = [f"{index % 12 + 1}/{index // 12}" for index in month_index]
+        print(f"📅 Прогнозування на {periods[0]} - {periods[-1]}")
+
+        template = self.load_forecast_template()
+        combinations = len(template)
+        forecast_data = template.iloc[np.tile(np.arange(combinations), horizon)].reset_index(drop=True)
+        months_index = np.repeat(month_index, combinations)
+        months = months_index % 12 + 1
+        years = months_index // 12
+        forecast_data['start_year'] = years
+        self._apply_month_features(forecast_data, months)
+
+        X_forecast = self._build_feature_matrix(forecast_data)
+        predictions, quantiles = self.predict_with_intervals(X_forecast, self._segments(forecast_data))
+
+        forecast_frame = self._build_forecast_frame(forecast_data, predictions, months, years, quantiles)
+        forecast_frame.insert(0, 'horizon', np.repeat(np.arange(1, horizon + 1), combinations))
+
+        # Підсумки по місяцях та регіонах (місяці - у порядку горизонту)
+        period_labels = pd.Categorical(
+            np.repeat(periods, combinations), categories=periods, ordered=True
+        )
+        predicted = forecast_frame['predicted_deliveries']
+        monthly_totals = predicted.groupby(period_labels, observed=True).sum()
+        region_totals = predicted.groupby(
+            [period_labels, forecast_frame['department_region'].to_numpy()], observed=True, sort=False
+        ).sum()
+
+        summary = {
+            'horizon': horizon,
+            'periods': periods,
+            'combinations': combinations,
+            'total_predicted_deliveries': int(predicted.sum()),
+            'monthly_totals': {period: int(value) for period, value in monthly_totals.items()},
+            'region_totals': {
+                period: {
+                    region: int(value)
+                    for (row_period, region), value in region_totals.items() if row_period == period
+                }
+                for period in periods
+            }
+        }
+
+        if save:
+            self.save_predictions({
+                'summary': summary,
+                'detailed_forecasts': forecast_frame.to_dict('records')
+            }, f"horizon_{horizon}_{periods[0].replace('/', '_')}")
+
+        return {
+            'summary': summary,
+            'forecasts': forecast_frame
+        }
+
+    def forecast_batch(self, rows):
+        """
+        Прогноз для набору рядків з колонками department_id, parcel_type_id,
+        transport_body_type_id, month (та необов'язково year).
+
+        Ознаки будуються векторно з кешованого шаблону, модель - активна з реєстру.
+        Повертає DataFrame у порядку вхідних рядків; для комбінацій, яких немає
+        в даних, predicted_deliveries = NA, confidence = 'unknown'.
+        """
+        self.ensure_model()
+
+        requests = pd.DataFrame(rows).reset_index(drop=True)
+        if 'year' not in requests.columns:
+            requests['year'] = np.nan
+        if requests['year'].isna().any():
+            # Найближчий майбутній місяць з таким номером
+            current_date = datetime.now()
+            default_year = current_date.year + (requests['month'] <= current_date.month).astype(int)
+            requests['year'] = requests['year'].fillna(default_year)
+        requests['year'] = requests['year'].astype('int64')
+
+        template = self.load_forecast_template()
+        template = template.drop(columns=['start_month', 'start_year'], errors='ignore')
+        forecast_data = requests.merge(template, on=self.FORECAST_KEYS, how='left', indicator=True)
+        known = (forecast_data.pop('_merge') == 'both').to_numpy()
+
+        predictions = np.full(len(forecast_data), np.nan)
+        quantiles = np.full((len(self.PREDICTION_PERCENTILES), len(forecast_data)), np.nan)
+        if known.any():
+            known_data = forecast_data.loc[known].copy()
+            self._apply_month_features(known_data, known_data['month'].to_numpy())
+            predictions[known], quantiles[:, known] = self.predict_with_intervals(
+                self._build_feature_matrix(known_data), self._segments(known_data)
+            )
+
+        result = requests[self.FORECAST_KEYS + ['month', 'year']].copy()
+        for column in ['department_number', 'department_city', 'department_region']:
+            if column in forecast_data.columns:
+                result[column] = forecast_data[column]
+        interval_columns, confidence = self._interval_columns(np.nan_to_num(predictions), np.nan_to_num(quantiles))
+        columns = {'predicted_deliveries': np.maximum(np.round(np.nan_to_num(predictions)), 0).astype(int)}
+        columns.update(interval_columns)
+        for column, values in columns.items():
+            if known.all():
+                result[column] = values
+            else:
+                result[column] = pd.array(values, dtype='Int64')
+                result.loc[~known, column] = pd.NA
+        result['confidence'] = np.where(~known, 'unknown', confidence)
+
+        return result
+
+    @classmethod
+    def _build_forecast_frame(cls, forecast_data, predictions, month, year, quantiles):
+        """Таблиця прогнозів: одна колонка на поле результату"""
+        def text_column(column, default):
+            if column in forecast_data.columns:
+                return forecast_data[column].astype(str).to_numpy()
+            return default
+
+        department_ids = forecast_data['department_id'].astype(int).to_numpy()
+        predictions = np.asarray(predictions, dtype=float)
+        interval_columns, confidence = cls._interval_columns(predictions, quantiles)
+
+        return pd.DataFrame({
+            'department_id': department_ids,
+            'department_number': text_column('department_number', np.char.add('DEPT-', department_ids.astype(str))),
+            'department_city': text_column('department_city', 'Unknown'),
+            'department_region': text_column('department_region', 'Unknown'),
+            'parcel_type_name': text_column('parcel_type_name', 'Unknown'),
+            'transport_type_name': text_column('transport_type_name', 'Unknown'),
+            'predicted_deliveries': np.maximum(np.round(predictions), 0).astype(int),
+            **interval_columns,
+            'forecast_month': month,
+            'forecast_year': year,
+            'confidence': confidence
+        })
+
     def get_feature_importance(self):
         """Отримання важливості ознак"""
         if hasattr(self.model, 'feature_importances_') and self.feature_names:
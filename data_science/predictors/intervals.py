@@ -0,0 +1,30 @@
+# data_science/predictors/intervals.py
+import numpy as np
+
+
+def forest_distribution(forest, X_scaled, percentiles, chunk_rows=20000):
+    """
+    Прогноз лісу та перцентилі прогнозів окремих дерев за один прохід.
+
+    Кожне дерево прогнозує всю порцію рядків одним викликом; середнє по деревах
+    дорівнює forest.predict, тож окремий прогноз моделі не потрібен.
+    Рядки обробляються порціями, щоб матриця дерева x рядки не росла необмежено.
+    Повертає (середнє, масив перцентилів форми len(percentiles) x рядки).
+    """
+    # Дерева працюють з float32 - конвертуємо один раз, а не в кожному дереві
+    X = np.ascontiguousarray(X_scaled, dtype=np.float32)
+    trees = forest.estimators_
+
+    mean = np.empty(len(X))
+    quantiles = np.empty((len(percentiles), len(X)))
+    tree_predictions = np.empty((len(trees), min(chunk_rows, len(X))))
+
+    for start in range(0, len(X), chunk_rows):
+        chunk = X[start:start + chunk_rows]
+        predictions = tree_predictions[:, :len(chunk)]
+        for i, tree in enumerate(trees):
+            predictions[i] = tree.predict(chunk, check_input=False)
+        mean[start:start + len(chunk)] = predictions.mean(axis=0)
+        quantiles[:, start:start + len(chunk)] = np.percentile(predictions, percentiles, axis=0)
+
+    return mean, quantiles
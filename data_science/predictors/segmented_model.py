@@ -0,0 +1,85 @@
+# data_science/predictors/segmented_model.py
+import time
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+from data_science.predictors.intervals import forest_distribution
+
+
+def fit_segment_model(task):
+    """Навчання моделі одного сегмента (виконується у процесі пулу)"""
+    start = time.perf_counter()
+    model = RandomForestRegressor(random_state=42, n_jobs=task['n_jobs'], **task['model_params'])
+    model.fit(task['X'], task['y'])
+    return {
+        'segment': task['segment'],
+        'model': model,
+        'rows': len(task['y']),
+        'seconds': time.perf_counter() - start
+    }
+
+
+class SegmentedForecastModel:
+    """
+    Набір моделей, по одній на сегмент (регіон або тип відділення).
+
+    Прогноз для рядка робить модель його сегмента; сегменти без власної
+    моделі (замало навчальних записів або нові в даних) - загальна модель.
+    """
+
+    def __init__(self, segment_column, models, fallback, segment_rows):
+        self.segment_column = segment_column
+        self.models = models
+        self.fallback = fallback
+        self.segment_rows = segment_rows
+
+    @property
+    def n_estimators(self):
+        return self.fallback.n_estimators + sum(model.n_estimators for model in self.models.values())
+
+    @property
+    def feature_importances_(self):
+        """Важливість ознак, усереднена по сегментах з вагою кількості навчальних записів"""
+        if not self.models:
+            return self.fallback.feature_importances_
+        weights = np.array([self.segment_rows[segment] for segment in self.models], dtype=float)
+        importances = np.array([model.feature_importances_ for model in self.models.values()])
+        return weights @ importances / weights.sum()
+
+    def _dispatch(self, X, segments, predict):
+        """Викликає predict(модель, рядки) для рядків кожного сегмента; решта - загальна модель"""
+        if segments is None:
+            raise ValueError(f"Сегментованій моделі потрібні значення колонки {self.segment_column}")
+
+        segments = np.asarray(segments).astype(str)
+        covered = np.zeros(len(X), dtype=bool)
+
+        for segment, model in self.models.items():
+            mask = segments == segment
+            if mask.any():
+                predict(model, mask)
+                covered |= mask
+
+        if not covered.all():
+            predict(self.fallback, ~covered)
+
+    def predict(self, X, segments=None):
+        predictions = np.empty(len(X))
+
+        def predict(model, mask):
+            predictions[mask] = model.predict(X[mask])
+
+        self._dispatch(X, segments, predict)
+        return predictions
+
+    def predict_distribution(self, X, segments, percentiles):
+        """Прогноз та перцентилі прогнозів дерев моделі відповідного сегмента"""
+        mean = np.empty(len(X))
+        quantiles = np.empty((len(percentiles), len(X)))
+
+        def predict(model, mask):
+            mean[mask], quantiles[:, mask] = forest_distribution(model, X[mask], percentiles)
+
+        self._dispatch(X, segments, predict)
+        return mean, quantiles
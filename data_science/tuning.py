@@ -0,0 +1,284 @@
+# data_science/tuning.py
+import os
+import time
+import random
+import shutil
+import tempfile
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from datetime import datetime
+import sys
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor, IsolationForest
+from sklearn.metrics import mean_absolute_error, mean_squared_error
+from sklearn.preprocessing import StandardScaler
+
+sys.path.append('..')
+from config.database_config import DatabaseConfig
+from data_science.model_registry import get_model_registry
+
+
+# Масиви даних, спільні для всіх кандидатів у процесі пулу (завантажуються через mmap лише для читання)
+_SHARED = {}
+
+
+def _init_worker(arrays_path):
+    _SHARED.clear()
+    _SHARED.update(joblib.load(arrays_path, mmap_mode='r'))
+
+
+def _evaluate_candidate(model_name, params):
+    """Оцінка одного кандидата; score - чим більше, тим краще"""
+    start = time.perf_counter()
+
+    if model_name == 'delivery_forecast':
+        model = RandomForestRegressor(random_state=42, n_jobs=1, **params)
+        model.fit(_SHARED['X_train'], _SHARED['y_train'])
+        y_pred = model.predict(_SHARED['X_val'])
+        rmse = float(np.sqrt(mean_squared_error(_SHARED['y_val'], y_pred)))
+        metrics = {'rmse': rmse, 'mae': float(mean_absolute_error(_SHARED['y_val'], y_pred))}
+        score = -rmse
+    else:
+        # Без міток аномалій: стабільність - збіг множин аномалій (Жаккар)
+        # для двох моделей, навчених на різних бутстреп-вибірках
+        X = _SHARED['X']
+        rng = np.random.default_rng(42)
+        flagged = []
+        for seed in range(2):
+            sample = X[rng.choice(len(X), len(X), replace=True)]
+            model = IsolationForest(contamination=_SHARED['contamination'], random_state=42 + seed, **params)
+            flagged.append(model.fit(sample).predict(X) == -1)
+        union = np.logical_or(*flagged).sum()
+        stability = float(np.logical_and(*flagged).sum() / union) if union else 1.0
+        metrics = {'stability': stability}
+        score = stability
+
+    return {
+        'params': params,
+        'score': score,
+        'metrics': metrics,
+        'seconds': round(time.perf_counter() - start, 3)
+    }
+
+
+class HyperparameterSearch:
+    """
+    Підбір гіперпараметрів RandomForestRegressor (delivery_forecast)
+    та IsolationForest (efficiency_analyzer).
+
+    Стратегії: grid, random, halving (послідовне відсіювання з ресурсом n_estimators).
+    Кандидати оцінюються в пулі процесів; при вичерпанні time_budget пошук
+    зупиняється з найкращим з уже оцінених. Результат зберігається в реєстрі моделей.
+    """
+
+    SEARCH_SPACES = {
+        'delivery_forecast': {
+            'n_estimators': [50, 100, 200],
+            'max_depth': [None, 10, 20],
+            'min_samples_leaf': [1, 2, 5],
+            'max_features': [1.0, 0.5, 'sqrt']
+        },
+        'efficiency_analyzer': {
+            'n_estimators': [50, 100, 200],
+            'max_samples': ['auto', 0.5, 0.8],
+            'max_features': [1.0, 0.67]
+        }
+    }
+    STRATEGIES = ['grid', 'random', 'halving']
+
+    def __init__(self, model_name='delivery_forecast', strategy='random', n_candidates=10,
+                 time_budget=None, n_workers=None, param_space=None, eta=3, min_resource=25,
+                 validation_periods=1, random_state=42):
+        if model_name not in self.SEARCH_SPACES:
+            raise ValueError(f"Невідома модель для підбору: {model_name}")
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Невідома стратегія: {strategy}. Доступні: {', '.join(self.STRATEGIES)}")
+
+        self.config = DatabaseConfig()
+        self.model_name = model_name
+        self.strategy = strategy
+        self.n_candidates = n_candidates
+        self.time_budget = time_budget
+        self.param_space = param_space or self.SEARCH_SPACES[model_name]
+        self.eta = eta
+        self.min_resource = min_resource
+        self.validation_periods = validation_periods
+        self.random_state = random_state
+
+        if n_workers is None:
+            n_workers = self.config.ML_N_JOBS
+        if n_workers < 1:
+            n_workers = os.cpu_count() or 1
+        self.n_workers = n_workers
+
+    # ------------------------------------------------------------------
+    # Дані
+    # ------------------------------------------------------------------
+
+    def _prepare_arrays(self):
+        """Масиви для оцінки кандидатів (масштабовані, лише для читання)"""
+        if self.model_name == 'delivery_forecast':
+            from data_science.backtesting import RollingOriginBacktest
+
+            # Валідація на останніх періодах, історичні ознаки - лише з навчальної частини
+            backtest = RollingOriginBacktest(horizons=self.validation_periods)
+            delivery_file, raw, period, periods = backtest.load_periods()
+            if len(periods) <= self.validation_periods:
+                raise ValueError(f"Недостатньо періодів для валідації: {len(periods)}")
+            cutoff = periods[-self.validation_periods - 1]
+            task, test_info, _ = backtest.prepare_cutoff(delivery_file, raw, period, cutoff)
+
+            scaler = StandardScaler()
+            return {
+                'X_train': scaler.fit_transform(task['X_train']),
+                'y_train': task['y_train'],
+                'X_val': scaler.transform(task['X_test']),
+                'y_val': test_info['actual'].to_numpy()
+            }
+
+        from data_science.analyzers.efficiency_analyzer import EfficiencyAnalyzer
+
+        analyzer = EfficiencyAnalyzer()
+        dept_analysis = analyzer.analyze_department_performance()
+        X = dept_analysis[analyzer.ANOMALY_FEATURES].fillna(0)
+        return {
+            'X': StandardScaler().fit_transform(X),
+            'contamination': analyzer.ANOMALY_CONTAMINATION
+        }
+
+    # ------------------------------------------------------------------
+    # Кандидати
+    # ------------------------------------------------------------------
+
+    def _candidates(self, space):
+        keys = list(space)
+        grid = [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+        if self.strategy == 'grid':
+            return grid
+        rng = random.Random(self.random_state)
+        return rng.sample(grid, min(self.n_candidates, len(grid)))
+
+    def _evaluate(self, pool, candidates, deadline, results):
+        """Оцінює кандидатів; повертає False, якщо вичерпано бюджет часу"""
+        if pool is None:
+            for params in candidates:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return False
+                results.append(_evaluate_candidate(self.model_name, params))
+            return True
+
+        futures = [pool.submit(_evaluate_candidate, self.model_name, params) for params in candidates]
+        timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                results.append(future.result())
+        except FuturesTimeoutError:
+            for future in futures:
+                future.cancel()
+            return False
+        return True
+
+    def _search(self, pool, deadline):
+        results = []
+
+        if self.strategy != 'halving':
+            completed = self._evaluate(pool, self._candidates(self.param_space), deadline, results)
+            return results, results, not completed
+
+        # Послідовне відсіювання: усі кандидати на малому ресурсі, кращі 1/eta - на більшому
+        space = {k: v for k, v in self.param_space.items() if k != 'n_estimators'}
+        max_resource = max(self.param_space.get('n_estimators', [self.min_resource * self.eta ** 2]))
+        candidates = self._candidates(space)
+        resource = min(self.min_resource, max_resource)
+        final_round = []
+
+        while candidates:
+            round_results = []
+            completed = self._evaluate(pool, [dict(params, n_estimators=resource) for params in candidates],
+                                       deadline, round_results)
+            for result in round_results:
+                result['resource'] = resource
+            results.extend(round_results)
+            if round_results:
+                final_round = round_results
+
+            if not completed:
+                return results, final_round, True
+            if len(candidates) == 1 or resource >= max_resource:
+                break
+
+            keep = max(1, len(candidates) // self.eta)
+            best = sorted(round_results, key=lambda r: r['score'], reverse=True)[:keep]
+            candidates = [{k: v for k, v in r['params'].items() if k != 'n_estimators'} for r in best]
+            resource = min(resource * self.eta, max_resource)
+
+        return results, final_round, False
+
+    # ------------------------------------------------------------------
+    # Запуск
+    # ------------------------------------------------------------------
+
+    def run(self, save=True):
+        """Запуск підбору; повертає найкращу конфігурацію та таймінги"""
+        print(f"🎛️ Підбір гіперпараметрів {self.model_name} (стратегія: {self.strategy})...")
+        wall_start = time.perf_counter()
+        deadline = wall_start + self.time_budget if self.time_budget else None
+
+        arrays = self._prepare_arrays()
+        data_seconds = time.perf_counter() - wall_start
+
+        # Масиви один раз пишуться на диск; процеси пулу відкривають їх через mmap без копіювання
+        tmp_dir = tempfile.mkdtemp(prefix='postdw_tuning_')
+        arrays_path = os.path.join(tmp_dir, 'arrays.joblib')
+        joblib.dump(arrays, arrays_path)
+
+        try:
+            if self.n_workers > 1:
+                with ProcessPoolExecutor(max_workers=self.n_workers, initializer=_init_worker,
+                                         initargs=(arrays_path,)) as pool:
+                    results, final_round, stopped_early = self._search(pool, deadline)
+            else:
+                _init_worker(arrays_path)
+                results, final_round, stopped_early = self._search(None, deadline)
+        finally:
+            _SHARED.clear()
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        if not final_round:
+            return {'error': 'Жоден кандидат не встиг оцінитися в межах бюджету часу'}
+
+        best = max(final_round, key=lambda r: r['score'])
+        wall_seconds = time.perf_counter() - wall_start
+
+        tuning = {
+            'model_name': self.model_name,
+            'strategy': self.strategy,
+            'score_name': 'neg_rmse' if self.model_name == 'delivery_forecast' else 'stability_jaccard',
+            'best_params': best['params'],
+            'best_score': best['score'],
+            'best_metrics': best['metrics'],
+            'candidates_evaluated': len(results),
+            'stopped_early': stopped_early,
+            'top_candidates': sorted(results, key=lambda r: r['score'], reverse=True)[:5],
+            'timings': {
+                'wall_seconds': round(wall_seconds, 3),
+                'data_seconds': round(data_seconds, 3),
+                'candidate_seconds_total': round(sum(r['seconds'] for r in results), 3),
+                'best_candidate_seconds': best['seconds'],
+                'n_workers': self.n_workers,
+                'time_budget': self.time_budget
+            },
+            'tuned_at': datetime.now().isoformat()
+        }
+
+        status = " (зупинено за бюджетом часу)" if stopped_early else ""
+        print(f"✅ Оцінено {len(results)} кандидатів за {wall_seconds:.2f} с{status}")
+        print(f"🏆 Найкраща конфігурація: {best['params']} ({tuning['score_name']} = {best['score']:.4f})")
+
+        if save:
+            get_model_registry().save_tuning(self.model_name, tuning)
+            print("💾 Конфігурацію збережено в реєстрі моделей")
+
+        return tuning
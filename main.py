@@ -16,32 +16,26 @@ warnings.filterwarnings('ignore', category=UserWarning)
 # Додаємо шляхи для імпорту
 sys.path.append('.')
 
-from data_extraction.data_extractor import DataWarehouseExtractor
-from analysis.courier_analysis import CourierAnalyzer
-from analysis.department_analysis import DepartmentAnalyzer
-from analysis.processing_time_analysis import ProcessingTimeAnalyzer
-from analysis.transport_analysis import TransportAnalyzer
-from visualizations.charts import DWChartGenerator
-from reports.report_generator import DWReportGenerator
 from config.database_config import DatabaseConfig
 from utils.helpers import get_latest_csv_file, create_directories, clean_old_files
-
-# 🧠 Data Science імпорти
-from data_science.ds_controller import DataScienceController
+from utils.lazy import LazyComponent
 
 class PostDWAnalyticsSystem:
     def __init__(self):
         self.config = DatabaseConfig()
-        self.extractor = DataWarehouseExtractor()
-        self.courier_analyzer = CourierAnalyzer()
-        self.department_analyzer = DepartmentAnalyzer()
-        self.processing_analyzer = ProcessingTimeAnalyzer()
-        self.transport_analyzer = TransportAnalyzer()
-        self.chart_generator = DWChartGenerator()
-        self.report_generator = DWReportGenerator()
+
+        # Компоненти створюються при першому використанні, тому меню
+        # з'являється без очікування імпорту pandas, matplotlib та sklearn
+        self.extractor = LazyComponent('data_extraction.data_extractor', 'DataWarehouseExtractor')
+        self.courier_analyzer = LazyComponent('analysis.courier_analysis', 'CourierAnalyzer')
+        self.department_analyzer = LazyComponent('analysis.department_analysis', 'DepartmentAnalyzer')
+        self.processing_analyzer = LazyComponent('analysis.processing_time_analysis', 'ProcessingTimeAnalyzer')
+        self.transport_analyzer = LazyComponent('analysis.transport_analysis', 'TransportAnalyzer')
+        self.chart_generator = LazyComponent('visualizations.charts', 'DWChartGenerator')
+        self.report_generator = LazyComponent('reports.report_generator', 'DWReportGenerator')
 
         # 🧠 Data Science контролер
-        self.ds_controller = DataScienceController()
+        self.ds_controller = LazyComponent('data_science.ds_controller', 'DataScienceController')
 
         create_directories()
 
@@ -112,6 +106,9 @@ class PostDWAnalyticsSystem:
         print("6. 💡 Генерація рекомендацій для оптимізації")
         print("7. 🔮 Швидкий прогноз для відділення")
         print("8. 📊 Показати важливість ознак моделі")
+        print("9. 🧪 Бектестинг моделі прогнозування")
+        print("10. 🎛️ Підбір гіперпараметрів моделей")
+        print("11. 🗓️ Прогноз доставок на кілька місяців")
         print("0. ⬅️ Повернутися до головного меню")
         print("-"*60)
 
@@ -156,6 +153,15 @@ class PostDWAnalyticsSystem:
                 else:
                     print(f"❌ {name}: {result.get('error', 'Невідома помилка')}")
 
+            if successful > 0 and self.config.ML_ANOMALY_STREAMING:
+                # Оцінки аномалій для нових періодів - без повного перенавчання детектора
+                refresh = self.ds_controller.refresh_anomaly_scores()
+                if 'error' in refresh:
+                    print(f"⚠️ {refresh['error']}")
+                elif refresh['anomalous_departments']:
+                    print(f"🔍 Аномальні відділення: {refresh['anomalous_departments']} "
+                          f"(оцінки: {refresh['scores_file']})")
+
             return successful > 0
 
         except Exception as e:
@@ -557,7 +563,8 @@ class PostDWAnalyticsSystem:
                 if forecast:
                     dept_forecast = forecast[0]
                     print(f"🏢 Відділення: {dept_forecast['department_number']} ({dept_forecast['department_city']})")
-                    print(f"📈 Прогноз доставок: {dept_forecast['predicted_deliveries']}")
+                    print(f"📈 Прогноз доставок: {dept_forecast['predicted_deliveries']} "
+                          f"(P10-P90: {dept_forecast['p10_deliveries']}-{dept_forecast['p90_deliveries']})")
                     print(f"📅 Період: {dept_forecast['forecast_month']}/{dept_forecast['forecast_year']}")
                     print(f"🎯 Впевненість: {dept_forecast['confidence']}")
                 else:
@@ -625,6 +632,99 @@ class PostDWAnalyticsSystem:
             print(f"❌ Помилка отримання важливості ознак: {e}")
             return False
 
+    def run_forecast_backtest(self):
+        """Бектестинг прогнозу з ковзною точкою відсічення"""
+        print("\n🧪 БЕКТЕСТИНГ МОДЕЛІ ПРОГНОЗУВАННЯ")
+        print("-" * 40)
+
+        horizons = input("Горизонт прогнозу в місяцях (Enter = 3): ").strip()
+        try:
+            horizons = int(horizons) if horizons else 3
+        except ValueError:
+            print("❌ Невірний формат горизонту!")
+            return False
+
+        report = self.ds_controller.run_backtest(horizons=horizons)
+        if 'error' in report:
+            print(f"❌ {report['error']}")
+            return False
+
+        print(f"\n📊 Загалом: MAE = {report['overall']['mae']:.3f}, RMSE = {report['overall']['rmse']:.3f}")
+
+        print("\n⏩ По горизонтах:")
+        for horizon, metrics in report['by_horizon'].items():
+            print(f"  +{horizon} міс.: MAE = {metrics['mae']:.3f}, RMSE = {metrics['rmse']:.3f} ({metrics['rows']} записів)")
+
+        print("\n🗺️ По регіонах (найбільша похибка):")
+        regions = sorted(report['by_region'].items(), key=lambda x: x[1]['mae'], reverse=True)
+        for region, metrics in regions[:10]:
+            print(f"  {region:<20} MAE = {metrics['mae']:.3f}, RMSE = {metrics['rmse']:.3f}")
+
+        timing = report['timing']
+        print(f"\n⏱️ Час: {timing['wall_seconds']:.2f} с (процесів: {report['n_workers']}, "
+              f"прискорення: {timing['parallel_speedup']}x)")
+        return True
+
+    def run_hyperparameter_search(self):
+        """Підбір гіперпараметрів моделі прогнозу або детектора аномалій"""
+        print("\n🎛️ ПІДБІР ГІПЕРПАРАМЕТРІВ")
+        print("-" * 40)
+        print("1. 📈 Модель прогнозування доставок (RandomForest)")
+        print("2. 🏢 Детектор аномалій відділень (IsolationForest)")
+
+        model_name = {'1': 'delivery_forecast', '2': 'efficiency_analyzer'}.get(input("Модель: ").strip())
+        if model_name is None:
+            print("❌ Невірний вибір моделі!")
+            return False
+
+        strategy = input("Стратегія grid/random/halving (Enter = random): ").strip() or 'random'
+        time_budget = input("Бюджет часу в секундах (Enter = без обмеження): ").strip()
+        try:
+            time_budget = float(time_budget) if time_budget else None
+        except ValueError:
+            print("❌ Невірний формат бюджету часу!")
+            return False
+
+        tuning = self.ds_controller.run_hyperparameter_search(model_name, strategy, time_budget)
+        if 'error' in tuning:
+            print(f"❌ {tuning['error']}")
+            return False
+
+        print(f"\n🏆 Найкращі параметри: {tuning['best_params']}")
+        print(f"📊 {tuning['score_name']} = {tuning['best_score']:.4f}, метрики: {tuning['best_metrics']}")
+        print(f"⏱️ Оцінено {tuning['candidates_evaluated']} кандидатів за {tuning['timings']['wall_seconds']:.2f} с"
+              f"{' (зупинено за бюджетом часу)' if tuning['stopped_early'] else ''}")
+        print("💡 Параметри буде використано при наступному навчанні моделі")
+        return True
+
+    def forecast_horizon(self):
+        """Прогноз доставок на кілька місяців вперед з підсумками по регіонах"""
+        print("\n🗓️ ПРОГНОЗ ДОСТАВОК НА КІЛЬКА МІСЯЦІВ")
+        print("-" * 40)
+
+        horizon = input("Кількість місяців (Enter = 3): ").strip()
+        try:
+            horizon = int(horizon) if horizon else 3
+        except ValueError:
+            print("❌ Невірний формат кількості місяців!")
+            return False
+
+        forecast = self.ds_controller.forecast_horizon(horizon)
+        if 'error' in forecast:
+            print(f"❌ {forecast['error']}")
+            return False
+
+        summary = forecast['summary']
+        print(f"\n📊 Загалом за {summary['horizon']} міс.: {summary['total_predicted_deliveries']} доставок "
+              f"({summary['combinations']} комбінацій)")
+
+        for period in summary['periods']:
+            print(f"\n📅 {period}: {summary['monthly_totals'][period]} доставок")
+            regions = sorted(summary['region_totals'][period].items(), key=lambda x: x[1], reverse=True)
+            for region, count in regions[:5]:
+                print(f"  {region}: {count}")
+        return True
+
     def create_charts(self):
         """Створення графіків"""
         print("\n🎨 СТВОРЕННЯ ГРАФІКІВ...")
@@ -847,6 +947,12 @@ class PostDWAnalyticsSystem:
                 self.quick_department_forecast()
             elif choice == '8':
                 self.show_model_feature_importance()
+            elif choice == '9':
+                self.run_forecast_backtest()
+            elif choice == '10':
+                self.run_hyperparameter_search()
+            elif choice == '11':
+                self.forecast_horizon()
             elif choice == '0':
                 break
             else:
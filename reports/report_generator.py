@@ -12,6 +12,8 @@ import numpy as np
 
 sys.path.append('..')
 from config.database_config import DatabaseConfig
+from utils.file_catalog import register_file
+from utils.metrics import stage_timer
 
 class DWReportGenerator:
     def __init__(self):
@@ -37,6 +39,7 @@ class DWReportGenerator:
             print(f"❌ Помилка завантаження {filepath}: {e}")
             return None
 
+    @stage_timer('report_generator', 'json_load')
     def get_all_analysis_data(self):
         """Завантажує всі доступні дані аналізів"""
         data = {
@@ -112,6 +115,7 @@ class DWReportGenerator:
 
         return data
 
+    @stage_timer('report_generator', 'executive_summary')
     def generate_executive_summary(self):
         """Генерує виконавчий звіт"""
         print("📋 Генерація виконавчого звіту...")
@@ -276,9 +280,11 @@ class DWReportGenerator:
             f.write("\n" + "="*80 + "\n")
             f.write("Звіт згенеровано автоматично системою аналізу Data Warehouse\n")
 
+        register_file(report_path)
         print(f"✅ Виконавчий звіт збережено: {os.path.basename(report_path)}")
         return report_path
 
+    @stage_timer('report_generator', 'detailed_report')
     def generate_detailed_report(self):
         """Генерує детальний звіт"""
         print("📊 Генерація детального звіту...")
@@ -306,6 +312,7 @@ class DWReportGenerator:
             # Детальний аналіз транспорту
             self._write_transport_detailed_section(f, data['transport'])
 
+        register_file(report_path)
         print(f"✅ Детальний звіт збережено: {os.path.basename(report_path)}")
         return report_path
 
@@ -503,6 +510,7 @@ class DWReportGenerator:
                 file.write(f"  {i:2d}. {transport[:40]:<40}: {efficiency:>6.2f} коеф.\n")
             file.write("\n")
 
+    @stage_timer('report_generator', 'performance_report')
     def generate_performance_report(self):
         """Генерує звіт по продуктивності"""
         print("🎯 Генерація звіту по продуктивності...")
@@ -556,6 +564,7 @@ class DWReportGenerator:
                 f.write(f"   • Всього доставок транспортом: {stats.get('total_deliveries', 0):,}\n")
             f.write("\n")
 
+        register_file(report_path)
         print(f"✅ Звіт по продуктивності збережено: {os.path.basename(report_path)}")
         return report_path
 
@@ -586,6 +595,7 @@ class DWReportGenerator:
         print(f"✅ Згенеровано {len(reports)} звітів")
         return reports
 
+    @stage_timer('report_generator', 'comparison_report')
     def generate_comparison_report(self):
         """Генерує порівняльний звіт між періодами"""
         print("📊 Генерація порівняльного звіту...")
@@ -623,5 +633,6 @@ class DWReportGenerator:
                     f.write(f"({stats.get('total_deliveries', 0):,} доставок)\n")
                 f.write("\n")
 
+        register_file(report_path)
         print(f"✅ Порівняльний звіт збережено: {os.path.basename(report_path)}")
         return report_path
\ No newline at end of file
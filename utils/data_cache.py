@@ -0,0 +1,92 @@
+"""
+Спільний кеш даних процесу: сирі CSV та обчислені результати
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+from utils.helpers import file_fingerprint
+
+
+class DataCache:
+    """
+    LRU кеш, ключований відбитком вхідних даних.
+
+    Запис вважається актуальним, поки відбиток (розмір + час зміни файлу)
+    не змінився. Паралельні запити одного ключа обчислюються лише один раз.
+    """
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _key_lock(self, key):
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = threading.Lock()
+            return lock
+
+    def _lookup(self, key, fingerprint):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == fingerprint:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+        return False, None
+
+    def get_or_compute(self, key, fingerprint, factory):
+        """Повертає значення з кешу або обчислює його через factory()"""
+        found, value = self._lookup(key, fingerprint)
+        if found:
+            return value
+
+        with self._key_lock(key):
+            found, value = self._lookup(key, fingerprint)
+            if found:
+                return value
+
+            value = factory()
+            with self._lock:
+                self.misses += 1
+                self._entries[key] = (fingerprint, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    evicted_key, _ = self._entries.popitem(last=False)
+                    self._key_locks.pop(evicted_key, None)
+            return value
+
+    def read_csv(self, filepath, copy=True):
+        """
+        Читає CSV через кеш. За замовчуванням повертає копію, оскільки
+        аналізатори додають колонки до завантаженого DataFrame.
+        """
+        import pandas as pd
+
+        filepath = os.path.abspath(filepath)
+        data = self.get_or_compute(('csv', filepath), file_fingerprint(filepath),
+                                   lambda: pd.read_csv(filepath))
+        return data.copy() if copy else data
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._key_locks.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+_cache = DataCache()
+
+
+def get_data_cache():
+    """Повертає спільний для процесу кеш даних"""
+    return _cache
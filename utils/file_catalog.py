@@ -0,0 +1,176 @@
+"""
+Каталог файлів аналітичної системи з інкрементальним оновленням
+"""
+
+import os
+import sys
+import threading
+from datetime import datetime
+
+sys.path.append('..')
+from config.database_config import DatabaseConfig
+
+
+class FileCatalog:
+    """
+    Індекс файлів у пам'яті для /files/list.
+
+    Оновлюється двома шляхами:
+    - реєстрація під час запису (extractor, аналізатори, звіти, графіки);
+    - перевірка mtime директорій при кожному запиті: зміна mtime означає
+      додані/видалені файли, тоді пересканується лише ця директорія.
+    """
+
+    def __init__(self, directories):
+        self.directories = {
+            dir_type: os.path.normpath(dir_path) for dir_type, dir_path in directories.items()
+        }
+        self._lock = threading.RLock()
+        self._entries = {dir_type: {} for dir_type in self.directories}
+        self._sorted = {}
+        self._dir_mtimes = {}
+
+    def _make_entry(self, path, stat):
+        return {
+            'filename': os.path.basename(path),
+            'size_kb': round(stat.st_size / 1024, 1),
+            'modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
+            'path': path,
+            'mtime': stat.st_mtime
+        }
+
+    def _scan_directory(self, dir_type):
+        """Повне сканування однієї директорії"""
+        dir_path = self.directories[dir_type]
+        entries = {}
+
+        if os.path.isdir(dir_path):
+            with os.scandir(dir_path) as it:
+                for item in it:
+                    if item.is_file():
+                        path = os.path.join(dir_path, item.name)
+                        entries[item.name] = self._make_entry(path, item.stat())
+
+        self._entries[dir_type] = entries
+        self._sorted.pop(dir_type, None)
+
+    def refresh(self):
+        """Пересканує директорії, вміст яких змінився з останньої перевірки"""
+        with self._lock:
+            for dir_type, dir_path in self.directories.items():
+                try:
+                    mtime = os.stat(dir_path).st_mtime_ns
+                except FileNotFoundError:
+                    mtime = None
+
+                if self._dir_mtimes.get(dir_type, -1) != mtime:
+                    self._scan_directory(dir_type)
+                    self._dir_mtimes[dir_type] = mtime
+
+    def _locate(self, file_path):
+        dir_path = os.path.dirname(os.path.normpath(os.path.abspath(file_path)))
+        for dir_type, catalog_dir in self.directories.items():
+            if dir_path == catalog_dir:
+                return dir_type
+        return None
+
+    def register(self, file_path):
+        """Реєструє створений або оновлений файл"""
+        dir_type = self._locate(file_path)
+        if dir_type is None:
+            return
+
+        with self._lock:
+            try:
+                stat = os.stat(file_path)
+            except FileNotFoundError:
+                self._entries[dir_type].pop(os.path.basename(file_path), None)
+            else:
+                path = os.path.join(self.directories[dir_type], os.path.basename(file_path))
+                self._entries[dir_type][os.path.basename(file_path)] = self._make_entry(path, stat)
+            self._sorted.pop(dir_type, None)
+
+    def _sorted_entries(self, dir_type):
+        entries = self._sorted.get(dir_type)
+        if entries is None:
+            entries = sorted(self._entries[dir_type].values(), key=lambda x: x['mtime'], reverse=True)
+            self._sorted[dir_type] = entries
+        return entries
+
+    def list_files(self, file_type='all', prefix=None, date_from=None, date_to=None,
+                   page=1, page_size=None):
+        """
+        Повертає файли (новіші першими) з фільтрацією та пагінацією.
+        date_from/date_to - datetime; page_size=None - без пагінації.
+        """
+        self.refresh()
+
+        if file_type == 'all':
+            dir_types = list(self.directories)
+        else:
+            dir_types = [file_type]
+
+        ts_from = date_from.timestamp() if date_from else None
+        ts_to = date_to.timestamp() if date_to else None
+
+        files_info = {}
+        pagination = {}
+
+        with self._lock:
+            for dir_type in dir_types:
+                if dir_type not in self.directories:
+                    files_info[dir_type] = []
+                    continue
+
+                entries = self._sorted_entries(dir_type)
+                if prefix or ts_from is not None or ts_to is not None:
+                    entries = [
+                        entry for entry in entries
+                        if (not prefix or entry['filename'].startswith(prefix))
+                        and (ts_from is None or entry['mtime'] >= ts_from)
+                        and (ts_to is None or entry['mtime'] <= ts_to)
+                    ]
+
+                total = len(entries)
+                if page_size:
+                    start = (page - 1) * page_size
+                    entries = entries[start:start + page_size]
+                    pagination[dir_type] = {
+                        'page': page,
+                        'page_size': page_size,
+                        'total': total,
+                        'pages': (total + page_size - 1) // page_size
+                    }
+
+                files_info[dir_type] = [
+                    {key: value for key, value in entry.items() if key != 'mtime'}
+                    for entry in entries
+                ]
+
+        return files_info, pagination
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_file_catalog():
+    """Повертає спільний для процесу каталог файлів"""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                config = DatabaseConfig()
+                _catalog = FileCatalog({
+                    'raw': config.RAW_DATA_PATH,
+                    'processed': config.PROCESSED_DATA_PATH,
+                    'reports': config.REPORTS_PATH,
+                    'charts': config.CHARTS_PATH
+                })
+    return _catalog
+
+
+def register_file(file_path):
+    """Реєструє записаний файл у каталозі (якщо каталог вже використовується)"""
+    if _catalog is not None and file_path:
+        _catalog.register(file_path)
@@ -2,8 +2,6 @@
 Допоміжні функції
 """
 
-import pandas as pd
-import numpy as np
 import os
 import glob
 import time
@@ -19,6 +17,11 @@ def get_latest_csv_file(directory, pattern):
         return None
     return max(files, key=os.path.getctime)
 
+def file_fingerprint(filepath):
+    """Відбиток файлу за розміром та часом зміни (без читання вмісту)"""
+    stat = os.stat(filepath)
+    return f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+
 def create_directories():
     """Створює необхідні директорії"""
     directories = [
@@ -67,6 +70,8 @@ def validate_csv_file(file_path):
         if os.path.getsize(file_path) == 0:
             return False, "Файл пустий"
 
+        import pandas as pd
+
         df = pd.read_csv(file_path, nrows=5)
 
         if len(df) == 0:
@@ -79,10 +84,14 @@ def validate_csv_file(file_path):
 
 def safe_numeric_conversion(series):
     """Безпечна конвертація в числовий тип для NumPy 2.x"""
+    import pandas as pd
+
     return pd.to_numeric(series, errors='coerce')
 
 def calculate_percentiles(data, percentiles=[25, 50, 75, 90, 95]):
     """Розраховує перцентилі для даних"""
+    import numpy as np
+
     return {f'p{p}': float(np.percentile(data.dropna(), p)) for p in percentiles}
 
 if __name__ == "__main__":
@@ -0,0 +1,45 @@
+"""
+Відкладене завантаження важких компонентів
+"""
+
+import importlib
+import threading
+
+
+class LazyComponent:
+    """
+    Проксі компонента: модуль імпортується, а об'єкт створюється
+    лише при першому зверненні до його атрибутів.
+    """
+
+    def __init__(self, module_name, class_name, *args, **kwargs):
+        self._module_name = module_name
+        self._class_name = class_name
+        self._args = args
+        self._kwargs = kwargs
+        self._instance = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        """Чи створено вже компонент"""
+        return self._instance is not None
+
+    def get_instance(self):
+        """Повертає (за потреби створює) реальний об'єкт компонента"""
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    module = importlib.import_module(self._module_name)
+                    component_class = getattr(module, self._class_name)
+                    self._instance = component_class(*self._args, **self._kwargs)
+        return self._instance
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.get_instance(), name)
+
+    def __repr__(self):
+        state = 'loaded' if self.loaded else 'not loaded'
+        return f"<LazyComponent {self._module_name}.{self._class_name} ({state})>"
@@ -0,0 +1,292 @@
+"""
+Метрики продуктивності у форматі Prometheus (без зовнішніх залежностей)
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+
+# POSTDW_METRICS=0 повністю вимикає збір метрик
+METRICS_ENABLED = os.environ.get('POSTDW_METRICS', '1') != '0'
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _escape_label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labelnames, values, extra=None):
+    pairs = list(zip(labelnames, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label_value(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    metric_type = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.metric_type}']
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}')
+        return lines
+
+
+class Counter(_Metric):
+    metric_type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    metric_type = 'gauge'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    metric_type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.metric_type}']
+        with self._lock:
+            items = sorted((key, (list(state[0]), state[1], state[2])) for key, state in self._values.items())
+
+        for key, (bucket_counts, total, count) in items:
+            cumulative = 0
+            for upper_bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, ('le', _format_value(upper_bound)))
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+            lines.append(f'{self.name}_count{labels} {count}')
+        return lines
+
+
+class MetricsRegistry:
+    """Реєстр метрик процесу"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self):
+        """Текстовий формат експорту Prometheus"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+REQUEST_LATENCY = REGISTRY.histogram(
+    'postdw_http_request_duration_seconds', 'Тривалість обробки HTTP запитів',
+    ['method', 'endpoint', 'status']
+)
+REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    'postdw_http_requests_in_flight', 'Кількість запитів, що зараз обробляються', ['endpoint']
+)
+STAGE_DURATION = REGISTRY.histogram(
+    'postdw_stage_duration_seconds', 'Тривалість етапів обробки (завантаження CSV, агрегація, серіалізація...)',
+    ['component', 'stage']
+)
+
+
+# Тривалості етапів, що збираються в поточному потоці (record_stages)
+_recorded = threading.local()
+
+
+@contextmanager
+def record_stages():
+    """
+    Збирає етапи, виміряні в поточному потоці, у список (component, stage, seconds).
+    Дочірні процеси повертають його батьківському, і той записує етапи у свої метрики.
+    """
+    stages = []
+    previous = getattr(_recorded, 'stages', None)
+    _recorded.stages = stages
+    try:
+        yield stages
+    finally:
+        _recorded.stages = previous
+
+
+class StageTimer:
+    """Таймер етапу: контекстний менеджер, декоратор або start()/stop()"""
+
+    __slots__ = ('component', 'stage', '_start')
+
+    def __init__(self, component, stage):
+        self.component = component
+        self.stage = stage
+        self._start = None
+
+    def start(self):
+        self._start = time.perf_counter()
+        return self
+
+    def stop(self):
+        if self._start is not None:
+            seconds = time.perf_counter() - self._start
+            STAGE_DURATION.observe(seconds, component=self.component, stage=self.stage)
+            stages = getattr(_recorded, 'stages', None)
+            if stages is not None:
+                stages.append((self.component, self.stage, seconds))
+            self._start = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def __call__(self, func):
+        component, stage = self.component, self.stage
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with StageTimer(component, stage):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+
+class _NullTimer:
+    """Порожній таймер, коли метрики вимкнені"""
+
+    __slots__ = ()
+
+    def start(self):
+        return self
+
+    def stop(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def __call__(self, func):
+        return func
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def stage_timer(component, stage):
+    """Створює таймер етапу обробки для метрики postdw_stage_duration_seconds"""
+    if not METRICS_ENABLED:
+        return _NULL_TIMER
+    return StageTimer(component, stage)
+
+
+def init_app(app, path='/metrics'):
+    """Підключає збір метрик запитів та endpoint експорту до Flask застосунку"""
+    from flask import Response, g, request
+
+    if METRICS_ENABLED:
+        @app.before_request
+        def _start_request_timer():
+            g.metrics_endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+            g.metrics_start = time.perf_counter()
+            REQUESTS_IN_FLIGHT.inc(endpoint=g.metrics_endpoint)
+
+        def _finish(start, endpoint, method, status):
+            REQUEST_LATENCY.observe(time.perf_counter() - start, method=method, endpoint=endpoint, status=status)
+            REQUESTS_IN_FLIGHT.dec(endpoint=endpoint)
+
+        @app.after_request
+        def _remember_status(response):
+            g.metrics_status = response.status_code
+            if response.is_streamed and 'metrics_start' in g:
+                # Потокова відповідь (архіви, файли): час - до закриття відповіді сервером,
+                # тобто після передачі всього тіла, а не після створення генератора
+                start, endpoint, method = g.pop('metrics_start'), g.pop('metrics_endpoint'), request.method
+                response.call_on_close(lambda: _finish(start, endpoint, method, response.status_code))
+            return response
+
+        # Звичайні відповіді та необроблені помилки (статус 500, after_request не викликається)
+        @app.teardown_request
+        def _finish_request(exc):
+            start = g.pop('metrics_start', None)
+            endpoint = g.pop('metrics_endpoint', None)
+            status = g.pop('metrics_status', 500)
+            if start is not None:
+                _finish(start, endpoint, request.method, status)
+
+    @app.route(path)
+    def metrics():
+        return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,92 @@
+"""
+Фоновий прогрів кешів після старту API
+"""
+
+import threading
+import time
+from datetime import datetime
+
+
+class WarmupManager:
+    """
+    Виконує кроки прогріву у фоновому потоці та зберігає їх статус.
+
+    Стани: disabled (прогрів не запускався), running, ready.
+    Помилка окремого кроку записується у статус, але не блокує готовність:
+    відповідний запит просто виконає роботу сам, як і без прогріву.
+    """
+
+    def __init__(self, steps):
+        self.steps = list(steps)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._state = 'disabled'
+        self._started_at = None
+        self._finished_at = None
+        self._steps_status = {name: {'status': 'pending'} for name, _ in self.steps}
+
+    @property
+    def state(self):
+        return self._state
+
+    @property
+    def is_ready(self):
+        """Чи можна спрямовувати трафік (прогрів завершено або не вмикався)"""
+        return self._state != 'running'
+
+    def start(self):
+        """Запускає прогрів у фоновому потоці (повторний виклик ігнорується)"""
+        with self._lock:
+            if self._thread is not None:
+                return False
+            self._state = 'running'
+            self._started_at = datetime.now()
+            self._thread = threading.Thread(target=self._run, name='postdw-warmup', daemon=True)
+            self._thread.start()
+        return True
+
+    def _run(self):
+        print("🔥 Прогрів кешів розпочато...")
+        for name, step in self.steps:
+            self._set_step(name, {'status': 'running'})
+            start = time.perf_counter()
+            try:
+                step()
+            except Exception as e:
+                print(f"⚠️ Прогрів '{name}' не вдався: {e}")
+                self._set_step(name, {
+                    'status': 'error',
+                    'error': str(e),
+                    'seconds': round(time.perf_counter() - start, 3)
+                })
+            else:
+                self._set_step(name, {
+                    'status': 'done',
+                    'seconds': round(time.perf_counter() - start, 3)
+                })
+
+        with self._lock:
+            self._state = 'ready'
+            self._finished_at = datetime.now()
+        print("✅ Прогрів кешів завершено")
+
+    def _set_step(self, name, status):
+        with self._lock:
+            self._steps_status[name] = status
+
+    def wait(self, timeout=None):
+        """Очікує завершення прогріву; повертає True, якщо він завершився"""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return self.is_ready
+
+    def status(self):
+        with self._lock:
+            return {
+                'state': self._state,
+                'ready': self._state != 'running',
+                'started_at': self._started_at.isoformat() if self._started_at else None,
+                'finished_at': self._finished_at.isoformat() if self._finished_at else None,
+                'steps': {name: dict(info) for name, info in self._steps_status.items()}
+            }
@@ -0,0 +1,299 @@
+"""
+Потокове формування ZIP архівів без тимчасових файлів
+"""
+
+import os
+import struct
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Розширення файлів, які вже стиснуті - їх немає сенсу стискати повторно
+PRECOMPRESSED_EXTENSIONS = {
+    '.png', '.jpg', '.jpeg', '.gif', '.webp',
+    '.parquet', '.zip', '.gz', '.bz2', '.xz', '.7z'
+}
+
+COMPRESSION_MODES = ['auto', 'deflate', 'store']
+
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+
+CHUNK_SIZE = 1024 * 1024
+ZIP64_LIMIT = (1 << 31) - 1
+ZIP_MAX_ENTRIES = 0xFFFF
+
+_LOCAL_HEADER = struct.Struct('<4s2B4HL2L2H')
+_CENTRAL_HEADER = struct.Struct('<4s4B4HL2L5H2L')
+_END_RECORD = struct.Struct('<4s4H2LH')
+_ZIP64_END_RECORD = struct.Struct('<4sQ2H2L4Q')
+_ZIP64_LOCATOR = struct.Struct('<4sLQL')
+
+_FLAG_DATA_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+
+
+def _dos_datetime(mtime):
+    """Конвертує unix-час у формат дати/часу MS-DOS"""
+    t = time.localtime(mtime)
+    year = max(t.tm_year, 1980)
+    dos_date = (year - 1980) << 9 | t.tm_mon << 5 | t.tm_mday
+    dos_time = t.tm_hour << 11 | t.tm_min << 5 | t.tm_sec // 2
+    return dos_date, dos_time
+
+
+def choose_compression(filename, mode='auto'):
+    """Визначає метод стиснення для файлу"""
+    if mode == 'store':
+        return ZIP_STORED
+    if mode == 'deflate':
+        return ZIP_DEFLATED
+    extension = os.path.splitext(filename)[1].lower()
+    return ZIP_STORED if extension in PRECOMPRESSED_EXTENSIONS else ZIP_DEFLATED
+
+
+def _read_and_compress(file_path, compress_type, level):
+    """Читає та стискає файл повністю (виконується у робочому потоці)"""
+    crc = 0
+    file_size = 0
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15) if compress_type == ZIP_DEFLATED else None
+    parts = []
+
+    with open(file_path, 'rb') as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            crc = zlib.crc32(chunk, crc)
+            file_size += len(chunk)
+            parts.append(compressor.compress(chunk) if compressor else chunk)
+
+    if compressor:
+        parts.append(compressor.flush())
+
+    return b''.join(parts), crc, file_size
+
+
+class ZipStreamWriter:
+    """Пише ZIP архів послідовно, віддаючи байти по мірі формування"""
+
+    def __init__(self, level=6):
+        self.level = level
+        self._offset = 0
+        self._entries = []
+
+    def _emit(self, data):
+        self._offset += len(data)
+        return data
+
+    def _local_header(self, arcname, compress_type, mtime, flags, crc=0,
+                      compress_size=0, file_size=0, zip64=False):
+        name = arcname.encode('utf-8')
+        if any(b > 0x7F for b in name):
+            flags |= _FLAG_UTF8
+
+        extra = b''
+        version = 20
+        if zip64:
+            version = 45
+            extra = struct.pack('<2H2Q', 1, 16, file_size, compress_size)
+            file_size = compress_size = 0xFFFFFFFF
+
+        dos_date, dos_time = _dos_datetime(mtime)
+        header = _LOCAL_HEADER.pack(
+            b'PK\003\004', version, 0, flags, compress_type, dos_time, dos_date,
+            crc, compress_size, file_size, len(name), len(extra)
+        )
+        return header + name + extra, flags, version
+
+    def _remember(self, arcname, compress_type, mtime, flags, version,
+                  crc, compress_size, file_size, header_offset):
+        self._entries.append({
+            'arcname': arcname,
+            'compress_type': compress_type,
+            'mtime': mtime,
+            'flags': flags,
+            'version': version,
+            'crc': crc,
+            'compress_size': compress_size,
+            'file_size': file_size,
+            'header_offset': header_offset
+        })
+
+    def write_file(self, file_path, arcname, compress_type):
+        """Потоково додає файл до архіву (з data descriptor після даних)"""
+        stat = os.stat(file_path)
+        zip64 = stat.st_size * 1.05 > ZIP64_LIMIT
+        header_offset = self._offset
+
+        header, flags, version = self._local_header(
+            arcname, compress_type, stat.st_mtime, _FLAG_DATA_DESCRIPTOR, zip64=zip64
+        )
+        yield self._emit(header)
+
+        crc = 0
+        file_size = 0
+        compress_size = 0
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, -15) if compress_type == ZIP_DEFLATED else None
+
+        with open(file_path, 'rb') as f:
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                crc = zlib.crc32(chunk, crc)
+                file_size += len(chunk)
+                data = compressor.compress(chunk) if compressor else chunk
+                if data:
+                    compress_size += len(data)
+                    yield self._emit(data)
+
+        if compressor:
+            tail = compressor.flush()
+            compress_size += len(tail)
+            yield self._emit(tail)
+
+        if zip64:
+            descriptor = struct.pack('<4sL2Q', b'PK\007\010', crc, compress_size, file_size)
+        else:
+            descriptor = struct.pack('<4s3L', b'PK\007\010', crc, compress_size, file_size)
+        yield self._emit(descriptor)
+
+        self._remember(arcname, compress_type, stat.st_mtime, flags, version,
+                       crc, compress_size, file_size, header_offset)
+
+    def write_compressed(self, arcname, compress_type, mtime, payload, crc, file_size):
+        """Додає до архіву вже стиснені дані (відомі CRC та розміри)"""
+        compress_size = len(payload)
+        zip64 = max(file_size, compress_size) > ZIP64_LIMIT
+        header_offset = self._offset
+
+        header, flags, version = self._local_header(
+            arcname, compress_type, mtime, 0, crc=crc,
+            compress_size=compress_size, file_size=file_size, zip64=zip64
+        )
+        yield self._emit(header)
+
+        for start in range(0, compress_size, CHUNK_SIZE):
+            yield self._emit(payload[start:start + CHUNK_SIZE])
+
+        self._remember(arcname, compress_type, mtime, flags, version,
+                       crc, compress_size, file_size, header_offset)
+
+    def close(self):
+        """Записує центральний каталог архіву"""
+        central_dir_offset = self._offset
+
+        for entry in self._entries:
+            name = entry['arcname'].encode('utf-8')
+            file_size = entry['file_size']
+            compress_size = entry['compress_size']
+            header_offset = entry['header_offset']
+
+            zip64_values = []
+            if file_size > ZIP64_LIMIT:
+                zip64_values.append(file_size)
+                file_size = 0xFFFFFFFF
+            if compress_size > ZIP64_LIMIT:
+                zip64_values.append(compress_size)
+                compress_size = 0xFFFFFFFF
+            if header_offset > ZIP64_LIMIT:
+                zip64_values.append(header_offset)
+                header_offset = 0xFFFFFFFF
+
+            extra = b''
+            version = entry['version']
+            if zip64_values:
+                version = 45
+                extra = struct.pack(f'<2H{len(zip64_values)}Q', 1, 8 * len(zip64_values), *zip64_values)
+
+            dos_date, dos_time = _dos_datetime(entry['mtime'])
+            header = _CENTRAL_HEADER.pack(
+                b'PK\001\002', version, 3, version, 0, entry['flags'], entry['compress_type'],
+                dos_time, dos_date, entry['crc'], compress_size, file_size,
+                len(name), len(extra), 0, 0, 0, (0o100644 & 0xFFFF) << 16, header_offset
+            )
+            yield self._emit(header + name + extra)
+
+        central_dir_size = self._offset - central_dir_offset
+        entries_count = len(self._entries)
+
+        if (entries_count > ZIP_MAX_ENTRIES or central_dir_offset > ZIP64_LIMIT
+                or central_dir_size > ZIP64_LIMIT):
+            zip64_end_offset = self._offset
+            yield self._emit(_ZIP64_END_RECORD.pack(
+                b'PK\006\006', _ZIP64_END_RECORD.size - 12, 45, 45, 0, 0,
+                entries_count, entries_count, central_dir_size, central_dir_offset
+            ))
+            yield self._emit(_ZIP64_LOCATOR.pack(b'PK\006\007', 0, zip64_end_offset, 1))
+            entries_count = min(entries_count, ZIP_MAX_ENTRIES)
+            central_dir_offset = min(central_dir_offset, 0xFFFFFFFF)
+            central_dir_size = min(central_dir_size, 0xFFFFFFFF)
+
+        yield self._emit(_END_RECORD.pack(
+            b'PK\005\006', 0, 0, entries_count, entries_count,
+            central_dir_size, central_dir_offset, 0
+        ))
+
+
+def collect_files(source_dir):
+    """Повертає список (шлях, ім'я в архіві) для всіх файлів директорії"""
+    files = []
+    for root, dirs, filenames in os.walk(source_dir):
+        dirs.sort()
+        for filename in sorted(filenames):
+            file_path = os.path.join(root, filename)
+            files.append((file_path, os.path.relpath(file_path, source_dir).replace(os.sep, '/')))
+    return files
+
+
+def stream_zip(files, compression='auto', workers=0, level=6):
+    """
+    Генератор байтів ZIP архіву для переданих файлів.
+
+    compression: 'auto' (вже стиснені файли зберігаються без стиснення),
+                 'deflate' або 'store'.
+    workers: кількість потоків для паралельного стиснення (0 - послідовно).
+             У паралельному режимі одночасно в пам'яті тримається не більше
+             2 * workers стиснених файлів.
+    """
+    if compression not in COMPRESSION_MODES:
+        raise ValueError(f"Невідомий режим стиснення: {compression}")
+
+    writer = ZipStreamWriter(level=level)
+
+    if workers and workers > 0:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            queue = iter(files)
+
+            def submit_next():
+                for file_path, arcname in queue:
+                    compress_type = choose_compression(arcname, compression)
+                    if compress_type == ZIP_STORED:
+                        # Нестиснені файли віддаємо потоком, без читання в пам'ять
+                        pending.append((file_path, arcname, compress_type, None))
+                    else:
+                        future = executor.submit(_read_and_compress, file_path, compress_type, level)
+                        pending.append((file_path, arcname, compress_type, future))
+                        return
+
+            for _ in range(workers * 2):
+                submit_next()
+
+            while pending:
+                file_path, arcname, compress_type, future = pending.popleft()
+                if future is None:
+                    yield from writer.write_file(file_path, arcname, compress_type)
+                else:
+                    payload, crc, file_size = future.result()
+                    mtime = os.path.getmtime(file_path)
+                    yield from writer.write_compressed(arcname, compress_type, mtime, payload, crc, file_size)
+                    submit_next()
+    else:
+        for file_path, arcname in files:
+            compress_type = choose_compression(arcname, compression)
+            yield from writer.write_file(file_path, arcname, compress_type)
+
+    yield from writer.close()
@@ -0,0 +1,168 @@
+"""
+Кеш побудованих графіків за відбитком вхідних даних та параметрів побудови
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from datetime import datetime
+
+sys.path.append('..')
+from config.database_config import DatabaseConfig
+from utils.helpers import file_fingerprint
+
+
+class ChartCache:
+    """
+    Індекс відбиток -> файл графіка (visualizations/output/cache/chart_index.json).
+
+    Відбиток графіка - хеш секцій 'data' вхідних JSON (без часу аналізу, тож
+    повторний аналіз з тими самими результатами не змінює відбиток) разом з
+    параметрами побудови. Хеш вхідного файлу перераховується лише при зміні
+    його розміру або часу зміни.
+    """
+
+    INDEX_FILENAME = 'chart_index.json'
+
+    def __init__(self, cache_path=None):
+        config = DatabaseConfig()
+        self.charts_path = config.CHARTS_PATH
+        self.cache_path = cache_path or os.path.join(config.CHARTS_PATH, 'cache')
+        self.index_path = os.path.join(self.cache_path, self.INDEX_FILENAME)
+        self._lock = threading.RLock()
+        self._index = None
+        self._index_mtime = None
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.cache_path, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Індекс
+    # ------------------------------------------------------------------
+
+    def _read_index(self):
+        """Індекс з диска; перечитується лише при зміні файлу"""
+        try:
+            mtime = os.stat(self.index_path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+
+        if self._index is None or mtime != self._index_mtime:
+            if mtime is None:
+                self._index = {'charts': {}, 'inputs': {}}
+            else:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            self._index_mtime = mtime
+        return self._index
+
+    def _write_index(self, index):
+        # Хеші файлів, яких уже немає, більше не знадобляться
+        index['inputs'] = {
+            path: entry for path, entry in index['inputs'].items() if os.path.exists(path)
+        }
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.index_path)
+        self._index = index
+        self._index_mtime = os.stat(self.index_path).st_mtime_ns
+
+    # ------------------------------------------------------------------
+    # Відбитки
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _hash_data(filepath):
+        with open(filepath, 'r', encoding='utf-8') as f:
+            content = json.load(f)
+        data = content.get('data') if isinstance(content, dict) else content
+        serialized = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+    def _input_hash(self, index, filepath):
+        """Хеш даних вхідного файлу та чи довелося його перерахувати"""
+        stat = file_fingerprint(filepath)
+        entry = index['inputs'].get(filepath)
+        if entry is not None and entry['stat'] == stat:
+            return entry['hash'], False
+
+        try:
+            file_hash = self._hash_data(filepath)
+        except (OSError, ValueError):
+            # Пошкоджений файл: відбиток за станом файлу, графік все одно не побудується
+            file_hash = stat
+        index['inputs'][filepath] = {'stat': stat, 'hash': file_hash}
+        return file_hash, True
+
+    def fingerprint(self, name, inputs, params):
+        """
+        Відбиток графіка name: inputs - {патерн: шлях до файлу або None},
+        params - параметри побудови (словник, що серіалізується в JSON).
+        """
+        with self._lock:
+            index = self._read_index()
+            input_hashes, changed = {}, False
+            for pattern, filepath in sorted(inputs.items()):
+                if filepath:
+                    input_hashes[pattern], rehashed = self._input_hash(index, filepath)
+                    changed |= rehashed
+                else:
+                    input_hashes[pattern] = None
+            if changed:
+                self._write_index(index)
+
+        payload = json.dumps({'chart': name, 'inputs': input_hashes, 'params': params},
+                             sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Графіки
+    # ------------------------------------------------------------------
+
+    def lookup(self, fingerprint):
+        """Запис кешу для відбитка або None (файл графіка видалено - запис теж)"""
+        with self._lock:
+            index = self._read_index()
+            entry = index['charts'].get(fingerprint)
+            if entry is not None and not os.path.exists(os.path.join(self.charts_path, entry['file'])):
+                del index['charts'][fingerprint]
+                self._write_index(index)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return dict(entry, chart_path=os.path.join(self.charts_path, entry['file']))
+
+    def store(self, fingerprint, name, chart_path, render_seconds):
+        """Запам'ятовує побудований графік для відбитка"""
+        with self._lock:
+            index = self._read_index()
+            # Записи графіків, видалених очищенням старих файлів
+            index['charts'] = {
+                key: entry for key, entry in index['charts'].items()
+                if os.path.exists(os.path.join(self.charts_path, entry['file']))
+            }
+            index['charts'][fingerprint] = {
+                'name': name,
+                'file': os.path.basename(chart_path),
+                'render_seconds': render_seconds,
+                'created': datetime.now().isoformat()
+            }
+            self._write_index(index)
+
+    def stats(self):
+        """Статистика кешу процесу та кількість записів індексу"""
+        with self._lock:
+            entries = len(self._read_index()['charts'])
+            requests = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / requests, 3) if requests else None,
+                'entries': entries
+            }
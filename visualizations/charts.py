@@ -3,17 +3,26 @@
 Працює з новою структурою окремих JSON файлів
 """
 
+import matplotlib
+# Графіки лише зберігаються у файли: Agg не потребує дисплея і працює в процесах пулу
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.ticker import MaxNLocator
 import seaborn as sns
 import pandas as pd
+import io
 import json
 import os
 import sys
 import glob
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+import time
 import warnings
 import numpy as np
 import traceback
+import multiprocessing
 
 warnings.filterwarnings('ignore')
 plt.style.use('default')
@@ -21,8 +30,109 @@ sns.set_palette("husl")
 
 sys.path.append('..')
 from config.database_config import DatabaseConfig
+from utils.data_cache import DataCache
+from utils.file_catalog import register_file
+from utils.metrics import stage_timer, record_stages, STAGE_DURATION
+from visualizations.chart_cache import ChartCache
+from visualizations.decimation import decimate_series, bucket_series, top_n_with_other
 
 class DWChartGenerator:
+    # Дашборди: назва етапу, підпис, метод побудови
+    DASHBOARDS = [
+        ('courier_performance', "Кур'єри", 'create_courier_performance_charts'),
+        ('department_workload', 'Відділення', 'create_department_workload_charts'),
+        ('processing_time', 'Час обробки', 'create_processing_time_charts'),
+        ('transport_utilization', 'Транспорт', 'create_transport_utilization_charts')
+    ]
+
+    # Вхідні файли дашбордів: ключ -> патерн найновішого файлу
+    DASHBOARD_INPUTS = {
+        'courier_performance': {
+            'top': 'courier_top_performers_*.json',
+            'general': 'courier_general_stats_*.json',
+            'regions': 'courier_region_analysis_*.json'
+        },
+        'department_workload': {
+            'general': 'department_general_stats_*.json',
+            'periods': 'department_period_summary_*.json',
+            'regions': 'department_region_analysis_*.json',
+            'types': 'department_type_analysis_*.json',
+            'busy': 'department_top_busy_*.json'
+        },
+        'processing_time': {
+            'general': 'processing_time_general_stats_*.json',
+            'trends': 'processing_time_trends_*.json',
+            'comparison': 'processing_time_period_comparison_*.json',
+            'regions': 'processing_time_region_analysis_*.json'
+        },
+        'transport_utilization': {
+            'general': 'transport_general_stats_*.json',
+            'usage': 'transport_period_usage_*.json',
+            'trends': 'transport_trends_*.json',
+            'efficiency': 'transport_efficiency_*.json',
+            'most_used': 'transport_most_used_*.json',
+            'regions': 'transport_region_analysis_*.json',
+            'parcels': 'transport_parcel_analysis_*.json',
+            'changes': 'transport_changes_*.json'
+        }
+    }
+
+    # Компонування дашбордів: сітка підграфіків, розмір фігури, відступ tight_layout, префікс файлу
+    DASHBOARD_LAYOUTS = {
+        'courier_performance': {'grid': (2, 3), 'figsize': (20, 12), 'pad': 1.08, 'prefix': 'courier_performance'},
+        'department_workload': {'grid': (2, 3), 'figsize': (20, 12), 'pad': 1.08, 'prefix': 'department_workload'},
+        'processing_time': {'grid': (2, 3), 'figsize': (20, 12), 'pad': 1.08, 'prefix': 'processing_time_analysis'},
+        'transport_utilization': {'grid': (3, 4), 'figsize': (24, 16), 'pad': 2.0,
+                                  'prefix': 'transport_utilization_extended'}
+    }
+
+    # Окремі графіки (панелі дашбордів): дашборд, позиція в сітці, потрібні вхідні файли, назва.
+    # Малюються методами _draw_<назва>(ax, inputs)
+    PANELS = {
+        'courier_efficiency': ('courier_performance', 1, ['top'], "Топ-10 кур'єрів за ефективністю"),
+        'courier_delivery_time': ('courier_performance', 2, ['top'], "Середній час доставки топ кур'єрів"),
+        'courier_deliveries': ('courier_performance', 3, ['top'], "Кількість доставок топ кур'єрів"),
+        'courier_general_stats': ('courier_performance', 4, ['general'], "Загальна статистика кур'єрів"),
+        'courier_regions': ('courier_performance', 5, ['regions'], 'Доставки по регіонах'),
+        'courier_delivery_time_distribution': ('courier_performance', 6, ['top'], 'Розподіл часу доставки'),
+
+        'department_general_stats': ('department_workload', 1, ['general'], 'Загальна статистика відділень'),
+        'department_periods': ('department_workload', 2, ['periods'], 'Динаміка доставок по періодах'),
+        'department_regions': ('department_workload', 3, ['regions'], 'Доставки по регіонах'),
+        'department_types': ('department_workload', 4, ['types'], 'Розподіл доставок по типах відділень'),
+        'department_region_processing': ('department_workload', 5, ['regions'], 'Час обробки по регіонах'),
+        'department_top_busy': ('department_workload', 6, ['busy'], 'Топ завантажені відділення'),
+
+        'processing_general_stats': ('processing_time', 1, ['general'], 'Статистика часу обробки'),
+        'processing_trends': ('processing_time', 2, ['trends'], 'Тренди часу обробки по типах посилок'),
+        'processing_period_comparison': ('processing_time', 3, ['comparison'], 'Середній час обробки по періодах'),
+
+        'transport_general_stats': ('transport_utilization', 1, ['general'], 'Загальна статистика транспорту'),
+        'transport_periods': ('transport_utilization', 2, ['usage'], 'Доставки транспортом по періодах'),
+        'transport_trends': ('transport_utilization', 3, ['trends'], 'Тренди використання транспорту'),
+        'transport_efficiency': ('transport_utilization', 4, ['efficiency'], 'Ефективність типів транспорту'),
+        'transport_regions': ('transport_utilization', 5, ['regions'], 'Використання транспорту по регіонах'),
+        'transport_parcel_types': ('transport_utilization', 6, ['parcels'], 'Розподіл транспорту по типах посилок'),
+        'transport_processing_time': ('transport_utilization', 7, ['usage'], 'Час обробки по типах транспорту'),
+        'transport_most_used': ('transport_utilization', 8, ['most_used'], 'Топ транспорт'),
+        'transport_changes': ('transport_utilization', 9, ['changes'], 'Зміни кількості доставок'),
+        'transport_departments': ('transport_utilization', 10, ['usage'], 'Відділення по типах транспорту'),
+        'transport_parcel_weight': ('transport_utilization', 11, ['parcels'], 'Середня вага посилок по транспорту'),
+        'transport_utilization_distribution': ('transport_utilization', 12, ['usage'], 'Розподіл рейтингів використання')
+    }
+    PANEL_FIGSIZE = (10, 6)
+
+    # Профілі побудови: швидкий перегляд, веб, друк (як раніше - 300 dpi) та векторний SVG
+    RENDER_PROFILES = {
+        'preview': {'format': 'png', 'dpi': 50},
+        'web': {'format': 'png', 'dpi': 110},
+        'print': {'format': 'png', 'dpi': 300},
+        'svg': {'format': 'svg', 'dpi': 72}
+    }
+    MIMETYPES = {'png': 'image/png', 'svg': 'image/svg+xml'}
+    # Збільшується при зміні коду побудови, щоб кеш не віддавав графіки старого вигляду
+    RENDER_VERSION = 3
+
     def __init__(self):
         self.config = DatabaseConfig()
         plt.rcParams['figure.figsize'] = (12, 8)
@@ -30,6 +140,9 @@ class DWChartGenerator:
 
         # Створюємо директорію для графіків якщо не існує
         os.makedirs(self.config.CHARTS_PATH, exist_ok=True)
+        self.chart_cache = ChartCache()
+        # Окремі графіки в пам'яті - власний кеш, щоб не витісняти спільні дані процесу
+        self.panel_cache = DataCache(max_entries=self.config.CHART_PANEL_CACHE_ENTRIES)
         print(f"📁 Директорія графіків: {self.config.CHARTS_PATH}")
         print(f"📁 Директорія даних: {self.config.PROCESSED_DATA_PATH}")
 
@@ -49,6 +162,100 @@ class DWChartGenerator:
             print(f"❌ Файли не знайдено за патерном: {pattern}")
             return None
 
+    def _latest_file(self, pattern):
+        """Найновіший файл за патерном (без діагностичного виводу)"""
+        matching_files = glob.glob(os.path.join(self.config.PROCESSED_DATA_PATH, pattern))
+        return max(matching_files, key=os.path.getctime) if matching_files else None
+
+    def find_inputs(self, dashboard):
+        """Найновіші вхідні файли дашборда: ключ -> шлях або None"""
+        return {
+            key: self.get_latest_files_by_pattern(pattern)
+            for key, pattern in self.DASHBOARD_INPUTS[dashboard].items()
+        }
+
+    def load_inputs(self, files):
+        """Дані вхідних файлів: ключ -> вміст JSON або None"""
+        return {key: self.load_json_data(filepath) if filepath else None for key, filepath in files.items()}
+
+    @staticmethod
+    def _has_inputs(inputs, keys):
+        """Чи є непорожня секція 'data' в усіх потрібних вхідних файлах"""
+        return all(inputs.get(key) and 'data' in inputs[key] and inputs[key]['data'] for key in keys)
+
+    def resolve_profile(self, profile=None):
+        """Назва профілю побудови (None - профіль за замовчуванням з конфігурації)"""
+        profile = profile or self.config.CHART_PROFILE
+        if profile not in self.RENDER_PROFILES:
+            raise ValueError(f"Невідомий профіль графіків: {profile}. Доступні: {', '.join(self.RENDER_PROFILES)}")
+        return profile
+
+    def _save_figure(self, prefix, profile):
+        """Зберігає поточну фігуру за профілем побудови та закриває її; повертає шлях до файлу"""
+        profile = self.resolve_profile(profile)
+        settings = self.RENDER_PROFILES[profile]
+
+        # Файли профілю 'print' зберігають попередні імена
+        suffix = '' if profile == 'print' else f'_{profile}'
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        chart_path = os.path.join(self.config.CHARTS_PATH, f"{prefix}{suffix}_{timestamp}.{settings['format']}")
+        with stage_timer('chart_generator', 'savefig'):
+            plt.savefig(chart_path, dpi=settings['dpi'], format=settings['format'], bbox_inches='tight')
+        plt.close()
+        register_file(chart_path)
+        return chart_path
+
+    def _render_params(self, profile):
+        return {
+            'version': self.RENDER_VERSION,
+            'profile': profile,
+            'render': self.RENDER_PROFILES[profile],
+            'matplotlib': matplotlib.__version__,
+            'budgets': {
+                'points': self.config.CHART_MAX_POINTS,
+                'slices': self.config.CHART_MAX_SLICES,
+                'ticks': self.config.CHART_MAX_TICKS
+            }
+        }
+
+    def _decimate(self, labels, values):
+        """Ряд по періодах у межах бюджету точок CHART_MAX_POINTS (LTTB)"""
+        decimated = decimate_series(labels, values, self.config.CHART_MAX_POINTS)
+        if len(decimated[1]) < len(values):
+            print(f"✂️ Проріджено ряд: {len(values)} → {len(decimated[1])} точок")
+        return decimated
+
+    def _bucket(self, labels, values, how='mean'):
+        """Стовпці по періодах у межах бюджету CHART_MAX_POINTS: сусідні періоди об'єднуються у відра"""
+        bucketed = bucket_series(labels, values, self.config.CHART_MAX_POINTS, how)
+        if len(bucketed[1]) < len(values):
+            print(f"✂️ Об'єднано періоди: {len(values)} → {len(bucketed[1])} стовпців")
+        return bucketed
+
+    def _top_slices(self, labels, values):
+        """Сектори кругової діаграми в межах бюджету CHART_MAX_SLICES, решта - сектор 'Інші'"""
+        return top_n_with_other(labels, values, self.config.CHART_MAX_SLICES)
+
+    def _fits_ticks(self, count):
+        """Чи вміщується count підписів у бюджет CHART_MAX_TICKS"""
+        return self.config.CHART_MAX_TICKS <= 0 or count <= self.config.CHART_MAX_TICKS
+
+    def _set_period_ticks(self, ax, labels):
+        """Підписи періодів під стовпцями: кожен step-ий, щоб не більше CHART_MAX_TICKS"""
+        step = 1 if self._fits_ticks(len(labels)) else -(-len(labels) // self.config.CHART_MAX_TICKS)
+        ax.set_xticks(range(0, len(labels), step))
+        ax.set_xticklabels(labels[::step], rotation=45)
+
+    def _limit_category_ticks(self, ax, count):
+        """Не більше CHART_MAX_TICKS підписів на категорійній осі X лінійного графіка"""
+        if not self._fits_ticks(count):
+            ax.xaxis.set_major_locator(MaxNLocator(nbins=self.config.CHART_MAX_TICKS, integer=True))
+
+    def chart_fingerprint(self, name, profile):
+        """Відбиток дашборда: дані найновіших вхідних файлів та параметри побудови"""
+        inputs = {pattern: self._latest_file(pattern) for pattern in self.DASHBOARD_INPUTS[name].values()}
+        return self.chart_cache.fingerprint(name, inputs, self._render_params(profile))
+
     def load_json_data(self, filepath):
         """Завантажує дані з JSON файлу"""
         try:
@@ -80,19 +287,37 @@ class DWChartGenerator:
             print(f"❌ Помилка завантаження {filepath}: {e}")
             return None
 
-    def create_courier_performance_charts(self):
-        """Створює графіки продуктивності кур'єрів"""
+    def _render_dashboard_figure(self, dashboard, inputs, profile):
+        """Дашборд з панелей PANELS, для яких є дані; повертає шлях до збереженого файлу"""
+        layout = self.DASHBOARD_LAYOUTS[dashboard]
+        rows, columns = layout['grid']
+
+        print("🎨 Створення фігури...")
+        plt.figure(figsize=layout['figsize'])
+
+        for name, (panel_dashboard, position, keys, _) in self.PANELS.items():
+            if panel_dashboard == dashboard and self._has_inputs(inputs, keys):
+                ax = plt.subplot(rows, columns, position)
+                getattr(self, f'_draw_{name}')(ax, inputs)
+
+        print("🎨 Налаштування макету...")
+        plt.tight_layout(pad=layout['pad'])
+
+        print("💾 Збереження графіка...")
+        return self._save_figure(layout['prefix'], profile)
+
+    @stage_timer('chart_generator', 'courier_performance')
+    def create_courier_performance_charts(self, profile=None):
+        """Створює графіки продуктивності кур'єрів (profile - профіль побудови); повертає шлях до файлу або False"""
         print("📈 Створення графіків кур'єрів...")
         print("=" * 50)
 
         try:
             # Завантажуємо дані топ кур'єрів
             print("🔍 Пошук файлів кур'єрів...")
-            top_couriers_file = self.get_latest_files_by_pattern('courier_top_performers_*.json')
-            general_stats_file = self.get_latest_files_by_pattern('courier_general_stats_*.json')
-            region_analysis_file = self.get_latest_files_by_pattern('courier_region_analysis_*.json')
+            files = self.find_inputs('courier_performance')
 
-            if not top_couriers_file:
+            if not files['top']:
                 print("❌ Файл топ кур'єрів не знайдено")
                 # Перевіримо які файли кур'єрів взагалі є
                 all_courier_files = glob.glob(os.path.join(self.config.PROCESSED_DATA_PATH, 'courier_*.json'))
@@ -100,9 +325,8 @@ class DWChartGenerator:
                 return False
 
             print("📖 Завантаження даних кур'єрів...")
-            top_couriers_data = self.load_json_data(top_couriers_file)
-            general_stats_data = self.load_json_data(general_stats_file) if general_stats_file else None
-            region_data = self.load_json_data(region_analysis_file) if region_analysis_file else None
+            inputs = self.load_inputs(files)
+            top_couriers_data = inputs['top']
 
             if not top_couriers_data:
                 print("❌ Не вдалося завантажити дані топ кур'єрів")
@@ -123,191 +347,15 @@ class DWChartGenerator:
             first_courier_data = top_couriers_data['data'][first_courier_key]
             print(f"📊 Структура даних кур'єра: {list(first_courier_data.keys())}")
 
-            # Створюємо фігуру з підграфіками
-            print("🎨 Створення фігури...")
-            fig = plt.figure(figsize=(20, 12))
-
-            # 1. Топ кур'єри за ефективністю
-            print("📈 Створення графіка ефективності...")
-            ax1 = plt.subplot(2, 3, 1)
-
-            # Беремо топ 10 кур'єрів
-            couriers = list(top_couriers_data['data'].items())[:10]
-            print(f"👥 Обробляємо {len(couriers)} кур'єрів")
-
-            courier_names = []
-            efficiency_scores = []
-
-            for i, (key, courier) in enumerate(couriers):
-                courier_id = courier.get('courier_id', i+1)
-                efficiency = courier.get('efficiency_score', 0)
-
-                courier_names.append(f"ID {courier_id}")
-                efficiency_scores.append(efficiency)
-
-                print(f"  Кур'єр {courier_id}: ефективність = {efficiency}")
-
-            if not any(efficiency_scores):
+            couriers, _ = self._top_couriers(inputs)
+            if not any(courier.get('efficiency_score', 0) for _, courier in couriers):
                 print("❌ Всі показники ефективності = 0")
                 return False
 
-            print(f"📊 Діапазон ефективності: {min(efficiency_scores)} - {max(efficiency_scores)}")
-
-            bars = ax1.bar(range(len(courier_names)), efficiency_scores, color='skyblue', alpha=0.8)
-            ax1.set_title('Топ-10 кур\'єрів за ефективністю', fontsize=12, fontweight='bold')
-            ax1.set_ylabel('Рейтинг ефективності')
-            ax1.set_xlabel('Кур\'єри')
-            ax1.set_xticks(range(len(courier_names)))
-            ax1.set_xticklabels(courier_names, rotation=45)
-
-            # Додаємо значення на стовпці
-            for bar, score in zip(bars, efficiency_scores):
-                if score > 0:
-                    ax1.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.5,
-                            f'{score:.1f}', ha='center', va='bottom', fontsize=8)
-
-            # 2. Середній час доставки
-            print("⏱️ Створення графіка часу доставки...")
-            ax2 = plt.subplot(2, 3, 2)
-            delivery_times = []
-
-            for key, courier in couriers:
-                delivery_time = courier.get('avg_delivery_time', 0)
-                delivery_times.append(delivery_time)
-                print(f"  Кур'єр {courier.get('courier_id', 'N/A')}: час доставки = {delivery_time}")
-
-            print(f"📊 Діапазон часу доставки: {min(delivery_times)} - {max(delivery_times)}")
-
-            bars2 = ax2.bar(range(len(courier_names)), delivery_times, color='lightcoral', alpha=0.8)
-            ax2.set_title('Середній час доставки топ кур\'єрів', fontsize=12, fontweight='bold')
-            ax2.set_ylabel('Час доставки (хв)')
-            ax2.set_xlabel('Кур\'єри')
-            ax2.set_xticks(range(len(courier_names)))
-            ax2.set_xticklabels(courier_names, rotation=45)
-
-            for bar, time in zip(bars2, delivery_times):
-                if time > 0:
-                    ax2.text(bar.get_x() + bar.get_width()/2, bar.get_height() + max(delivery_times)*0.01,
-                            f'{time:.0f}', ha='center', va='bottom', fontsize=8)
-
-            # 3. Кількість доставок
-            print("📦 Створення графіка кількості доставок...")
-            ax3 = plt.subplot(2, 3, 3)
-            total_deliveries = []
-
-            for key, courier in couriers:
-                deliveries = courier.get('total_deliveries', 0)
-                total_deliveries.append(deliveries)
-                print(f"  Кур'єр {courier.get('courier_id', 'N/A')}: доставок = {deliveries}")
-
-            print(f"📊 Діапазон доставок: {min(total_deliveries)} - {max(total_deliveries)}")
-
-            bars3 = ax3.bar(range(len(courier_names)), total_deliveries, color='lightgreen', alpha=0.8)
-            ax3.set_title('Кількість доставок топ кур\'єрів', fontsize=12, fontweight='bold')
-            ax3.set_ylabel('Кількість доставок')
-            ax3.set_xlabel('Кур\'єри')
-            ax3.set_xticks(range(len(courier_names)))
-            ax3.set_xticklabels(courier_names, rotation=45)
-
-            for bar, count in zip(bars3, total_deliveries):
-                if count > 0:
-                    ax3.text(bar.get_x() + bar.get_width()/2, bar.get_height() + max(total_deliveries)*0.01,
-                            f'{count}', ha='center', va='bottom', fontsize=8)
-
-            # 4. Загальна статистика (якщо є)
-            if general_stats_data and 'data' in general_stats_data:
-                print("📊 Створення графіка загальної статистики...")
-                ax4 = plt.subplot(2, 3, 4)
-                stats = general_stats_data['data']
-
-                print(f"📈 Загальна статистика: {stats}")
-
-                labels = ['Всього кур\'єрів', 'Всього доставок', 'Регіонів', 'Міст']
-                values = [
-                    stats.get('total_couriers', 0),
-                    stats.get('total_deliveries', 0),
-                    stats.get('total_regions', 0),
-                    stats.get('total_cities', 0)
-                ]
-
-                colors = ['#FF9999', '#66B2FF', '#99FF99', '#FFCC99']
-                bars4 = ax4.bar(labels, values, color=colors)
-                ax4.set_title('Загальна статистика кур\'єрів', fontsize=12, fontweight='bold')
-                ax4.set_ylabel('Кількість')
-                ax4.tick_params(axis='x', rotation=45)
-
-                for bar, value in zip(bars4, values):
-                    if value > 0:
-                        ax4.text(bar.get_x() + bar.get_width()/2, bar.get_height() + max(values)*0.01,
-                                f'{value}', ha='center', va='bottom', fontsize=9)
-
-            # 5. Аналіз по регіонах (якщо є)
-            if region_data and 'data' in region_data and region_data['data']:
-                print("🗺️ Створення графіка по регіонах...")
-                ax5 = plt.subplot(2, 3, 5)
-                regions = list(region_data['data'].items())[:8]  # Топ 8 регіонів
-
-                print(f"🌍 Регіонів для відображення: {len(regions)}")
-
-                if regions:
-                    region_names = [region[0].replace('_', ' ')[:15] for region in regions]
-                    region_deliveries = [region[1].get('total_deliveries', 0) for region in regions]
-
-                    for name, deliveries in zip(region_names, region_deliveries):
-                        print(f"  Регіон {name}: {deliveries} доставок")
-
-                    bars5 = ax5.barh(range(len(region_names)), region_deliveries, color='purple', alpha=0.7)
-                    ax5.set_title('Доставки по регіонах', fontsize=12, fontweight='bold')
-                    ax5.set_xlabel('Кількість доставок')
-                    ax5.set_yticks(range(len(region_names)))
-                    ax5.set_yticklabels(region_names)
-
-                    for bar, value in zip(bars5, region_deliveries):
-                        if value > 0:
-                            ax5.text(bar.get_width() + max(region_deliveries)*0.01,
-                                    bar.get_y() + bar.get_height()/2,
-                                    f'{value}', ha='left', va='center', fontsize=8)
-
-            # 6. Розподіл часу доставки (гістограма)
-            print("📊 Створення гістограми часу доставки...")
-            ax6 = plt.subplot(2, 3, 6)
-            all_delivery_times = []
-
-            for courier in top_couriers_data['data'].values():
-                delivery_time = courier.get('avg_delivery_time', 0)
-                if delivery_time > 0:
-                    all_delivery_times.append(delivery_time)
-
-            print(f"⏱️ Часів доставки для гістограми: {len(all_delivery_times)}")
-
-            if all_delivery_times and len(all_delivery_times) > 1:
-                bins_count = min(15, len(all_delivery_times))
-                print(f"📊 Кількість bins: {bins_count}")
-
-                ax6.hist(all_delivery_times, bins=bins_count,
-                        color='orange', alpha=0.7, edgecolor='black')
-                ax6.set_title('Розподіл часу доставки', fontsize=12, fontweight='bold')
-                ax6.set_xlabel('Час доставки (хв)')
-                ax6.set_ylabel('Кількість кур\'єрів')
-
-                mean_time = np.mean(all_delivery_times)
-                ax6.axvline(mean_time, color='red', linestyle='--',
-                           label=f'Середнє: {mean_time:.1f} хв')
-                ax6.legend()
-
-                print(f"📊 Середній час доставки: {mean_time:.1f} хв")
-
-            print("🎨 Налаштування макету...")
-            plt.tight_layout()
-
-            print("💾 Збереження графіка...")
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            chart_path = os.path.join(self.config.CHARTS_PATH, f'courier_performance_{timestamp}.png')
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-            plt.close()
+            chart_path = self._render_dashboard_figure('courier_performance', inputs, profile)
 
             print(f"✅ Графік кур'єрів збережено: {os.path.basename(chart_path)}")
-            return True
+            return chart_path
 
         except Exception as e:
             print(f"❌ Помилка створення графіків кур'єрів: {e}")
@@ -315,19 +363,17 @@ class DWChartGenerator:
             plt.close('all')  # Закриваємо всі відкриті фігури
             return False
 
-    def create_processing_time_charts(self):
-        """Створює графіки часу обробки"""
+    @stage_timer('chart_generator', 'processing_time')
+    def create_processing_time_charts(self, profile=None):
+        """Створює графіки часу обробки (profile - профіль побудови); повертає шлях до файлу або False"""
         print("⏱️ Створення графіків часу обробки...")
         print("=" * 50)
 
         try:
             print("🔍 Пошук файлів часу обробки...")
-            general_stats_file = self.get_latest_files_by_pattern('processing_time_general_stats_*.json')
-            trends_file = self.get_latest_files_by_pattern('processing_time_trends_*.json')
-            period_comparison_file = self.get_latest_files_by_pattern('processing_time_period_comparison_*.json')
-            region_analysis_file = self.get_latest_files_by_pattern('processing_time_region_analysis_*.json')
+            files = self.find_inputs('processing_time')
 
-            if not general_stats_file:
+            if not files['general']:
                 print("❌ Файли аналізу часу обробки не знайдено")
                 # Перевіримо які файли часу обробки взагалі є
                 all_processing_files = glob.glob(os.path.join(self.config.PROCESSED_DATA_PATH, 'processing_time_*.json'))
@@ -335,10 +381,8 @@ class DWChartGenerator:
                 return False
 
             print("📖 Завантаження даних часу обробки...")
-            general_data = self.load_json_data(general_stats_file)
-            trends_data = self.load_json_data(trends_file) if trends_file else None
-            comparison_data = self.load_json_data(period_comparison_file) if period_comparison_file else None
-            region_data = self.load_json_data(region_analysis_file) if region_analysis_file else None
+            inputs = self.load_inputs(files)
+            general_data = inputs['general']
 
             if not general_data:
                 print("❌ Не вдалося завантажити загальні дані часу обробки")
@@ -351,119 +395,15 @@ class DWChartGenerator:
             print(f"✅ Завантажено загальних даних: {general_data['data']}")
 
             # Аналізуємо дані
-            if trends_data and 'data' in trends_data:
-                print(f"📊 Тренди: {len(trends_data['data'])} записів")
-            if comparison_data and 'data' in comparison_data:
-                print(f"📊 Порівняння періодів: {len(comparison_data['data'])} записів")
-            if region_data and 'data' in region_data:
-                print(f"📊 Регіональні дані: {len(region_data['data'])} записів")
-
-            print("🎨 Створення фігури...")
-            fig = plt.figure(figsize=(20, 12))
-
-            # 1. Загальна статистика часу обробки
-            print("📊 Створення графіка загальної статистики...")
-            ax1 = plt.subplot(2, 3, 1)
-            stats = general_data['data']
-
-            labels = ['Середній\nчас', 'Медіанний\nчас', 'Мін.\nчас', 'Макс.\nчас']
-            values = [
-                stats.get('avg_processing_time', 0),
-                stats.get('median_processing_time', 0),
-                stats.get('min_processing_time', 0),
-                stats.get('max_processing_time', 0)
-            ]
-
-            print(f"📈 Статистика часу: {dict(zip(labels, values))}")
+            for key, label in [('trends', 'Тренди'), ('comparison', 'Порівняння періодів'),
+                               ('regions', 'Регіональні дані')]:
+                if inputs[key] and 'data' in inputs[key]:
+                    print(f"📊 {label}: {len(inputs[key]['data'])} записів")
 
-            colors = ['#FF7675', '#74B9FF', '#00B894', '#FDCB6E']
-            bars = ax1.bar(labels, values, color=colors, alpha=0.8)
-            ax1.set_title('Статистика часу обробки', fontsize=12, fontweight='bold')
-            ax1.set_ylabel('Час (години)')
-
-            for bar, value in zip(bars, values):
-                if value > 0:
-                    ax1.text(bar.get_x() + bar.get_width()/2, bar.get_height() + max(values)*0.01,
-                            f'{value:.1f}', ha='center', va='bottom', fontsize=9)
-
-            # 2. Тренди по типах посилок
-            if trends_data and 'data' in trends_data and trends_data['data']:
-                print("📈 Створення графіка трендів...")
-                ax2 = plt.subplot(2, 3, 2)
-
-                # Групуємо по типах посилок
-                parcel_trends = {}
-                for key, value in trends_data['data'].items():
-                    parcel_type = value.get('parcel_type_name', 'Невідомий')
-                    period = value.get('period', key.split('_')[0] if '_' in key else 'Unknown')
-
-                    if parcel_type not in parcel_trends:
-                        parcel_trends[parcel_type] = {'periods': [], 'times': []}
-
-                    parcel_trends[parcel_type]['periods'].append(period)
-                    parcel_trends[parcel_type]['times'].append(value.get('avg_processing_time', 0))
-
-                print(f"📊 Типів посилок для трендів: {len(parcel_trends)}")
-
-                if parcel_trends:
-                    colors = plt.cm.tab10(np.linspace(0, 1, len(parcel_trends)))
-                    plotted = 0
-                    for i, (parcel_type, data) in enumerate(list(parcel_trends.items())[:5]):  # Топ 5
-                        if data['periods'] and data['times'] and any(data['times']):
-                            print(f"  📈 {parcel_type}: {len(data['periods'])} періодів")
-                            ax2.plot(data['periods'], data['times'], marker='o',
-                                    label=parcel_type[:15], color=colors[i], linewidth=2)
-                            plotted += 1
-
-                    if plotted > 0:
-                        ax2.set_title('Тренди часу обробки по типах посилок', fontsize=12, fontweight='bold')
-                        ax2.set_ylabel('Час обробки (год)')
-                        ax2.set_xlabel('Період')
-                        ax2.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
-                        ax2.tick_params(axis='x', rotation=45)
-                        ax2.grid(True, alpha=0.3)
-
-            # 3. Порівняння періодів
-            if comparison_data and 'data' in comparison_data and comparison_data['data']:
-                print("📊 Створення графіка порівняння періодів...")
-                ax3 = plt.subplot(2, 3, 3)
-                periods = list(comparison_data['data'].items())
-
-                print(f"📅 Періодів для порівняння: {len(periods)}")
-
-                if periods:
-                    period_names = [period[0] for period in periods]
-                    avg_times = [period[1].get('avg_processing_time', 0) for period in periods]
-
-                    for name, time in zip(period_names, avg_times):
-                        print(f"  📅 {name}: {time:.1f} год")
-
-                    if any(avg_times):
-                        bars = ax3.bar(range(len(period_names)), avg_times, color='#A29BFE', alpha=0.8)
-                        ax3.set_title('Середній час обробки по періодах', fontsize=12, fontweight='bold')
-                        ax3.set_ylabel('Час обробки (год)')
-                        ax3.set_xlabel('Період')
-                        ax3.set_xticks(range(len(period_names)))
-                        ax3.set_xticklabels(period_names, rotation=45)
-
-                        for bar, time in zip(bars, avg_times):
-                            if time > 0:
-                                ax3.text(bar.get_x() + bar.get_width()/2,
-                                        bar.get_height() + max(avg_times)*0.01,
-                                        f'{time:.1f}', ha='center', va='bottom', fontsize=8)
-
-            # Продовжуємо з іншими графіками...
-            print("🎨 Налаштування макету...")
-            plt.tight_layout()
-
-            print("💾 Збереження графіка...")
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            chart_path = os.path.join(self.config.CHARTS_PATH, f'processing_time_analysis_{timestamp}.png')
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-            plt.close()
+            chart_path = self._render_dashboard_figure('processing_time', inputs, profile)
 
             print(f"✅ Графік часу обробки збережено: {os.path.basename(chart_path)}")
-            return True
+            return chart_path
 
         except Exception as e:
             print(f"❌ Помилка створення графіків часу обробки: {e}")
@@ -471,212 +411,55 @@ class DWChartGenerator:
             plt.close('all')
             return False
 
-    # Інші методи залишаються без змін...
-    def create_department_workload_charts(self):
-        """Створює графіки завантаження відділень"""
+    @stage_timer('chart_generator', 'department_workload')
+    def create_department_workload_charts(self, profile=None):
+        """Створює графіки завантаження відділень (profile - профіль побудови); повертає шлях до файлу або False"""
         print("📊 Створення графіків відділень...")
 
         try:
             # Завантажуємо різні типи аналізів відділень
-            general_stats_file = self.get_latest_files_by_pattern('department_general_stats_*.json')
-            period_summary_file = self.get_latest_files_by_pattern('department_period_summary_*.json')
-            region_analysis_file = self.get_latest_files_by_pattern('department_region_analysis_*.json')
-            type_analysis_file = self.get_latest_files_by_pattern('department_type_analysis_*.json')
-            top_busy_file = self.get_latest_files_by_pattern('department_top_busy_*.json')
+            files = self.find_inputs('department_workload')
 
-            if not general_stats_file:
+            if not files['general']:
                 print("❌ Файли аналізу відділень не знайдено")
                 return False
 
-            general_data = self.load_json_data(general_stats_file)
-            period_data = self.load_json_data(period_summary_file) if period_summary_file else None
-            region_data = self.load_json_data(region_analysis_file) if region_analysis_file else None
-            type_data = self.load_json_data(type_analysis_file) if type_analysis_file else None
-            busy_data = self.load_json_data(top_busy_file) if top_busy_file else None
+            inputs = self.load_inputs(files)
+            general_data = inputs['general']
 
             if not general_data or 'data' not in general_data:
                 print("❌ Немає даних про відділення")
                 return False
 
-            fig = plt.figure(figsize=(20, 12))
-
-            # 1. Загальна статистика відділень
-            ax1 = plt.subplot(2, 3, 1)
-            stats = general_data['data']
-
-            labels = ['Відділення', 'Доставки', 'Регіони', 'Міста', 'Періоди']
-            values = [
-                stats.get('total_departments', 0),
-                stats.get('total_deliveries', 0),
-                stats.get('total_regions', 0),
-                stats.get('total_cities', 0),
-                stats.get('total_periods', 0)
-            ]
-
-            colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7']
-            bars = ax1.bar(labels, values, color=colors, alpha=0.8)
-            ax1.set_title('Загальна статистика відділень', fontsize=12, fontweight='bold')
-            ax1.set_ylabel('Кількість')
-            ax1.tick_params(axis='x', rotation=45)
-
-            for bar, value in zip(bars, values):
-                if value > 0:
-                    ax1.text(bar.get_x() + bar.get_width()/2, bar.get_height() + max(values)*0.01,
-                            f'{value:,}', ha='center', va='bottom', fontsize=9)
-
-            # 2. Доставки по періодах
-            if period_data and 'data' in period_data and period_data['data']:
-                ax2 = plt.subplot(2, 3, 2)
-                periods = list(period_data['data'].items())
-
-                if periods:
-                    period_names = [period[0] for period in periods]
-                    period_deliveries = [period[1].get('total_deliveries', 0) for period in periods]
-
-                    ax2.plot(period_names, period_deliveries, marker='o', linewidth=2, markersize=6, color='#E17055')
-                    ax2.set_title('Динаміка доставок по періодах', fontsize=12, fontweight='bold')
-                    ax2.set_ylabel('Кількість доставок')
-                    ax2.set_xlabel('Період')
-                    ax2.tick_params(axis='x', rotation=45)
-                    ax2.grid(True, alpha=0.3)
-
-            # 3. Аналіз по регіонах
-            if region_data and 'data' in region_data and region_data['data']:
-                ax3 = plt.subplot(2, 3, 3)
-                regions = list(region_data['data'].items())[:10]
-
-                if regions:
-                    region_names = [region[0].replace('_', ' ')[:15] for region in regions]
-                    region_deliveries = [region[1].get('total_deliveries', 0) for region in regions]
-
-                    bars = ax3.barh(range(len(region_names)), region_deliveries, color='#74B9FF', alpha=0.8)
-                    ax3.set_title('Доставки по регіонах', fontsize=12, fontweight='bold')
-                    ax3.set_xlabel('Кількість доставок')
-                    ax3.set_yticks(range(len(region_names)))
-                    ax3.set_yticklabels(region_names)
-
-                    for bar, value in zip(bars, region_deliveries):
-                        if value > 0:
-                            ax3.text(bar.get_width() + max(region_deliveries)*0.01,
-                                    bar.get_y() + bar.get_height()/2,
-                                    f'{value:,}', ha='left', va='center', fontsize=8)
-
-            # 4. Аналіз по типах відділень
-            if type_data and 'data' in type_data and type_data['data']:
-                ax4 = plt.subplot(2, 3, 4)
-
-                # Групуємо по типах відділень
-                dept_types = {}
-                for key, value in type_data['data'].items():
-                    dept_type = value.get('department_type', 'Невідомий')
-                    if dept_type not in dept_types:
-                        dept_types[dept_type] = 0
-                    dept_types[dept_type] += value.get('total_deliveries', 0)
-
-                if dept_types:
-                    labels = list(dept_types.keys())
-                    sizes = list(dept_types.values())
-                    colors = plt.cm.Set3(np.linspace(0, 1, len(labels)))
-
-                    wedges, texts, autotexts = ax4.pie(sizes, labels=labels, autopct='%1.1f%%',
-                                                      colors=colors, startangle=90)
-                    ax4.set_title('Розподіл доставок по типах відділень', fontsize=12, fontweight='bold')
-
-            # 5. Час обробки по регіонах
-            if region_data and 'data' in region_data and region_data['data']:
-                ax5 = plt.subplot(2, 3, 5)
-                regions = list(region_data['data'].items())[:8]
-
-                if regions:
-                    region_names = [region[0].replace('_', ' ')[:12] for region in regions]
-                    processing_times = [region[1].get('avg_processing_time', 0) for region in regions]
-
-                    if any(processing_times):
-                        bars = ax5.bar(range(len(region_names)), processing_times, color='#FD79A8', alpha=0.8)
-                        ax5.set_title('Час обробки по регіонах', fontsize=12, fontweight='bold')
-                        ax5.set_ylabel('Час обробки (год)')
-                        ax5.set_xlabel('Регіон')
-                        ax5.set_xticks(range(len(region_names)))
-                        ax5.set_xticklabels(region_names, rotation=45)
-
-                        for bar, time in zip(bars, processing_times):
-                            if time > 0:
-                                ax5.text(bar.get_x() + bar.get_width()/2,
-                                        bar.get_height() + max(processing_times)*0.01,
-                                        f'{time:.1f}', ha='center', va='bottom', fontsize=8)
-
-            # 6. Топ завантажені відділення (якщо є дані)
-            if busy_data and 'data' in busy_data and busy_data['data']:
-                ax6 = plt.subplot(2, 3, 6)
-
-                # Беремо перший період з найбільшою кількістю даних
-                first_period = list(busy_data['data'].keys())[0] if busy_data['data'] else None
-                if first_period and busy_data['data'][first_period]:
-                    top_depts = list(busy_data['data'][first_period].items())[:8]
-
-                    if top_depts:
-                        dept_names = [f"Відд. {dept[1].get('department_id', i+1)}" for i, dept in enumerate(top_depts)]
-                        workload_scores = [dept[1].get('period_workload_score', 0) for dept in top_depts]
-
-                        if any(workload_scores):
-                            bars = ax6.barh(range(len(dept_names)), workload_scores, color='#FDCB6E', alpha=0.8)
-                            ax6.set_title(f'Топ завантажені відділення ({first_period})', fontsize=12, fontweight='bold')
-                            ax6.set_xlabel('Рейтинг завантаженості')
-                            ax6.set_yticks(range(len(dept_names)))
-                            ax6.set_yticklabels(dept_names)
-
-                            for bar, score in zip(bars, workload_scores):
-                                if score > 0:
-                                    ax6.text(bar.get_width() + max(workload_scores)*0.01,
-                                            bar.get_y() + bar.get_height()/2,
-                                            f'{score:.1f}', ha='left', va='center', fontsize=8)
-
-            plt.tight_layout()
-
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            chart_path = os.path.join(self.config.CHARTS_PATH, f'department_workload_{timestamp}.png')
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-            plt.close()
+            chart_path = self._render_dashboard_figure('department_workload', inputs, profile)
 
             print(f"✅ Графік відділень збережено: {os.path.basename(chart_path)}")
-            return True
+            return chart_path
 
         except Exception as e:
             print(f"❌ Помилка створення графіків відділень: {e}")
             plt.close('all')
             return False
 
-    def create_transport_utilization_charts(self):
-        """Створює розширені графіки використання транспорту"""
+    @stage_timer('chart_generator', 'transport_utilization')
+    def create_transport_utilization_charts(self, profile=None):
+        """Створює розширені графіки використання транспорту (profile - профіль побудови); повертає шлях до файлу або False"""
         print("🚛 Створення графіків транспорту...")
         print("=" * 50)
 
         try:
             print("🔍 Пошук файлів транспорту...")
-            general_stats_file = self.get_latest_files_by_pattern('transport_general_stats_*.json')
-            period_usage_file = self.get_latest_files_by_pattern('transport_period_usage_*.json')
-            trends_file = self.get_latest_files_by_pattern('transport_trends_*.json')
-            efficiency_file = self.get_latest_files_by_pattern('transport_efficiency_*.json')
-            most_used_file = self.get_latest_files_by_pattern('transport_most_used_*.json')
-            region_analysis_file = self.get_latest_files_by_pattern('transport_region_analysis_*.json')
-            parcel_analysis_file = self.get_latest_files_by_pattern('transport_parcel_analysis_*.json')
-            changes_file = self.get_latest_files_by_pattern('transport_changes_*.json')
-
-            if not general_stats_file:
+            files = self.find_inputs('transport_utilization')
+
+            if not files['general']:
                 print("❌ Файли аналізу транспорту не знайдено")
                 all_transport_files = glob.glob(os.path.join(self.config.PROCESSED_DATA_PATH, 'transport_*.json'))
                 print(f"📋 Всі файли транспорту: {[os.path.basename(f) for f in all_transport_files]}")
                 return False
 
             print("📖 Завантаження даних транспорту...")
-            general_data = self.load_json_data(general_stats_file)
-            usage_data = self.load_json_data(period_usage_file) if period_usage_file else None
-            trends_data = self.load_json_data(trends_file) if trends_file else None
-            efficiency_data = self.load_json_data(efficiency_file) if efficiency_file else None
-            most_used_data = self.load_json_data(most_used_file) if most_used_file else None
-            region_data = self.load_json_data(region_analysis_file) if region_analysis_file else None
-            parcel_data = self.load_json_data(parcel_analysis_file) if parcel_analysis_file else None
-            changes_data = self.load_json_data(changes_file) if changes_file else None
+            inputs = self.load_inputs(files)
+            general_data = inputs['general']
 
             if not general_data or 'data' not in general_data:
                 print("❌ Немає даних про транспорт")
@@ -685,452 +468,15 @@ class DWChartGenerator:
             print(f"✅ Завантажено загальних даних: {general_data['data']}")
 
             # Аналізуємо дані
-            if usage_data and 'data' in usage_data:
-                print(f"📊 Використання по періодах: {len(usage_data['data'])} записів")
-            if trends_data and 'data' in trends_data:
-                print(f"📊 Тренди: {len(trends_data['data'])} записів")
-            if efficiency_data and 'data' in efficiency_data:
-                print(f"📊 Ефективність: {len(efficiency_data['data'])} записів")
-
-            print("🎨 Створення розширеної фігури...")
-            fig = plt.figure(figsize=(24, 16))  # Збільшуємо розмір для більше графіків
-
-            # 1. Загальна статистика транспорту
-            print("📊 Створення графіка загальної статистики...")
-            ax1 = plt.subplot(3, 4, 1)
-            stats = general_data['data']
-
-            labels = ['Типи\nтранспорту', 'Всього\nдоставок', 'Відділення', 'Регіони', 'Типи\nпосилок']
-            values = [
-                stats.get('total_transport_types', 0),
-                stats.get('total_deliveries', 0),
-                stats.get('departments_using_transport', 0),
-                stats.get('regions_served', 0),
-                stats.get('parcel_types_transported', 0)
-            ]
-
-            print(f"📈 Загальна статистика: {dict(zip(labels, values))}")
-
-            colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7']
-            bars = ax1.bar(labels, values, color=colors, alpha=0.8)
-            ax1.set_title('Загальна статистика транспорту', fontsize=11, fontweight='bold')
-            ax1.set_ylabel('Кількість')
-            ax1.tick_params(axis='x', rotation=45)
-
-            for bar, value in zip(bars, values):
-                if value > 0:
-                    ax1.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + max(values) * 0.01,
-                             f'{value:,}', ha='center', va='bottom', fontsize=8)
-
-            # 2. Використання транспорту по періодах
-            if usage_data and 'data' in usage_data and usage_data['data']:
-                print("📅 Створення графіка використання по періодах...")
-                ax2 = plt.subplot(3, 4, 2)
-
-                # Групуємо по періодах
-                period_usage = {}
-                for key, value in usage_data['data'].items():
-                    period = key.split('_')[0] if '_' in key else 'Unknown'
-                    if period not in period_usage:
-                        period_usage[period] = {'deliveries': 0, 'score': 0, 'count': 0}
-
-                    period_usage[period]['deliveries'] += value.get('total_deliveries', 0)
-                    period_usage[period]['score'] += value.get('period_utilization_score', 0)
-                    period_usage[period]['count'] += 1
-
-                print(f"📊 Періодів для аналізу: {len(period_usage)}")
-
-                if period_usage:
-                    periods = sorted(period_usage.keys())[:8]  # Останні 8 періодів
-                    period_deliveries = [period_usage[p]['deliveries'] for p in periods]
-
-                    for period, deliveries in zip(periods, period_deliveries):
-                        print(f"  📅 {period}: {deliveries} доставок")
-
-                    bars = ax2.bar(range(len(periods)), period_deliveries, color='#74B9FF', alpha=0.8)
-                    ax2.set_title('Доставки транспортом по періодах', fontsize=11, fontweight='bold')
-                    ax2.set_ylabel('Кількість доставок')
-                    ax2.set_xlabel('Період')
-                    ax2.set_xticks(range(len(periods)))
-                    ax2.set_xticklabels(periods, rotation=45)
-
-                    for bar, value in zip(bars, period_deliveries):
-                        if value > 0:
-                            ax2.text(bar.get_x() + bar.get_width() / 2,
-                                     bar.get_height() + max(period_deliveries) * 0.01,
-                                     f'{value:,}', ha='center', va='bottom', fontsize=8)
-
-            # 3. Тренди використання транспорту
-            if trends_data and 'data' in trends_data and trends_data['data']:
-                print("📈 Створення графіка трендів...")
-                ax3 = plt.subplot(3, 4, 3)
-
-                # Групуємо тренди по типах транспорту
-                transport_trends = {}
-                for key, value in trends_data['data'].items():
-                    parts = key.split('_')
-                    if len(parts) >= 2:
-                        transport_type = parts[0]
-                        period = parts[1] if len(parts) > 1 else 'Unknown'
-
-                        if transport_type not in transport_trends:
-                            transport_trends[transport_type] = {'periods': [], 'deliveries': []}
-
-                        transport_trends[transport_type]['periods'].append(period)
-                        transport_trends[transport_type]['deliveries'].append(value.get('total_deliveries', 0))
-
-                print(f"📊 Типів транспорту для трендів: {len(transport_trends)}")
-
-                if transport_trends:
-                    colors = plt.cm.tab10(np.linspace(0, 1, len(transport_trends)))
-                    plotted = 0
-
-                    for i, (transport_type, data) in enumerate(list(transport_trends.items())[:5]):
-                        if data['periods'] and data['deliveries'] and any(data['deliveries']):
-                            # Сортуємо по періодах
-                            sorted_data = sorted(zip(data['periods'], data['deliveries']))
-                            periods, deliveries = zip(*sorted_data) if sorted_data else ([], [])
-
-                            print(f"  📈 {transport_type}: {len(periods)} періодів")
-                            ax3.plot(range(len(periods)), deliveries, marker='o',
-                                     label=transport_type[:12], color=colors[i], linewidth=2)
-                            plotted += 1
-
-                    if plotted > 0:
-                        ax3.set_title('Тренди використання транспорту', fontsize=11, fontweight='bold')
-                        ax3.set_ylabel('Кількість доставок')
-                        ax3.set_xlabel('Період')
-                        ax3.legend(bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=8)
-                        ax3.grid(True, alpha=0.3)
-
-            # 4. Ефективність транспорту
-            if efficiency_data and 'data' in efficiency_data and efficiency_data['data']:
-                print("⚡ Створення графіка ефективності...")
-                ax4 = plt.subplot(3, 4, 4)
-
-                # Беремо топ ефективних типів транспорту
-                efficiency_scores = []
-                transport_names = []
-
-                for key, value in list(efficiency_data['data'].items())[:10]:
-                    parts = key.split('_')
-                    transport_name = parts[1] if len(parts) > 1 else key[:15]
-                    efficiency = value.get('efficiency_ratio', 0)
-
-                    transport_names.append(transport_name)
-                    efficiency_scores.append(efficiency)
-                    print(f"  ⚡ {transport_name}: ефективність = {efficiency}")
-
-                if efficiency_scores and any(efficiency_scores):
-                    bars = ax4.barh(range(len(transport_names)), efficiency_scores, color='#00B894', alpha=0.8)
-                    ax4.set_title('Ефективність типів транспорту', fontsize=11, fontweight='bold')
-                    ax4.set_xlabel('Коефіцієнт ефективності')
-                    ax4.set_yticks(range(len(transport_names)))
-                    ax4.set_yticklabels(transport_names)
-
-                    for bar, score in zip(bars, efficiency_scores):
-                        if score > 0:
-                            ax4.text(bar.get_width() + max(efficiency_scores) * 0.01,
-                                     bar.get_y() + bar.get_height() / 2,
-                                     f'{score:.1f}', ha='left', va='center', fontsize=8)
-
-            # 5. Розподіл транспорту по регіонах
-            if region_data and 'data' in region_data and region_data['data']:
-                print("🗺️ Створення графіка по регіонах...")
-                ax5 = plt.subplot(3, 4, 5)
-
-                # Групуємо по регіонах
-                region_transport = {}
-                for key, value in region_data['data'].items():
-                    parts = key.split('_')
-                    region = parts[2] if len(parts) > 2 else 'Unknown'
-
-                    if region not in region_transport:
-                        region_transport[region] = 0
-                    region_transport[region] += value.get('total_deliveries', 0)
-
-                print(f"🌍 Регіонів для аналізу: {len(region_transport)}")
-
-                if region_transport:
-                    # Топ 8 регіонів
-                    top_regions = sorted(region_transport.items(), key=lambda x: x[1], reverse=True)[:8]
-                    region_names = [region[0].replace('_', ' ')[:12] for region in top_regions]
-                    region_deliveries = [region[1] for region in top_regions]
-
-                    for name, deliveries in zip(region_names, region_deliveries):
-                        print(f"  🌍 {name}: {deliveries} доставок")
-
-                    bars = ax5.barh(range(len(region_names)), region_deliveries, color='#E17055', alpha=0.8)
-                    ax5.set_title('Використання транспорту по регіонах', fontsize=11, fontweight='bold')
-                    ax5.set_xlabel('Кількість доставок')
-                    ax5.set_yticks(range(len(region_names)))
-                    ax5.set_yticklabels(region_names)
-
-                    for bar, value in zip(bars, region_deliveries):
-                        if value > 0:
-                            ax5.text(bar.get_width() + max(region_deliveries) * 0.01,
-                                     bar.get_y() + bar.get_height() / 2,
-                                     f'{value:,}', ha='left', va='center', fontsize=8)
-
-            # 6. Транспорт по типах посилок
-            if parcel_data and 'data' in parcel_data and parcel_data['data']:
-                print("📦 Створення графіка по типах посилок...")
-                ax6 = plt.subplot(3, 4, 6)
-
-                # Групуємо по типах посилок
-                parcel_transport = {}
-                for key, value in parcel_data['data'].items():
-                    parts = key.split('_')
-                    parcel_type = parts[2] if len(parts) > 2 else 'Unknown'
-
-                    if parcel_type not in parcel_transport:
-                        parcel_transport[parcel_type] = {'deliveries': 0, 'weight': 0, 'count': 0}
-
-                    parcel_transport[parcel_type]['deliveries'] += value.get('total_deliveries', 0)
-                    parcel_transport[parcel_type]['weight'] += value.get('avg_parcel_weight', 0)
-                    parcel_transport[parcel_type]['count'] += 1
-
-                print(f"📦 Типів посилок: {len(parcel_transport)}")
-
-                if parcel_transport:
-                    parcel_types = list(parcel_transport.keys())
-                    parcel_deliveries = [parcel_transport[pt]['deliveries'] for pt in parcel_types]
-
-                    if any(parcel_deliveries):
-                        colors = plt.cm.Set3(np.linspace(0, 1, len(parcel_types)))
-                        wedges, texts, autotexts = ax6.pie(parcel_deliveries, labels=parcel_types,
-                                                           autopct='%1.1f%%', colors=colors, startangle=90)
-                        ax6.set_title('Розподіл транспорту по типах посилок', fontsize=11, fontweight='bold')
-
-            # 7. Середній час обробки по типах транспорту
-            if usage_data and 'data' in usage_data and usage_data['data']:
-                print("⏱️ Створення графіка часу обробки...")
-                ax7 = plt.subplot(3, 4, 7)
-
-                # Групуємо по типах транспорту
-                transport_processing_time = {}
-                for key, value in usage_data['data'].items():
-                    parts = key.split('_')
-                    transport_type = parts[2] if len(parts) > 2 else 'Unknown'
-
-                    if transport_type not in transport_processing_time:
-                        transport_processing_time[transport_type] = {'time': 0, 'count': 0}
-
-                    transport_processing_time[transport_type]['time'] += value.get('avg_processing_time', 0)
-                    transport_processing_time[transport_type]['count'] += 1
-
-                if transport_processing_time:
-                    # Обчислюємо середній час
-                    for transport_type in transport_processing_time:
-                        if transport_processing_time[transport_type]['count'] > 0:
-                            transport_processing_time[transport_type]['avg_time'] = (
-                                    transport_processing_time[transport_type]['time'] /
-                                    transport_processing_time[transport_type]['count']
-                            )
-
-                    transport_types = list(transport_processing_time.keys())[:8]
-                    processing_times = [transport_processing_time[tt].get('avg_time', 0) for tt in transport_types]
-
-                    print(f"⏱️ Типів транспорту для часу обробки: {len(transport_types)}")
-
-                    if any(processing_times):
-                        bars = ax7.bar(range(len(transport_types)), processing_times, color='#FD79A8', alpha=0.8)
-                        ax7.set_title('Час обробки по типах транспорту', fontsize=11, fontweight='bold')
-                        ax7.set_ylabel('Час обробки (год)')
-                        ax7.set_xlabel('Тип транспорту')
-                        ax7.set_xticks(range(len(transport_types)))
-                        ax7.set_xticklabels([tt[:8] for tt in transport_types], rotation=45)
-
-                        for bar, time in zip(bars, processing_times):
-                            if time > 0:
-                                ax7.text(bar.get_x() + bar.get_width() / 2,
-                                         bar.get_height() + max(processing_times) * 0.01,
-                                         f'{time:.1f}', ha='center', va='bottom', fontsize=8)
-
-            # 8. Найбільш використовувані типи транспорту
-            if most_used_data and 'data' in most_used_data and most_used_data['data']:
-                print("🏆 Створення графіка найбільш використовуваних...")
-                ax8 = plt.subplot(3, 4, 8)
-
-                # Беремо перший період з найбільшою кількістю даних
-                first_period = list(most_used_data['data'].keys())[0] if most_used_data['data'] else None
-                if first_period and most_used_data['data'][first_period]:
-                    top_transport = list(most_used_data['data'][first_period].items())[:6]
-
-                    if top_transport:
-                        transport_names = []
-                        utilization_scores = []
-
-                        for transport_key, transport_data in top_transport:
-                            transport_name = transport_key.split('_')[2] if '_' in transport_key else transport_key[:10]
-                            score = transport_data.get('period_utilization_score', 0)
-
-                            transport_names.append(transport_name)
-                            utilization_scores.append(score)
-                            print(f"  🏆 {transport_name}: рейтинг = {score}")
-
-                        if any(utilization_scores):
-                            bars = ax8.barh(range(len(transport_names)), utilization_scores, color='#FDCB6E', alpha=0.8)
-                            ax8.set_title(f'Топ транспорт ({first_period})', fontsize=11, fontweight='bold')
-                            ax8.set_xlabel('Рейтинг використання')
-                            ax8.set_yticks(range(len(transport_names)))
-                            ax8.set_yticklabels(transport_names)
-
-                            for bar, score in zip(bars, utilization_scores):
-                                if score > 0:
-                                    ax8.text(bar.get_width() + max(utilization_scores) * 0.01,
-                                             bar.get_y() + bar.get_height() / 2,
-                                             f'{score:.1f}', ha='left', va='center', fontsize=8)
-
-            # 9. Динаміка змін використання транспорту
-            if changes_data and 'data' in changes_data and changes_data['data']:
-                print("📊 Створення графіка динаміки змін...")
-                ax9 = plt.subplot(3, 4, 9)
-
-                changes = list(changes_data['data'].values())
-                if changes:
-                    change_labels = [change.get('current_period', 'Unknown') for change in changes]
-                    delivery_changes = [change.get('deliveries_change', 0) for change in changes]
-
-                    print(f"📊 Періодів змін: {len(changes)}")
-
-                    if any(delivery_changes):
-                        colors = ['green' if x >= 0 else 'red' for x in delivery_changes]
-                        bars = ax9.bar(range(len(change_labels)), delivery_changes, color=colors, alpha=0.7)
-                        ax9.set_title('Зміни кількості доставок', fontsize=11, fontweight='bold')
-                        ax9.set_ylabel('Зміна доставок')
-                        ax9.set_xlabel('Період')
-                        ax9.set_xticks(range(len(change_labels)))
-                        ax9.set_xticklabels(change_labels, rotation=45)
-                        ax9.axhline(y=0, color='black', linestyle='-', alpha=0.3)
-
-                        for bar, change in zip(bars, delivery_changes):
-                            if change != 0:
-                                ax9.text(bar.get_x() + bar.get_width() / 2,
-                                         bar.get_height() + (max(delivery_changes) - min(delivery_changes)) * 0.01,
-                                         f'{change:+}', ha='center', va='bottom', fontsize=8)
-
-            # 10. Розподіл відділень по типах транспорту
-            if usage_data and 'data' in usage_data and usage_data['data']:
-                print("🏢 Створення графіка відділень по транспорту...")
-                ax10 = plt.subplot(3, 4, 10)
-
-                # Групуємо кількість відділень по типах транспорту
-                transport_departments = {}
-                for key, value in usage_data['data'].items():
-                    parts = key.split('_')
-                    transport_type = parts[2] if len(parts) > 2 else 'Unknown'
-
-                    if transport_type not in transport_departments:
-                        transport_departments[transport_type] = 0
-                    transport_departments[transport_type] += value.get('departments_served', 0)
-
-                if transport_departments:
-                    # Топ 8 типів транспорту
-                    top_transport_dept = sorted(transport_departments.items(), key=lambda x: x[1], reverse=True)[:8]
-                    transport_names = [item[0][:10] for item in top_transport_dept]
-                    dept_counts = [item[1] for item in top_transport_dept]
-
-                    print(f"🏢 Типів транспорту для відділень: {len(transport_names)}")
-
-                    if any(dept_counts):
-                        bars = ax10.bar(range(len(transport_names)), dept_counts, color='#A29BFE', alpha=0.8)
-                        ax10.set_title('Відділення по типах транспорту', fontsize=11, fontweight='bold')
-                        ax10.set_ylabel('Кількість відділень')
-                        ax10.set_xlabel('Тип транспорту')
-                        ax10.set_xticks(range(len(transport_names)))
-                        ax10.set_xticklabels(transport_names, rotation=45)
-
-                        for bar, count in zip(bars, dept_counts):
-                            if count > 0:
-                                ax10.text(bar.get_x() + bar.get_width() / 2,
-                                          bar.get_height() + max(dept_counts) * 0.01,
-                                          f'{count}', ha='center', va='bottom', fontsize=8)
-
-            # 11. Середня вага посилок по типах транспорту
-            if parcel_data and 'data' in parcel_data and parcel_data['data']:
-                print("⚖️ Створення графіка ваги посилок...")
-                ax11 = plt.subplot(3, 4, 11)
-
-                # Групуємо середню вагу по типах транспорту
-                transport_weight = {}
-                for key, value in parcel_data['data'].items():
-                    parts = key.split('_')
-                    transport_type = parts[1] if len(parts) > 1 else 'Unknown'
-
-                    if transport_type not in transport_weight:
-                        transport_weight[transport_type] = {'weight': 0, 'count': 0}
-
-                    transport_weight[transport_type]['weight'] += value.get('avg_parcel_weight', 0)
-                    transport_weight[transport_type]['count'] += 1
-
-                if transport_weight:
-                    # Обчислюємо середню вагу
-                    for transport_type in transport_weight:
-                        if transport_weight[transport_type]['count'] > 0:
-                            transport_weight[transport_type]['avg_weight'] = (
-                                    transport_weight[transport_type]['weight'] /
-                                    transport_weight[transport_type]['count']
-                            )
-
-                    transport_types = list(transport_weight.keys())[:8]
-                    avg_weights = [transport_weight[tt].get('avg_weight', 0) for tt in transport_types]
-
-                    print(f"⚖️ Типів транспорту для ваги: {len(transport_types)}")
-
-                    if any(avg_weights):
-                        bars = ax11.bar(range(len(transport_types)), avg_weights, color='#00CEC9', alpha=0.8)
-                        ax11.set_title('Середня вага посилок по транспорту', fontsize=11, fontweight='bold')
-                        ax11.set_ylabel('Середня вага (кг)')
-                        ax11.set_xlabel('Тип транспорту')
-                        ax11.set_xticks(range(len(transport_types)))
-                        ax11.set_xticklabels([tt[:8] for tt in transport_types], rotation=45)
-
-                        for bar, weight in zip(bars, avg_weights):
-                            if weight > 0:
-                                ax11.text(bar.get_x() + bar.get_width() / 2,
-                                          bar.get_height() + max(avg_weights) * 0.01,
-                                          f'{weight:.1f}', ha='center', va='bottom', fontsize=8)
-
-            # 12. Гістограма розподілу рейтингів використання
-            if usage_data and 'data' in usage_data and usage_data['data']:
-                print("📊 Створення гістограми рейтингів...")
-                ax12 = plt.subplot(3, 4, 12)
-
-                utilization_scores = []
-                for value in usage_data['data'].values():
-                    score = value.get('period_utilization_score', 0)
-                    if score > 0:
-                        utilization_scores.append(score)
-
-                print(f"📊 Рейтингів для гістограми: {len(utilization_scores)}")
+            for key, label in [('usage', 'Використання по періодах'), ('trends', 'Тренди'),
+                               ('efficiency', 'Ефективність')]:
+                if inputs[key] and 'data' in inputs[key]:
+                    print(f"📊 {label}: {len(inputs[key]['data'])} записів")
 
-                if utilization_scores and len(utilization_scores) > 1:
-                    bins_count = min(15, len(utilization_scores))
-                    ax12.hist(utilization_scores, bins=bins_count,
-                              color='#6C5CE7', alpha=0.7, edgecolor='black')
-                    ax12.set_title('Розподіл рейтингів використання', fontsize=11, fontweight='bold')
-                    ax12.set_xlabel('Рейтинг використання')
-                    ax12.set_ylabel('Кількість записів')
-
-                    mean_score = np.mean(utilization_scores)
-                    ax12.axvline(mean_score, color='red', linestyle='--',
-                                 label=f'Середнє: {mean_score:.1f}')
-                    ax12.legend()
-
-                    print(f"📊 Середній рейтинг: {mean_score:.1f}")
-
-            print("🎨 Налаштування макету...")
-            plt.tight_layout(pad=2.0)
-
-            print("💾 Збереження графіка...")
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            chart_path = os.path.join(self.config.CHARTS_PATH, f'transport_utilization_extended_{timestamp}.png')
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-            plt.close()
+            chart_path = self._render_dashboard_figure('transport_utilization', inputs, profile)
 
             print(f"✅ Розширений графік транспорту збережено: {os.path.basename(chart_path)}")
-            return True
+            return chart_path
 
         except Exception as e:
             print(f"❌ Помилка створення графіків транспорту: {e}")
@@ -1138,27 +484,1010 @@ class DWChartGenerator:
             plt.close('all')
             return False
 
-    def create_all_charts(self):
-        """Створює всі графіки"""
-        print("🎨 Створення всіх графіків...")
+    # ------------------------------------------------------------------
+    # Панелі кур'єрів
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _top_couriers(inputs):
+        """Топ-10 кур'єрів (ключ, дані) та їхні підписи"""
+        couriers = list(inputs['top']['data'].items())[:10]
+        courier_names = [f"ID {courier.get('courier_id', i+1)}" for i, (key, courier) in enumerate(couriers)]
+        return couriers, courier_names
+
+    def _draw_courier_efficiency(self, ax, inputs):
+        # 1. Топ кур'єри за ефективністю
+        print("📈 Створення графіка ефективності...")
+        couriers, courier_names = self._top_couriers(inputs)
+        print(f"👥 Обробляємо {len(couriers)} кур'єрів")
+
+        efficiency_scores = []
+        for key, courier in couriers:
+            efficiency = courier.get('efficiency_score', 0)
+            efficiency_scores.append(efficiency)
+            print(f"  Кур'єр {courier.get('courier_id', 'N/A')}: ефективність = {efficiency}")
+
+        print(f"📊 Діапазон ефективності: {min(efficiency_scores)} - {max(efficiency_scores)}")
+
+        bars = ax.bar(range(len(courier_names)), efficiency_scores, color='skyblue', alpha=0.8)
+        ax.set_title('Топ-10 кур\'єрів за ефективністю', fontsize=12, fontweight='bold')
+        ax.set_ylabel('Рейтинг ефективності')
+        ax.set_xlabel('Кур\'єри')
+        ax.set_xticks(range(len(courier_names)))
+        ax.set_xticklabels(courier_names, rotation=45)
+
+        # Додаємо значення на стовпці
+        for bar, score in zip(bars, efficiency_scores):
+            if score > 0:
+                ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.5,
+                        f'{score:.1f}', ha='center', va='bottom', fontsize=8)
+
+    def _draw_courier_delivery_time(self, ax, inputs):
+        # 2. Середній час доставки
+        print("⏱️ Створення графіка часу доставки...")
+        couriers, courier_names = self._top_couriers(inputs)
+        delivery_times = []
+
+        for key, courier in couriers:
+            delivery_time = courier.get('avg_delivery_time', 0)
+            delivery_times.append(delivery_time)
+            print(f"  Кур'єр {courier.get('courier_id', 'N/A')}: час доставки = {delivery_time}")
+
+        print(f"📊 Діапазон часу доставки: {min(delivery_times)} - {max(delivery_times)}")
+
+        bars2 = ax.bar(range(len(courier_names)), delivery_times, color='lightcoral', alpha=0.8)
+        ax.set_title('Середній час доставки топ кур\'єрів', fontsize=12, fontweight='bold')
+        ax.set_ylabel('Час доставки (хв)')
+        ax.set_xlabel('Кур\'єри')
+        ax.set_xticks(range(len(courier_names)))
+        ax.set_xticklabels(courier_names, rotation=45)
+
+        for bar, time in zip(bars2, delivery_times):
+            if time > 0:
+                ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + max(delivery_times)*0.01,
+                        f'{time:.0f}', ha='center', va='bottom', fontsize=8)
+
+    def _draw_courier_deliveries(self, ax, inputs):
+        # 3. Кількість доставок
+        print("📦 Створення графіка кількості доставок...")
+        couriers, courier_names = self._top_couriers(inputs)
+        total_deliveries = []
+
+        for key, courier in couriers:
+            deliveries = courier.get('total_deliveries', 0)
+            total_deliveries.append(deliveries)
+            print(f"  Кур'єр {courier.get('courier_id', 'N/A')}: доставок = {deliveries}")
+
+        print(f"📊 Діапазон доставок: {min(total_deliveries)} - {max(total_deliveries)}")
+
+        bars3 = ax.bar(range(len(courier_names)), total_deliveries, color='lightgreen', alpha=0.8)
+        ax.set_title('Кількість доставок топ кур\'єрів', fontsize=12, fontweight='bold')
+        ax.set_ylabel('Кількість доставок')
+        ax.set_xlabel('Кур\'єри')
+        ax.set_xticks(range(len(courier_names)))
+        ax.set_xticklabels(courier_names, rotation=45)
+
+        for bar, count in zip(bars3, total_deliveries):
+            if count > 0:
+                ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + max(total_deliveries)*0.01,
+                        f'{count}', ha='center', va='bottom', fontsize=8)
+
+    def _draw_courier_general_stats(self, ax, inputs):
+        # 4. Загальна статистика
+        print("📊 Створення графіка загальної статистики...")
+        stats = inputs['general']['data']
+
+        print(f"📈 Загальна статистика: {stats}")
+
+        labels = ['Всього кур\'єрів', 'Всього доставок', 'Регіонів', 'Міст']
+        values = [
+            stats.get('total_couriers', 0),
+            stats.get('total_deliveries', 0),
+            stats.get('total_regions', 0),
+            stats.get('total_cities', 0)
+        ]
+
+        colors = ['#FF9999', '#66B2FF', '#99FF99', '#FFCC99']
+        bars4 = ax.bar(labels, values, color=colors)
+        ax.set_title('Загальна статистика кур\'єрів', fontsize=12, fontweight='bold')
+        ax.set_ylabel('Кількість')
+        ax.tick_params(axis='x', rotation=45)
+
+        for bar, value in zip(bars4, values):
+            if value > 0:
+                ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + max(values)*0.01,
+                        f'{value}', ha='center', va='bottom', fontsize=9)
+
+    def _draw_courier_regions(self, ax, inputs):
+        # 5. Аналіз по регіонах
+        print("🗺️ Створення графіка по регіонах...")
+        regions = list(inputs['regions']['data'].items())[:8]  # Топ 8 регіонів
+
+        print(f"🌍 Регіонів для відображення: {len(regions)}")
+
+        if regions:
+            region_names = [region[0].replace('_', ' ')[:15] for region in regions]
+            region_deliveries = [region[1].get('total_deliveries', 0) for region in regions]
+
+            for name, deliveries in zip(region_names, region_deliveries):
+                print(f"  Регіон {name}: {deliveries} доставок")
+
+            bars5 = ax.barh(range(len(region_names)), region_deliveries, color='purple', alpha=0.7)
+            ax.set_title('Доставки по регіонах', fontsize=12, fontweight='bold')
+            ax.set_xlabel('Кількість доставок')
+            ax.set_yticks(range(len(region_names)))
+            ax.set_yticklabels(region_names)
+
+            for bar, value in zip(bars5, region_deliveries):
+                if value > 0:
+                    ax.text(bar.get_width() + max(region_deliveries)*0.01,
+                            bar.get_y() + bar.get_height()/2,
+                            f'{value}', ha='left', va='center', fontsize=8)
+
+    def _draw_courier_delivery_time_distribution(self, ax, inputs):
+        # 6. Розподіл часу доставки (гістограма)
+        print("📊 Створення гістограми часу доставки...")
+        all_delivery_times = []
+
+        for courier in inputs['top']['data'].values():
+            delivery_time = courier.get('avg_delivery_time', 0)
+            if delivery_time > 0:
+                all_delivery_times.append(delivery_time)
+
+        print(f"⏱️ Часів доставки для гістограми: {len(all_delivery_times)}")
+
+        if all_delivery_times and len(all_delivery_times) > 1:
+            bins_count = min(15, len(all_delivery_times))
+            print(f"📊 Кількість bins: {bins_count}")
+
+            ax.hist(all_delivery_times, bins=bins_count,
+                    color='orange', alpha=0.7, edgecolor='black')
+            ax.set_title('Розподіл часу доставки', fontsize=12, fontweight='bold')
+            ax.set_xlabel('Час доставки (хв)')
+            ax.set_ylabel('Кількість кур\'єрів')
+
+            mean_time = np.mean(all_delivery_times)
+            ax.axvline(mean_time, color='red', linestyle='--',
+                       label=f'Середнє: {mean_time:.1f} хв')
+            ax.legend()
+
+            print(f"📊 Середній час доставки: {mean_time:.1f} хв")
+
+    # ------------------------------------------------------------------
+    # Панелі часу обробки
+    # ------------------------------------------------------------------
+
+    def _draw_processing_general_stats(self, ax, inputs):
+        # 1. Загальна статистика часу обробки
+        print("📊 Створення графіка загальної статистики...")
+        stats = inputs['general']['data']
+
+        labels = ['Середній\nчас', 'Медіанний\nчас', 'Мін.\nчас', 'Макс.\nчас']
+        values = [
+            stats.get('avg_processing_time', 0),
+            stats.get('median_processing_time', 0),
+            stats.get('min_processing_time', 0),
+            stats.get('max_processing_time', 0)
+        ]
+
+        print(f"📈 Статистика часу: {dict(zip(labels, values))}")
+
+        colors = ['#FF7675', '#74B9FF', '#00B894', '#FDCB6E']
+        bars = ax.bar(labels, values, color=colors, alpha=0.8)
+        ax.set_title('Статистика часу обробки', fontsize=12, fontweight='bold')
+        ax.set_ylabel('Час (години)')
+
+        for bar, value in zip(bars, values):
+            if value > 0:
+                ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + max(values)*0.01,
+                        f'{value:.1f}', ha='center', va='bottom', fontsize=9)
+
+    def _draw_processing_trends(self, ax, inputs):
+        # 2. Тренди по типах посилок
+        print("📈 Створення графіка трендів...")
+
+        # Групуємо по типах посилок
+        parcel_trends = {}
+        for key, value in inputs['trends']['data'].items():
+            parcel_type = value.get('parcel_type_name', 'Невідомий')
+            period = value.get('period', key.split('_')[0] if '_' in key else 'Unknown')
+
+            if parcel_type not in parcel_trends:
+                parcel_trends[parcel_type] = {'periods': [], 'times': []}
+
+            parcel_trends[parcel_type]['periods'].append(period)
+            parcel_trends[parcel_type]['times'].append(value.get('avg_processing_time', 0))
+
+        print(f"📊 Типів посилок для трендів: {len(parcel_trends)}")
+
+        if parcel_trends:
+            colors = plt.cm.tab10(np.linspace(0, 1, len(parcel_trends)))
+            series = [
+                (i, parcel_type, data)
+                for i, (parcel_type, data) in enumerate(list(parcel_trends.items())[:5])  # Топ 5
+                if data['periods'] and data['times'] and any(data['times'])
+            ]
 
-        charts_created = []
+            # Порядок періодів на осі - як у повних рядах, навіть якщо проріджені ряди пропускають різні точки
+            all_periods = list(dict.fromkeys(period for _, _, data in series for period in data['periods']))
+            if all_periods:
+                ax.xaxis.update_units(all_periods)
+
+            plotted = 0
+            for i, parcel_type, data in series:
+                print(f"  📈 {parcel_type}: {len(data['periods'])} періодів")
+                periods, times = self._decimate(data['periods'], data['times'])
+                ax.plot(periods, times, marker='o',
+                        label=parcel_type[:15], color=colors[i], linewidth=2)
+                plotted += 1
+
+            if plotted > 0:
+                self._limit_category_ticks(ax, len(all_periods))
+                ax.set_title('Тренди часу обробки по типах посилок', fontsize=12, fontweight='bold')
+                ax.set_ylabel('Час обробки (год)')
+                ax.set_xlabel('Період')
+                ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+                ax.tick_params(axis='x', rotation=45)
+                ax.grid(True, alpha=0.3)
+
+    def _draw_processing_period_comparison(self, ax, inputs):
+        # 3. Порівняння періодів
+        print("📊 Створення графіка порівняння періодів...")
+        periods = list(inputs['comparison']['data'].items())
+
+        print(f"📅 Періодів для порівняння: {len(periods)}")
+
+        if periods:
+            period_names = [period[0] for period in periods]
+            avg_times = [period[1].get('avg_processing_time', 0) for period in periods]
+
+            for name, time in zip(period_names, avg_times):
+                print(f"  📅 {name}: {time:.1f} год")
+
+            if any(avg_times):
+                period_names, avg_times = self._bucket(period_names, avg_times)
+                bars = ax.bar(range(len(period_names)), avg_times, color='#A29BFE', alpha=0.8)
+                ax.set_title('Середній час обробки по періодах', fontsize=12, fontweight='bold')
+                ax.set_ylabel('Час обробки (год)')
+                ax.set_xlabel('Період')
+                self._set_period_ticks(ax, period_names)
+
+                for bar, time in zip(bars, avg_times):
+                    if time > 0 and self._fits_ticks(len(bars)):
+                        ax.text(bar.get_x() + bar.get_width()/2,
+                                bar.get_height() + max(avg_times)*0.01,
+                                f'{time:.1f}', ha='center', va='bottom', fontsize=8)
+
+    # ------------------------------------------------------------------
+    # Панелі відділень
+    # ------------------------------------------------------------------
+
+    def _draw_department_general_stats(self, ax, inputs):
+        # 1. Загальна статистика відділень
+        stats = inputs['general']['data']
+
+        labels = ['Відділення', 'Доставки', 'Регіони', 'Міста', 'Періоди']
+        values = [
+            stats.get('total_departments', 0),
+            stats.get('total_deliveries', 0),
+            stats.get('total_regions', 0),
+            stats.get('total_cities', 0),
+            stats.get('total_periods', 0)
+        ]
+
+        colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7']
+        bars = ax.bar(labels, values, color=colors, alpha=0.8)
+        ax.set_title('Загальна статистика відділень', fontsize=12, fontweight='bold')
+        ax.set_ylabel('Кількість')
+        ax.tick_params(axis='x', rotation=45)
+
+        for bar, value in zip(bars, values):
+            if value > 0:
+                ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + max(values)*0.01,
+                        f'{value:,}', ha='center', va='bottom', fontsize=9)
+
+    def _draw_department_periods(self, ax, inputs):
+        # 2. Доставки по періодах
+        periods = list(inputs['periods']['data'].items())
+
+        if periods:
+            period_names = [period[0] for period in periods]
+            period_deliveries = [period[1].get('total_deliveries', 0) for period in periods]
+            period_names, period_deliveries = self._decimate(period_names, period_deliveries)
+
+            ax.plot(period_names, period_deliveries, marker='o', linewidth=2, markersize=6, color='#E17055')
+            self._limit_category_ticks(ax, len(period_names))
+            ax.set_title('Динаміка доставок по періодах', fontsize=12, fontweight='bold')
+            ax.set_ylabel('Кількість доставок')
+            ax.set_xlabel('Період')
+            ax.tick_params(axis='x', rotation=45)
+            ax.grid(True, alpha=0.3)
+
+    def _draw_department_regions(self, ax, inputs):
+        # 3. Аналіз по регіонах
+        regions = list(inputs['regions']['data'].items())[:10]
+
+        if regions:
+            region_names = [region[0].replace('_', ' ')[:15] for region in regions]
+            region_deliveries = [region[1].get('total_deliveries', 0) for region in regions]
+
+            bars = ax.barh(range(len(region_names)), region_deliveries, color='#74B9FF', alpha=0.8)
+            ax.set_title('Доставки по регіонах', fontsize=12, fontweight='bold')
+            ax.set_xlabel('Кількість доставок')
+            ax.set_yticks(range(len(region_names)))
+            ax.set_yticklabels(region_names)
+
+            for bar, value in zip(bars, region_deliveries):
+                if value > 0:
+                    ax.text(bar.get_width() + max(region_deliveries)*0.01,
+                            bar.get_y() + bar.get_height()/2,
+                            f'{value:,}', ha='left', va='center', fontsize=8)
+
+    def _draw_department_types(self, ax, inputs):
+        # 4. Аналіз по типах відділень
+        # Групуємо по типах відділень
+        dept_types = {}
+        for key, value in inputs['types']['data'].items():
+            dept_type = value.get('department_type', 'Невідомий')
+            if dept_type not in dept_types:
+                dept_types[dept_type] = 0
+            dept_types[dept_type] += value.get('total_deliveries', 0)
+
+        if dept_types:
+            labels, sizes = self._top_slices(list(dept_types.keys()), list(dept_types.values()))
+            colors = plt.cm.Set3(np.linspace(0, 1, len(labels)))
+
+            wedges, texts, autotexts = ax.pie(sizes, labels=labels, autopct='%1.1f%%',
+                                              colors=colors, startangle=90)
+            ax.set_title('Розподіл доставок по типах відділень', fontsize=12, fontweight='bold')
+
+    def _draw_department_region_processing(self, ax, inputs):
+        # 5. Час обробки по регіонах
+        regions = list(inputs['regions']['data'].items())[:8]
+
+        if regions:
+            region_names = [region[0].replace('_', ' ')[:12] for region in regions]
+            processing_times = [region[1].get('avg_processing_time', 0) for region in regions]
+
+            if any(processing_times):
+                bars = ax.bar(range(len(region_names)), processing_times, color='#FD79A8', alpha=0.8)
+                ax.set_title('Час обробки по регіонах', fontsize=12, fontweight='bold')
+                ax.set_ylabel('Час обробки (год)')
+                ax.set_xlabel('Регіон')
+                ax.set_xticks(range(len(region_names)))
+                ax.set_xticklabels(region_names, rotation=45)
+
+                for bar, time in zip(bars, processing_times):
+                    if time > 0:
+                        ax.text(bar.get_x() + bar.get_width()/2,
+                                bar.get_height() + max(processing_times)*0.01,
+                                f'{time:.1f}', ha='center', va='bottom', fontsize=8)
+
+    def _draw_department_top_busy(self, ax, inputs):
+        # 6. Топ завантажені відділення
+        busy_data = inputs['busy']
+
+        # Беремо перший період з найбільшою кількістю даних
+        first_period = list(busy_data['data'].keys())[0] if busy_data['data'] else None
+        if first_period and busy_data['data'][first_period]:
+            top_depts = list(busy_data['data'][first_period].items())[:8]
+
+            if top_depts:
+                dept_names = [f"Відд. {dept[1].get('department_id', i+1)}" for i, dept in enumerate(top_depts)]
+                workload_scores = [dept[1].get('period_workload_score', 0) for dept in top_depts]
+
+                if any(workload_scores):
+                    bars = ax.barh(range(len(dept_names)), workload_scores, color='#FDCB6E', alpha=0.8)
+                    ax.set_title(f'Топ завантажені відділення ({first_period})', fontsize=12, fontweight='bold')
+                    ax.set_xlabel('Рейтинг завантаженості')
+                    ax.set_yticks(range(len(dept_names)))
+                    ax.set_yticklabels(dept_names)
+
+                    for bar, score in zip(bars, workload_scores):
+                        if score > 0:
+                            ax.text(bar.get_width() + max(workload_scores)*0.01,
+                                    bar.get_y() + bar.get_height()/2,
+                                    f'{score:.1f}', ha='left', va='center', fontsize=8)
+
+    # ------------------------------------------------------------------
+    # Панелі транспорту
+    # ------------------------------------------------------------------
+
+    def _draw_transport_general_stats(self, ax, inputs):
+        # 1. Загальна статистика транспорту
+        print("📊 Створення графіка загальної статистики...")
+        stats = inputs['general']['data']
+
+        labels = ['Типи\nтранспорту', 'Всього\nдоставок', 'Відділення', 'Регіони', 'Типи\nпосилок']
+        values = [
+            stats.get('total_transport_types', 0),
+            stats.get('total_deliveries', 0),
+            stats.get('departments_using_transport', 0),
+            stats.get('regions_served', 0),
+            stats.get('parcel_types_transported', 0)
+        ]
+
+        print(f"📈 Загальна статистика: {dict(zip(labels, values))}")
+
+        colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7']
+        bars = ax.bar(labels, values, color=colors, alpha=0.8)
+        ax.set_title('Загальна статистика транспорту', fontsize=11, fontweight='bold')
+        ax.set_ylabel('Кількість')
+        ax.tick_params(axis='x', rotation=45)
+
+        for bar, value in zip(bars, values):
+            if value > 0:
+                ax.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + max(values) * 0.01,
+                        f'{value:,}', ha='center', va='bottom', fontsize=8)
+
+    def _draw_transport_periods(self, ax, inputs):
+        # 2. Використання транспорту по періодах
+        print("📅 Створення графіка використання по періодах...")
+
+        # Групуємо по періодах
+        period_usage = {}
+        for key, value in inputs['usage']['data'].items():
+            period = key.split('_')[0] if '_' in key else 'Unknown'
+            if period not in period_usage:
+                period_usage[period] = {'deliveries': 0, 'score': 0, 'count': 0}
+
+            period_usage[period]['deliveries'] += value.get('total_deliveries', 0)
+            period_usage[period]['score'] += value.get('period_utilization_score', 0)
+            period_usage[period]['count'] += 1
+
+        print(f"📊 Періодів для аналізу: {len(period_usage)}")
+
+        if period_usage:
+            periods = sorted(period_usage.keys())[:8]  # Останні 8 періодів
+            period_deliveries = [period_usage[p]['deliveries'] for p in periods]
+
+            for period, deliveries in zip(periods, period_deliveries):
+                print(f"  📅 {period}: {deliveries} доставок")
+
+            bars = ax.bar(range(len(periods)), period_deliveries, color='#74B9FF', alpha=0.8)
+            ax.set_title('Доставки транспортом по періодах', fontsize=11, fontweight='bold')
+            ax.set_ylabel('Кількість доставок')
+            ax.set_xlabel('Період')
+            ax.set_xticks(range(len(periods)))
+            ax.set_xticklabels(periods, rotation=45)
+
+            for bar, value in zip(bars, period_deliveries):
+                if value > 0:
+                    ax.text(bar.get_x() + bar.get_width() / 2,
+                            bar.get_height() + max(period_deliveries) * 0.01,
+                            f'{value:,}', ha='center', va='bottom', fontsize=8)
+
+    def _draw_transport_trends(self, ax, inputs):
+        # 3. Тренди використання транспорту
+        print("📈 Створення графіка трендів...")
+
+        # Групуємо тренди по типах транспорту
+        transport_trends = {}
+        for key, value in inputs['trends']['data'].items():
+            parts = key.split('_')
+            if len(parts) >= 2:
+                transport_type = parts[0]
+                period = parts[1] if len(parts) > 1 else 'Unknown'
+
+                if transport_type not in transport_trends:
+                    transport_trends[transport_type] = {'periods': [], 'deliveries': []}
+
+                transport_trends[transport_type]['periods'].append(period)
+                transport_trends[transport_type]['deliveries'].append(value.get('total_deliveries', 0))
+
+        print(f"📊 Типів транспорту для трендів: {len(transport_trends)}")
+
+        if transport_trends:
+            colors = plt.cm.tab10(np.linspace(0, 1, len(transport_trends)))
+            plotted = 0
+
+            for i, (transport_type, data) in enumerate(list(transport_trends.items())[:5]):
+                if data['periods'] and data['deliveries'] and any(data['deliveries']):
+                    # Сортуємо по періодах
+                    sorted_data = sorted(zip(data['periods'], data['deliveries']))
+                    periods, deliveries = zip(*sorted_data) if sorted_data else ([], [])
+
+                    print(f"  📈 {transport_type}: {len(periods)} періодів")
+                    positions, deliveries = self._decimate(range(len(periods)), deliveries)
+                    ax.plot(positions, deliveries, marker='o',
+                            label=transport_type[:12], color=colors[i], linewidth=2)
+                    plotted += 1
+
+            if plotted > 0:
+                ax.set_title('Тренди використання транспорту', fontsize=11, fontweight='bold')
+                ax.set_ylabel('Кількість доставок')
+                ax.set_xlabel('Період')
+                ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=8)
+                ax.grid(True, alpha=0.3)
+
+    def _draw_transport_efficiency(self, ax, inputs):
+        # 4. Ефективність транспорту
+        print("⚡ Створення графіка ефективності...")
+
+        # Беремо топ ефективних типів транспорту
+        efficiency_scores = []
+        transport_names = []
+
+        for key, value in list(inputs['efficiency']['data'].items())[:10]:
+            parts = key.split('_')
+            transport_name = parts[1] if len(parts) > 1 else key[:15]
+            efficiency = value.get('efficiency_ratio', 0)
+
+            transport_names.append(transport_name)
+            efficiency_scores.append(efficiency)
+            print(f"  ⚡ {transport_name}: ефективність = {efficiency}")
+
+        if efficiency_scores and any(efficiency_scores):
+            bars = ax.barh(range(len(transport_names)), efficiency_scores, color='#00B894', alpha=0.8)
+            ax.set_title('Ефективність типів транспорту', fontsize=11, fontweight='bold')
+            ax.set_xlabel('Коефіцієнт ефективності')
+            ax.set_yticks(range(len(transport_names)))
+            ax.set_yticklabels(transport_names)
 
-        # Кур'єри
-        if self.create_courier_performance_charts():
-            charts_created.append("Кур'єри")
+            for bar, score in zip(bars, efficiency_scores):
+                if score > 0:
+                    ax.text(bar.get_width() + max(efficiency_scores) * 0.01,
+                            bar.get_y() + bar.get_height() / 2,
+                            f'{score:.1f}', ha='left', va='center', fontsize=8)
+
+    def _draw_transport_regions(self, ax, inputs):
+        # 5. Розподіл транспорту по регіонах
+        print("🗺️ Створення графіка по регіонах...")
+
+        # Групуємо по регіонах
+        region_transport = {}
+        for key, value in inputs['regions']['data'].items():
+            parts = key.split('_')
+            region = parts[2] if len(parts) > 2 else 'Unknown'
+
+            if region not in region_transport:
+                region_transport[region] = 0
+            region_transport[region] += value.get('total_deliveries', 0)
+
+        print(f"🌍 Регіонів для аналізу: {len(region_transport)}")
+
+        if region_transport:
+            # Топ 8 регіонів
+            top_regions = sorted(region_transport.items(), key=lambda x: x[1], reverse=True)[:8]
+            region_names = [region[0].replace('_', ' ')[:12] for region in top_regions]
+            region_deliveries = [region[1] for region in top_regions]
+
+            for name, deliveries in zip(region_names, region_deliveries):
+                print(f"  🌍 {name}: {deliveries} доставок")
+
+            bars = ax.barh(range(len(region_names)), region_deliveries, color='#E17055', alpha=0.8)
+            ax.set_title('Використання транспорту по регіонах', fontsize=11, fontweight='bold')
+            ax.set_xlabel('Кількість доставок')
+            ax.set_yticks(range(len(region_names)))
+            ax.set_yticklabels(region_names)
+
+            for bar, value in zip(bars, region_deliveries):
+                if value > 0:
+                    ax.text(bar.get_width() + max(region_deliveries) * 0.01,
+                            bar.get_y() + bar.get_height() / 2,
+                            f'{value:,}', ha='left', va='center', fontsize=8)
+
+    def _draw_transport_parcel_types(self, ax, inputs):
+        # 6. Транспорт по типах посилок
+        print("📦 Створення графіка по типах посилок...")
+
+        # Групуємо по типах посилок
+        parcel_transport = {}
+        for key, value in inputs['parcels']['data'].items():
+            parts = key.split('_')
+            parcel_type = parts[2] if len(parts) > 2 else 'Unknown'
+
+            if parcel_type not in parcel_transport:
+                parcel_transport[parcel_type] = {'deliveries': 0, 'weight': 0, 'count': 0}
+
+            parcel_transport[parcel_type]['deliveries'] += value.get('total_deliveries', 0)
+            parcel_transport[parcel_type]['weight'] += value.get('avg_parcel_weight', 0)
+            parcel_transport[parcel_type]['count'] += 1
+
+        print(f"📦 Типів посилок: {len(parcel_transport)}")
+
+        if parcel_transport:
+            parcel_types = list(parcel_transport.keys())
+            parcel_deliveries = [parcel_transport[pt]['deliveries'] for pt in parcel_types]
+
+            if any(parcel_deliveries):
+                parcel_types, parcel_deliveries = self._top_slices(parcel_types, parcel_deliveries)
+                colors = plt.cm.Set3(np.linspace(0, 1, len(parcel_types)))
+                wedges, texts, autotexts = ax.pie(parcel_deliveries, labels=parcel_types,
+                                                  autopct='%1.1f%%', colors=colors, startangle=90)
+                ax.set_title('Розподіл транспорту по типах посилок', fontsize=11, fontweight='bold')
+
+    def _draw_transport_processing_time(self, ax, inputs):
+        # 7. Середній час обробки по типах транспорту
+        print("⏱️ Створення графіка часу обробки...")
+
+        # Групуємо по типах транспорту
+        transport_processing_time = {}
+        for key, value in inputs['usage']['data'].items():
+            parts = key.split('_')
+            transport_type = parts[2] if len(parts) > 2 else 'Unknown'
+
+            if transport_type not in transport_processing_time:
+                transport_processing_time[transport_type] = {'time': 0, 'count': 0}
+
+            transport_processing_time[transport_type]['time'] += value.get('avg_processing_time', 0)
+            transport_processing_time[transport_type]['count'] += 1
+
+        if transport_processing_time:
+            # Обчислюємо середній час
+            for transport_type in transport_processing_time:
+                if transport_processing_time[transport_type]['count'] > 0:
+                    transport_processing_time[transport_type]['avg_time'] = (
+                            transport_processing_time[transport_type]['time'] /
+                            transport_processing_time[transport_type]['count']
+                    )
+
+            transport_types = list(transport_processing_time.keys())[:8]
+            processing_times = [transport_processing_time[tt].get('avg_time', 0) for tt in transport_types]
+
+            print(f"⏱️ Типів транспорту для часу обробки: {len(transport_types)}")
+
+            if any(processing_times):
+                bars = ax.bar(range(len(transport_types)), processing_times, color='#FD79A8', alpha=0.8)
+                ax.set_title('Час обробки по типах транспорту', fontsize=11, fontweight='bold')
+                ax.set_ylabel('Час обробки (год)')
+                ax.set_xlabel('Тип транспорту')
+                ax.set_xticks(range(len(transport_types)))
+                ax.set_xticklabels([tt[:8] for tt in transport_types], rotation=45)
+
+                for bar, time in zip(bars, processing_times):
+                    if time > 0:
+                        ax.text(bar.get_x() + bar.get_width() / 2,
+                                bar.get_height() + max(processing_times) * 0.01,
+                                f'{time:.1f}', ha='center', va='bottom', fontsize=8)
+
+    def _draw_transport_most_used(self, ax, inputs):
+        # 8. Найбільш використовувані типи транспорту
+        print("🏆 Створення графіка найбільш використовуваних...")
+        most_used_data = inputs['most_used']
+
+        # Беремо перший період з найбільшою кількістю даних
+        first_period = list(most_used_data['data'].keys())[0] if most_used_data['data'] else None
+        if first_period and most_used_data['data'][first_period]:
+            top_transport = list(most_used_data['data'][first_period].items())[:6]
+
+            if top_transport:
+                transport_names = []
+                utilization_scores = []
 
-        # Відділення
-        if self.create_department_workload_charts():
-            charts_created.append("Відділення")
+                for transport_key, transport_data in top_transport:
+                    transport_name = transport_key.split('_')[2] if '_' in transport_key else transport_key[:10]
+                    score = transport_data.get('period_utilization_score', 0)
 
-        # Час обробки
-        if self.create_processing_time_charts():
-            charts_created.append("Час обробки")
+                    transport_names.append(transport_name)
+                    utilization_scores.append(score)
+                    print(f"  🏆 {transport_name}: рейтинг = {score}")
 
-        # Транспорт
-        if self.create_transport_utilization_charts():
-            charts_created.append("Транспорт")
+                if any(utilization_scores):
+                    bars = ax.barh(range(len(transport_names)), utilization_scores, color='#FDCB6E', alpha=0.8)
+                    ax.set_title(f'Топ транспорт ({first_period})', fontsize=11, fontweight='bold')
+                    ax.set_xlabel('Рейтинг використання')
+                    ax.set_yticks(range(len(transport_names)))
+                    ax.set_yticklabels(transport_names)
 
-        print(f"✅ Створено графіки для: {', '.join(charts_created)}")
-        return charts_created
\ No newline at end of file
+                    for bar, score in zip(bars, utilization_scores):
+                        if score > 0:
+                            ax.text(bar.get_width() + max(utilization_scores) * 0.01,
+                                    bar.get_y() + bar.get_height() / 2,
+                                    f'{score:.1f}', ha='left', va='center', fontsize=8)
+
+    def _draw_transport_changes(self, ax, inputs):
+        # 9. Динаміка змін використання транспорту
+        print("📊 Створення графіка динаміки змін...")
+
+        changes = list(inputs['changes']['data'].values())
+        if changes:
+            change_labels = [change.get('current_period', 'Unknown') for change in changes]
+            delivery_changes = [change.get('deliveries_change', 0) for change in changes]
+
+            print(f"📊 Періодів змін: {len(changes)}")
+
+            if any(delivery_changes):
+                change_labels, delivery_changes = self._bucket(change_labels, delivery_changes, how='sum')
+                colors = ['green' if x >= 0 else 'red' for x in delivery_changes]
+                bars = ax.bar(range(len(change_labels)), delivery_changes, color=colors, alpha=0.7)
+                ax.set_title('Зміни кількості доставок', fontsize=11, fontweight='bold')
+                ax.set_ylabel('Зміна доставок')
+                ax.set_xlabel('Період')
+                self._set_period_ticks(ax, change_labels)
+                ax.axhline(y=0, color='black', linestyle='-', alpha=0.3)
+
+                for bar, change in zip(bars, delivery_changes):
+                    if change != 0 and self._fits_ticks(len(bars)):
+                        ax.text(bar.get_x() + bar.get_width() / 2,
+                                bar.get_height() + (max(delivery_changes) - min(delivery_changes)) * 0.01,
+                                f'{change:+}', ha='center', va='bottom', fontsize=8)
+
+    def _draw_transport_departments(self, ax, inputs):
+        # 10. Розподіл відділень по типах транспорту
+        print("🏢 Створення графіка відділень по транспорту...")
+
+        # Групуємо кількість відділень по типах транспорту
+        transport_departments = {}
+        for key, value in inputs['usage']['data'].items():
+            parts = key.split('_')
+            transport_type = parts[2] if len(parts) > 2 else 'Unknown'
+
+            if transport_type not in transport_departments:
+                transport_departments[transport_type] = 0
+            transport_departments[transport_type] += value.get('departments_served', 0)
+
+        if transport_departments:
+            # Топ 8 типів транспорту
+            top_transport_dept = sorted(transport_departments.items(), key=lambda x: x[1], reverse=True)[:8]
+            transport_names = [item[0][:10] for item in top_transport_dept]
+            dept_counts = [item[1] for item in top_transport_dept]
+
+            print(f"🏢 Типів транспорту для відділень: {len(transport_names)}")
+
+            if any(dept_counts):
+                bars = ax.bar(range(len(transport_names)), dept_counts, color='#A29BFE', alpha=0.8)
+                ax.set_title('Відділення по типах транспорту', fontsize=11, fontweight='bold')
+                ax.set_ylabel('Кількість відділень')
+                ax.set_xlabel('Тип транспорту')
+                ax.set_xticks(range(len(transport_names)))
+                ax.set_xticklabels(transport_names, rotation=45)
+
+                for bar, count in zip(bars, dept_counts):
+                    if count > 0:
+                        ax.text(bar.get_x() + bar.get_width() / 2,
+                                bar.get_height() + max(dept_counts) * 0.01,
+                                f'{count}', ha='center', va='bottom', fontsize=8)
+
+    def _draw_transport_parcel_weight(self, ax, inputs):
+        # 11. Середня вага посилок по типах транспорту
+        print("⚖️ Створення графіка ваги посилок...")
+
+        # Групуємо середню вагу по типах транспорту
+        transport_weight = {}
+        for key, value in inputs['parcels']['data'].items():
+            parts = key.split('_')
+            transport_type = parts[1] if len(parts) > 1 else 'Unknown'
+
+            if transport_type not in transport_weight:
+                transport_weight[transport_type] = {'weight': 0, 'count': 0}
+
+            transport_weight[transport_type]['weight'] += value.get('avg_parcel_weight', 0)
+            transport_weight[transport_type]['count'] += 1
+
+        if transport_weight:
+            # Обчислюємо середню вагу
+            for transport_type in transport_weight:
+                if transport_weight[transport_type]['count'] > 0:
+                    transport_weight[transport_type]['avg_weight'] = (
+                            transport_weight[transport_type]['weight'] /
+                            transport_weight[transport_type]['count']
+                    )
+
+            transport_types = list(transport_weight.keys())[:8]
+            avg_weights = [transport_weight[tt].get('avg_weight', 0) for tt in transport_types]
+
+            print(f"⚖️ Типів транспорту для ваги: {len(transport_types)}")
+
+            if any(avg_weights):
+                bars = ax.bar(range(len(transport_types)), avg_weights, color='#00CEC9', alpha=0.8)
+                ax.set_title('Середня вага посилок по транспорту', fontsize=11, fontweight='bold')
+                ax.set_ylabel('Середня вага (кг)')
+                ax.set_xlabel('Тип транспорту')
+                ax.set_xticks(range(len(transport_types)))
+                ax.set_xticklabels([tt[:8] for tt in transport_types], rotation=45)
+
+                for bar, weight in zip(bars, avg_weights):
+                    if weight > 0:
+                        ax.text(bar.get_x() + bar.get_width() / 2,
+                                bar.get_height() + max(avg_weights) * 0.01,
+                                f'{weight:.1f}', ha='center', va='bottom', fontsize=8)
+
+    def _draw_transport_utilization_distribution(self, ax, inputs):
+        # 12. Гістограма розподілу рейтингів використання
+        print("📊 Створення гістограми рейтингів...")
+
+        utilization_scores = []
+        for value in inputs['usage']['data'].values():
+            score = value.get('period_utilization_score', 0)
+            if score > 0:
+                utilization_scores.append(score)
+
+        print(f"📊 Рейтингів для гістограми: {len(utilization_scores)}")
+
+        if utilization_scores and len(utilization_scores) > 1:
+            bins_count = min(15, len(utilization_scores))
+            ax.hist(utilization_scores, bins=bins_count,
+                    color='#6C5CE7', alpha=0.7, edgecolor='black')
+            ax.set_title('Розподіл рейтингів використання', fontsize=11, fontweight='bold')
+            ax.set_xlabel('Рейтинг використання')
+            ax.set_ylabel('Кількість записів')
+
+            mean_score = np.mean(utilization_scores)
+            ax.axvline(mean_score, color='red', linestyle='--',
+                       label=f'Середнє: {mean_score:.1f}')
+            ax.legend()
+
+            print(f"📊 Середній рейтинг: {mean_score:.1f}")
+
+    # ------------------------------------------------------------------
+    # Окремі графіки на вимогу
+    # ------------------------------------------------------------------
+
+    def list_panels(self):
+        """Доступні окремі графіки з ознакою наявності вхідних даних"""
+        panels = []
+        for name, (dashboard, _, keys, title) in self.PANELS.items():
+            patterns = [self.DASHBOARD_INPUTS[dashboard][key] for key in keys]
+            panels.append({
+                'name': name,
+                'dashboard': dashboard,
+                'title': title,
+                'available': all(self._latest_file(pattern) for pattern in patterns)
+            })
+        return panels
+
+    def render_panel(self, name, profile=None):
+        """
+        Один графік з PANELS у буфері пам'яті, без файлу на диску.
+
+        Малюється через об'єктний API (Figure без pyplot), тож паралельні запити
+        веб-сервера не ділять стан pyplot. Результат кешується в пам'яті до зміни
+        вхідних даних або параметрів побудови. Повертає {'name', 'profile', 'mimetype',
+        'content', 'size_kb', 'render_seconds', 'fingerprint', 'cached'}.
+        """
+        if name not in self.PANELS:
+            raise ValueError(f"Невідомий графік: {name}")
+        profile = self.resolve_profile(profile)
+
+        dashboard, _, keys, _ = self.PANELS[name]
+        patterns = {key: self.DASHBOARD_INPUTS[dashboard][key] for key in keys}
+        files = {key: self._latest_file(pattern) for key, pattern in patterns.items()}
+        missing = [patterns[key] for key, filepath in files.items() if not filepath]
+        if missing:
+            raise FileNotFoundError(f"Немає даних для графіка {name}: {', '.join(missing)}")
+
+        fingerprint = self.chart_cache.fingerprint(
+            name, {patterns[key]: filepath for key, filepath in files.items()}, self._render_params(profile)
+        )
+
+        rendered = []
+
+        def render():
+            rendered.append(name)
+            return self._render_panel_image(name, files, profile)
+
+        result = self.panel_cache.get_or_compute(('panel', name, profile), fingerprint, render)
+        return dict(result, fingerprint=fingerprint, cached=not rendered)
+
+    def _render_panel_image(self, name, files, profile):
+        keys = self.PANELS[name][2]
+        settings = self.RENDER_PROFILES[profile]
+
+        with stage_timer('chart_generator', 'panel'):
+            start = time.perf_counter()
+            inputs = self.load_inputs(files)
+            if not self._has_inputs(inputs, keys):
+                raise FileNotFoundError(f"Немає даних для графіка {name}")
+
+            figure = Figure(figsize=self.PANEL_FIGSIZE)
+            ax = figure.add_subplot()
+            getattr(self, f'_draw_{name}')(ax, inputs)
+
+            buffer = io.BytesIO()
+            figure.savefig(buffer, format=settings['format'], dpi=settings['dpi'], bbox_inches='tight')
+            content = buffer.getvalue()
+
+        return {
+            'name': name,
+            'profile': profile,
+            'mimetype': self.MIMETYPES[settings['format']],
+            'content': content,
+            'size_kb': round(len(content) / 1024, 1),
+            'render_seconds': round(time.perf_counter() - start, 3)
+        }
+
+    def create_all_charts(self, max_workers=None, use_cache=True, profile=None):
+        """
+        Створює всі дашборди, кожен в окремому процесі пулу (pyplot не потокобезпечний).
+
+        Дашборди, вхідні дані та параметри яких не змінились, не перемальовуються:
+        повертається наявний файл з кешу (use_cache=False - побудувати заново).
+        profile - профіль з RENDER_PROFILES (None - POSTDW_CHART_PROFILE).
+        Загальний час наближається до часу найповільнішого дашборда.
+        Повертає список {'name', 'title', 'profile', 'success', 'chart_path', 'size_kb',
+        'render_seconds', 'cached'} у порядку DASHBOARDS.
+        """
+        profile = self.resolve_profile(profile)
+        print(f"🎨 Створення всіх графіків (профіль {profile})...")
+        wall_start = time.perf_counter()
+
+        titles = {name: title for name, title, _ in self.DASHBOARDS}
+        fingerprints = {name: self.chart_fingerprint(name, profile) for name in titles}
+
+        results = {}
+        for name, fingerprint in fingerprints.items():
+            entry = self.chart_cache.lookup(fingerprint) if use_cache else None
+            if entry:
+                print(f"♻️ {titles[name]}: дані не змінились - {entry['file']}")
+                results[name] = {
+                    'name': name,
+                    'title': titles[name],
+                    'profile': profile,
+                    'success': True,
+                    'chart_path': entry['chart_path'],
+                    'size_kb': round(os.path.getsize(entry['chart_path']) / 1024, 1),
+                    'render_seconds': 0.0,
+                    'cached': True
+                }
+        names = [name for name in titles if name not in results]
+
+        if max_workers is None:
+            max_workers = self.config.CHART_WORKERS
+        if max_workers < 1:
+            max_workers = os.cpu_count() or 1
+        max_workers = min(max_workers, len(names))
+
+        if max_workers > 1:
+            print(f"⚙️ Дашбордів: {len(names)}, процесів: {max_workers}")
+            # spawn, а не fork: потоки Flask (прогрів, інші запити) можуть тримати блокування каталогу
+            # файлів чи метрик у момент fork, і дочірній процес успадкував би їх зайнятими
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+                rendered = list(pool.map(_render_dashboard, names, [profile] * len(names)))
+            for result in rendered:
+                # Метрики та каталог файлів дочірніх процесів недоступні - оновлюємо тут
+                # тими самими етапами (дашборд, savefig), що й при побудові в цьому процесі
+                for component, stage, seconds in result.pop('stages'):
+                    STAGE_DURATION.observe(seconds, component=component, stage=stage)
+                if result['chart_path']:
+                    register_file(result['chart_path'])
+        else:
+            rendered = [self.render_dashboard(name, profile) for name in names]
+
+        for result in rendered:
+            result['cached'] = False
+            if result['success']:
+                self.chart_cache.store(fingerprints[result['name']], result['name'],
+                                       result['chart_path'], result['render_seconds'])
+            results[result['name']] = result
+        results = [results[name] for name in titles]
+
+        wall_seconds = time.perf_counter() - wall_start
+        created = [result for result in results if result['success']]
+        print(f"✅ Створено графіки для: {', '.join(result['title'] for result in created)}")
+        print(f"⏱️ Загальний час: {wall_seconds:.2f} с (перебудовано: {len(rendered)}, "
+              f"з кешу: {len(results) - len(rendered)}), розмір: "
+              f"{sum(result['size_kb'] or 0 for result in results) / 1024:.1f} МБ")
+        return results
+
+    def render_dashboard(self, name, profile=None):
+        """Створює один дашборд з DASHBOARDS; вимірює час побудови та розмір файлу"""
+        titles = {dashboard: (title, method) for dashboard, title, method in self.DASHBOARDS}
+        title, method = titles[name]
+        profile = self.resolve_profile(profile)
+
+        start = time.perf_counter()
+        chart_path = getattr(self, method)(profile=profile)
+        render_seconds = time.perf_counter() - start
+
+        return {
+            'name': name,
+            'title': title,
+            'profile': profile,
+            'success': bool(chart_path),
+            'chart_path': chart_path or None,
+            'size_kb': round(os.path.getsize(chart_path) / 1024, 1) if chart_path else None,
+            'render_seconds': round(render_seconds, 3)
+        }
+
+
+def _render_dashboard(name, profile):
+    """
+    Побудова дашборда у процесі пулу. Каталог файлів у дочірньому процесі не створюється
+    (register_file нічого не робить), а його метрики не експортуються - обидва оновлює батьківський процес:
+    виміряні етапи повертаються в result['stages'].
+    """
+    with record_stages() as stages:
+        result = DWChartGenerator().render_dashboard(name, profile)
+    result['stages'] = stages
+    return result
@@ -0,0 +1,87 @@
+"""
+Проріджування даних перед побудовою графіків
+"""
+
+import numpy as np
+
+
+def lttb_indices(values, threshold):
+    """
+    Індекси точок ряду, відібраних алгоритмом Largest-Triangle-Three-Buckets.
+
+    Перша та остання точки зберігаються; з кожного з threshold - 2 проміжних
+    відер береться точка, що утворює найбільший трикутник з попередньою
+    відібраною точкою та середнім наступного відра - так зберігаються піки
+    та форма ряду. threshold < 3 або не менший за довжину ряду - всі точки.
+    """
+    n = len(values)
+    if threshold < 3 or threshold >= n:
+        return np.arange(n)
+
+    x = np.arange(n, dtype=float)
+    y = np.asarray(values, dtype=float)
+    every = (n - 2) / (threshold - 2)
+
+    indices = np.empty(threshold, dtype=int)
+    indices[0], indices[-1] = 0, n - 1
+    selected = 0
+
+    for bucket in range(threshold - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, n)
+
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        area = np.abs(
+            (x[selected] - avg_x) * (y[start:end] - y[selected])
+            - (x[selected] - x[start:end]) * (avg_y - y[selected])
+        )
+        selected = start + int(area.argmax())
+        indices[bucket + 1] = selected
+
+    return indices
+
+
+def decimate_series(labels, values, threshold):
+    """Підписи та значення ряду після LTTB (у вихідному порядку)"""
+    indices = lttb_indices(values, threshold)
+    if len(indices) == len(values):
+        return list(labels), list(values)
+    return [labels[i] for i in indices], [values[i] for i in indices]
+
+
+def top_n_with_other(labels, values, limit, other_label='Інші'):
+    """
+    Найбільші limit - 1 категорій у вихідному порядку та сума решти як other_label.
+    Якщо категорій не більше limit (або limit < 2) - дані без змін.
+    """
+    if limit < 2 or len(values) <= limit:
+        return list(labels), list(values)
+
+    order = np.argsort(-np.asarray(values, dtype=float), kind='stable')
+    keep = np.sort(order[:limit - 1])
+    rest = np.sort(order[limit - 1:])
+
+    return (
+        [labels[i] for i in keep] + [other_label],
+        [values[i] for i in keep] + [sum(values[i] for i in rest)]
+    )
+
+
+def bucket_series(labels, values, buckets, how='mean'):
+    """
+    Послідовні точки ряду, об'єднані не більш ніж у buckets відер (середнє або сума, how='sum').
+    Підпис відра - діапазон 'перший–останній'. Для стовпців по періодах: жоден період не зникає.
+    """
+    if buckets < 1 or len(values) <= buckets:
+        return list(labels), list(values)
+
+    aggregate = np.sum if how == 'sum' else np.mean
+    bucket_labels, bucket_values = [], []
+    for indices in np.array_split(np.arange(len(values)), buckets):
+        first, last = labels[indices[0]], labels[indices[-1]]
+        bucket_labels.append(first if len(indices) == 1 else f'{first}–{last}')
+        bucket_values.append(aggregate([values[i] for i in indices]).item())
+    return bucket_labels, bucket_values